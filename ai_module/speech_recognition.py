@@ -2,9 +2,14 @@
 Speech Recognition - Whisper ile otomatik altyazı
 """
 import whisper
+import numpy as np
 from pathlib import Path
 from utils.logger import setup_logger
-from utils.config import WHISPER_MODEL, WHISPER_LANGUAGE
+from utils.config import WHISPER_MODEL, WHISPER_LANGUAGE, SAMPLE_RATE
+from utils.job_context import JobCancelled
+from utils.progress import tqdm_progress
+from video_processor.audio_extractor import AudioExtractor
+from video_processor.audio_store import get_audio_store
 
 logger = setup_logger(__name__)
 
@@ -41,15 +46,31 @@ class SpeechRecognizer:
         try:
             logger.info(f"Transkripsiyon başlatılıyor: {audio_path}")
             
-            result = self.model.transcribe(
-                audio=audio_path,
-                language=language,
-                verbose=False
-            )
+            # Whisper girişi: SAMPLE_RATE mono; diğer modüllerle paylaşılan
+            # depodan okunur (aynı ses ikinci kez çözülmez)
+            try:
+                audio, _ = get_audio_store().load(audio_path, SAMPLE_RATE, mono=True)
+                audio = np.array(audio)  # Whisper yazılabilir dizi bekler
+            except Exception as e:
+                logger.warning(f"Ses depodan okunamadı, ffmpeg ile çözülüyor: {e}")
+                audio = AudioExtractor.extract_array(audio_path)
+                if audio is None:
+                    audio = audio_path
+            
+            # verbose=False: Whisper ilerlemeyi tqdm çubuğuyla gösterir;
+            # iş içinde çubuk her pencereden sonra işe bildirilir
+            with tqdm_progress('whisper.transcribe', "Whisper"):
+                result = self.model.transcribe(
+                    audio=audio,
+                    language=language,
+                    verbose=False
+                )
             
             logger.info(f"Transkripsiyon tamamlandı")
             return result
         
+        except JobCancelled:
+            raise  # Boş altyazı yazılmasın
         except Exception as e:
             logger.error(f"Transkripsiyon hatası: {e}")
             return None
@@ -94,6 +115,8 @@ class SpeechRecognizer:
             logger.info(f"Altyazılar kaydedildi: {output_srt}")
             return True
         
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"SRT kaydedilirken hata: {e}")
             return False
@@ -106,3 +129,22 @@ class SpeechRecognizer:
         secs = int(seconds % 60)
         millis = int((seconds % 1) * 1000)
         return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+_recognizers = {}
+
+def get_recognizer(model_name: str = WHISPER_MODEL) -> SpeechRecognizer:
+    """Süreç içinde paylaşılan tanıyıcı (model bir kez yüklenir)"""
+    if model_name not in _recognizers:
+        _recognizers[model_name] = SpeechRecognizer(model_name)
+    return _recognizers[model_name]
+
+def save_subtitles(audio_path: str, output_srt: str, model_name: str = WHISPER_MODEL) -> bool:
+    """
+    Altyazıları SRT olarak kaydet
+    
+    Modül seviyesinde olduğu için iş kuyruğunun süreç havuzunda
+    çalıştırılabilir; aynı işçi süreçteki sonraki çağrılar modeli yeniden
+    yüklemez.
+    """
+    return get_recognizer(model_name).save_srt(audio_path, output_srt)
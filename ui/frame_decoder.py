@@ -0,0 +1,146 @@
+"""
+Frame Decoder - Timeline önizlemesi için arka plan kare çözücü
+"""
+import threading
+from collections import OrderedDict
+import cv2
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QImage
+from utils.logger import setup_logger
+from utils.config import PREVIEW_CACHE_MB
+from video_processor.seek_index import FrameReader
+from video_processor.filmstrip import Filmstrip
+
+logger = setup_logger(__name__)
+
+class FrameDecoderThread(QThread):
+    """
+    Kareleri ayrı bir thread'de çözüp küçültülmüş QImage olarak veren çözücü
+    
+    İstekler birleştirilir: çözme sürerken gelen isteklerden sadece en
+    sonuncusu işlenir, arada kalanlar atlanır. Çözülen kareler önizleme
+    boyutuna küçültülüp kare numarasıyla LRU önbellekte tutulur; önbellekteki
+    kareler GUI thread'inde anında gösterilebilir.
+    
+    Örnek:
+        decoder = FrameDecoderThread(FrameReader("video.mp4"), height=150)
+        decoder.frame_ready.connect(on_frame)
+        decoder.start()
+        decoder.request(120)
+    """
+    
+    frame_ready = pyqtSignal(int, QImage)  # (kare numarası, görüntü)
+    
+    def __init__(self, reader: FrameReader, height: int, cache_limit_mb: float = PREVIEW_CACHE_MB):
+        """
+        Args:
+            reader: Kare okuyucu (bundan sonra sadece bu thread kullanır)
+            height: Önizleme yüksekliği (piksel, en-boy oranı korunur)
+            cache_limit_mb: Küçültülmüş kare önbelleği sınırı
+        """
+        super().__init__()
+        self.reader = reader
+        self.height = height
+        self.cache_limit = int(cache_limit_mb * 1024 * 1024)
+        
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._pending = None
+        self._stopped = False
+        self._condition = threading.Condition()
+    
+    def cached(self, frame_number: int) -> QImage:
+        """Önbellekteki kareyi döndür (yoksa None)"""
+        with self._condition:
+            image = self._cache.get(frame_number)
+            if image is not None:
+                self._cache.move_to_end(frame_number)
+            return image
+    
+    def request(self, frame_number: int):
+        """Kareyi çözme kuyruğuna al (bekleyen eski isteğin yerine geçer)"""
+        with self._condition:
+            self._pending = int(frame_number)
+            self._condition.notify()
+    
+    def stop(self):
+        """Thread'i durdur ve bitmesini bekle"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self.wait()
+    
+    def run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                frame_number, self._pending = self._pending, None
+            
+            if self.cached(frame_number) is not None:
+                continue
+            try:
+                image = self._decode(frame_number)
+            except Exception as e:
+                logger.error(f"Önizleme karesi çözülemedi ({frame_number}): {e}")
+                continue
+            if image is None:
+                continue
+            
+            self._remember(frame_number, image)
+            self.frame_ready.emit(frame_number, image)
+    
+    def _decode(self, frame_number: int) -> QImage:
+        """Kareyi oku, önizleme boyutuna küçült ve RGB QImage'e çevir"""
+        frame = self.reader.read(frame_number)
+        if frame is None:
+            return None
+        
+        # Renk dönüşümü küçük kare üzerinde yapılır
+        h, w = frame.shape[:2]
+        new_w = max(int(self.height * w / h), 1)
+        frame = cv2.resize(frame, (new_w, self.height), interpolation=cv2.INTER_AREA)
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        
+        h, w, ch = frame.shape
+        # copy(): QImage numpy belleğine işaret eder, kendi kopyasını tutsun
+        return QImage(frame.data, w, h, ch * w, QImage.Format.Format_RGB888).copy()
+    
+    def _remember(self, frame_number: int, image: QImage):
+        """LRU önbelleğe ekle, sınırı aşan en eski kareleri at"""
+        with self._condition:
+            if frame_number in self._cache:
+                return
+            self._cache[frame_number] = image
+            self._cache_bytes += image.sizeInBytes()
+            while self._cache_bytes > self.cache_limit and len(self._cache) > 1:
+                _, old = self._cache.popitem(last=False)
+                self._cache_bytes -= old.sizeInBytes()
+
+
+class FilmstripThread(QThread):
+    """Filmstrip'i arka planda yükleyen / çıkaran thread"""
+    
+    ready = pyqtSignal(object)  # Filmstrip
+    
+    def __init__(self, video_path: str):
+        super().__init__()
+        self.video_path = video_path
+        self._stopped = False
+    
+    def stop(self):
+        """ffmpeg'i durdur ve thread'in bitmesini bekle"""
+        self._stopped = True
+        self.wait()
+    
+    def run(self):
+        try:
+            strip = Filmstrip.load(self.video_path, cancelled=lambda: self._stopped)
+        except InterruptedError:
+            return
+        except Exception as e:
+            logger.error(f"Filmstrip oluşturulamadı: {e}")
+            return
+        self.ready.emit(strip)
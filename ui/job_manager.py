@@ -0,0 +1,243 @@
+"""
+Job Manager - Arka plan iş kuyruğu (thread ve süreç havuzları)
+"""
+import itertools
+import multiprocessing
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from utils.logger import setup_logger
+from utils.config import MAX_WORKERS, JOB_PROCESS_WORKERS
+from utils.job_context import JobContext, JobCancelled, run_job
+
+logger = setup_logger(__name__)
+
+class Job:
+    """Kuyruktaki bir iş"""
+    
+    QUEUED = "queued"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    
+    # Durumların arayüzdeki adları
+    STATE_LABELS = {
+        QUEUED: "Sırada",
+        RUNNING: "Çalışıyor",
+        FINISHED: "Tamamlandı",
+        FAILED: "Hata",
+        CANCELLED: "İptal edildi"
+    }
+    
+    def __init__(self, job_id: int, title: str, kind: str, context: JobContext, on_done=None):
+        self.id = job_id
+        self.title = title
+        self.kind = kind
+        self.context = context
+        self.on_done = on_done
+        self.state = Job.QUEUED
+        self.progress = 0.0
+        self.message = None
+        self.result = None
+        self.error = None
+        self.future = None
+        self.started = None  # Çalışmaya başladığı an (time.monotonic)
+    
+    @property
+    def active(self) -> bool:
+        return self.state in (Job.QUEUED, Job.RUNNING)
+    
+    @property
+    def eta(self) -> float:
+        """Tahmini kalan süre (saniye, şimdiki hızla); tahmin edilemiyorsa None"""
+        if self.state != Job.RUNNING or self.started is None or self.progress < 0.01:
+            return None
+        elapsed = time.monotonic() - self.started
+        return elapsed * (1.0 - self.progress) / self.progress
+    
+    @property
+    def state_label(self) -> str:
+        return Job.STATE_LABELS[self.state]
+
+
+class JobManager(QObject):
+    """
+    İşleri arka planda çalıştıran kuyruk
+    
+    "thread" işleri (ffmpeg gibi asıl işi dış süreçte yapan veya GIL'i
+    bırakan işler) thread havuzunda, "process" işleri (NumPy / Whisper
+    gibi CPU'ya bağlı işler) ayrı süreç havuzunda çalışır; iki havuz aynı
+    anda dolu olabilir. İşin sonucu on_done(job) ile GUI thread'inde
+    bildirilir.
+    
+    İptal işbirliğine dayanır: iş bağlamındaki bayrak kaldırılır; ffmpeg
+    çağrıları süreci sonlandırır, uzun döngüler check_cancelled() ile
+    çıkar. Henüz başlamamış işler kuyruktan doğrudan düşürülür.
+    
+    Örnek:
+        jobs = JobManager()
+        jobs.submit("Kırpma", VideoTrimmer.trim, src, out, 10, 20,
+                    on_done=lambda job: print(job.result))
+    """
+    
+    job_added = pyqtSignal(object)    # Job
+    job_updated = pyqtSignal(object)  # Job (durum / ilerleme)
+    
+    # İşçi thread / süreçlerinden GUI thread'ine geçiş için (iç kullanım)
+    _progress_received = pyqtSignal(int, float, object)
+    _job_done = pyqtSignal(int)
+    
+    # Süreç işlerinin ilerleme kuyruğunu okuma aralığı (ms)
+    PROCESS_POLL_MS = 100
+    
+    def __init__(self, thread_workers: int = MAX_WORKERS, process_workers: int = JOB_PROCESS_WORKERS):
+        super().__init__()
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.jobs = {}
+        self._ids = itertools.count(1)
+        self._thread_pool = None
+        self._process_pool = None
+        self._mp_manager = None
+        self._process_queue = None
+        
+        self._progress_received.connect(self._on_progress)
+        self._job_done.connect(self._on_done)
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(self.PROCESS_POLL_MS)
+        self._poll_timer.timeout.connect(self._poll_process_progress)
+    
+    def submit(self, title: str, func, *args, kind: str = "thread", on_done=None, **kwargs) -> Job:
+        """
+        İşi kuyruğa ekle
+        
+        Args:
+            title: Kuyrukta görünen ad
+            func: Çalıştırılacak fonksiyon ("process" işlerinde modül
+                seviyesinde / pickle edilebilir olmalı)
+            kind: "thread" veya "process"
+            on_done: İş bitince (başarı, hata veya iptal) GUI thread'inde
+                çağrılacak fonksiyon; Job nesnesini alır
+        """
+        job_id = next(self._ids)
+        if kind == "process":
+            self._ensure_process_pool()
+            context = JobContext(job_id, self._mp_manager.Event(), self._process_queue.put)
+        else:
+            context = JobContext(job_id, sink=self._progress_received.emit)
+        
+        job = Job(job_id, title, kind, context, on_done)
+        self.jobs[job_id] = job
+        
+        pool = self._process_pool if kind == "process" else self._ensure_thread_pool()
+        job.future = pool.submit(run_job, context, func, args, kwargs)
+        job.future.add_done_callback(lambda _: self._job_done.emit(job_id))
+        if kind == "process":
+            self._poll_timer.start()
+        
+        logger.info(f"İş kuyruğa eklendi: #{job_id} {title}")
+        self.job_added.emit(job)
+        return job
+    
+    def cancel(self, job_id: int):
+        """İşi iptal et (başlamadıysa kuyruktan düşür, çalışıyorsa durmasını iste)"""
+        job = self.jobs.get(job_id)
+        if job is None or not job.active:
+            return
+        job.context.cancel()
+        if job.future.cancel():
+            logger.info(f"İş kuyruktan çıkarıldı: #{job_id} {job.title}")
+        else:
+            logger.info(f"İş iptal ediliyor: #{job_id} {job.title}")
+    
+    def active_jobs(self) -> list:
+        return [job for job in self.jobs.values() if job.active]
+    
+    def remove(self, job_id: int):
+        """Bitmiş işi (ve sonucunu) listeden çıkar"""
+        job = self.jobs.get(job_id)
+        if job is not None and not job.active:
+            del self.jobs[job_id]
+    
+    def shutdown(self):
+        """Tüm işleri iptal et ve havuzları kapat"""
+        for job in self.active_jobs():
+            job.context.cancel()
+        self._poll_timer.stop()
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            # İptali bekleyemeyen (tek adımlık NumPy/Whisper) işçiler beklenmez
+            for process in list(getattr(self._process_pool, '_processes', {}).values()):
+                process.terminate()
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+        if self._mp_manager is not None:
+            self._mp_manager.shutdown()
+    
+    def _ensure_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix='job')
+        return self._thread_pool
+    
+    def _ensure_process_pool(self):
+        if self._process_pool is None:
+            # fork, Qt thread'leri olan süreçte güvenli değil
+            mp_context = multiprocessing.get_context('spawn')
+            self._mp_manager = mp_context.Manager()
+            self._process_queue = self._mp_manager.Queue()
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers, mp_context=mp_context)
+    
+    def _on_progress(self, job_id: int, fraction: float, message):
+        job = self.jobs.get(job_id)
+        if job is None or not job.active:
+            return
+        if job.state != Job.RUNNING:
+            job.state = Job.RUNNING
+            job.started = time.monotonic()
+        job.progress = fraction
+        if message:
+            job.message = message
+        self.job_updated.emit(job)
+    
+    def _poll_process_progress(self):
+        """Süreç işlerinden gelen ilerleme bildirimlerini aktar"""
+        while True:
+            try:
+                job_id, fraction, message = self._process_queue.get_nowait()
+            except queue.Empty:
+                break
+            except Exception:
+                return  # Manager kapandı
+            self._on_progress(job_id, fraction, message)
+        
+        if not any(job.kind == "process" and job.active for job in self.jobs.values()):
+            self._poll_timer.stop()
+    
+    def _on_done(self, job_id: int):
+        job = self.jobs[job_id]
+        future = job.future
+        if future.cancelled():
+            job.state = Job.CANCELLED
+        else:
+            try:
+                job.result = future.result()
+                # İşlemciler hatayı yakalayıp False döndürebilir; iptal bayrağı esas alınır
+                job.state = Job.CANCELLED if job.context.cancelled else Job.FINISHED
+            except JobCancelled:
+                job.state = Job.CANCELLED
+            except Exception as e:
+                logger.error(f"İş hatası (#{job_id} {job.title}): {e}")
+                job.error = str(e)
+                job.state = Job.FAILED
+        if job.state == Job.FINISHED:
+            job.progress = 1.0
+        
+        logger.info(f"İş bitti: #{job_id} {job.title} ({job.state_label})")
+        self.job_updated.emit(job)
+        if job.on_done is not None:
+            try:
+                job.on_done(job)
+            except Exception as e:
+                logger.error(f"İş sonucu işlenemedi (#{job_id} {job.title}): {e}")
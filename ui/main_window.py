@@ -15,33 +15,37 @@ from PyQt6.QtGui import QPixmap
 
 from utils.logger import setup_logger
 from utils.config import (
-    WINDOW_WIDTH, WINDOW_HEIGHT, APP_NAME, APP_VERSION, TEMP_DIR
+    WINDOW_WIDTH, WINDOW_HEIGHT, APP_NAME, APP_VERSION, TEMP_DIR, PROXY_ENABLED
 )
 from video_processor import (
     VideoHandler, VideoTrimmer, AudioExtractor,
-    NoiseReducer, AudioMixer, VideoExporter
+    NoiseReducer, NoiseProfile, AudioMixer, AudioGraph, VideoExporter
 )
-from .widgets import VideoDragDropWidget, VideoTimelineWidget
+from video_processor.denoisers import DENOISERS
+from video_processor.proxy import get_proxy_manager
+from .widgets import VideoDragDropWidget, VideoTimelineWidget, JobQueueWidget
+from .job_manager import JobManager, Job
 
 logger = setup_logger(__name__)
 
-class ProcessingThread(QThread):
-    """Arka planda işlem yapan thread"""
-    progress = pyqtSignal(int)
-    finished = pyqtSignal(bool)
+class ProxyThread(QThread):
+    """Arka planda proxy üreten thread"""
+    ready = pyqtSignal(str, str)  # (kaynak, proxy; üretilemezse boş)
     
-    def __init__(self, task_func, *args):
+    def __init__(self, source: str):
         super().__init__()
-        self.task_func = task_func
-        self.args = args
+        self.source = source
+        self._stopped = False
+    
+    def stop(self):
+        """ffmpeg'i durdur ve thread'in bitmesini bekle"""
+        self._stopped = True
+        self.wait()
     
     def run(self):
-        try:
-            self.task_func(*self.args)
-            self.finished.emit(True)
-        except Exception as e:
-            logger.error(f"İşlem hatası: {e}")
-            self.finished.emit(False)
+        proxy = get_proxy_manager().create(self.source, cancelled=lambda: self._stopped)
+        if not self._stopped:
+            self.ready.emit(self.source, proxy or "")
 
 class MainWindow(QMainWindow):
     """Ana pencere"""
@@ -50,6 +54,15 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.current_video_path = None
         self.current_audio_path = None
+        self.noise_profile = None
+        self.audio_graph = None
+        self.mix_tracks = {}
+        self.proxy_threads = {}
+        self.job_manager = JobManager()
+        self.job_manager.job_updated.connect(self.on_job_updated)
+        self._audio_waiters = None  # Geçici ses çıkarılırken bekleyen işlemler
+        self._job_bars = {}  # İş numarası -> işi gösteren sekme ilerleme çubuğu
+        self._mix_job = None
         self.init_ui()
     
     def init_ui(self):
@@ -72,6 +85,14 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self._create_ai_tab(), "🤖 AI Araçları")
         self.tabs.addTab(self._create_settings_tab(), "⚙️ Ayarlar")
         
+        # İş kuyruğu (tüm sekmelerin arka plan işleri)
+        jobs_group = QGroupBox("İşler")
+        jobs_layout = QVBoxLayout()
+        self.job_queue_widget = JobQueueWidget(self.job_manager)
+        jobs_layout.addWidget(self.job_queue_widget)
+        jobs_group.setLayout(jobs_layout)
+        main_layout.addWidget(jobs_group)
+        
         # Status bar
         self.statusBar().showMessage("Hazır")
     
@@ -128,9 +149,9 @@ class MainWindow(QMainWindow):
         trim_group.setLayout(trim_layout)
         layout.addWidget(trim_group)
         
-        # Progress bar
-        self.progress = QProgressBar()
-        layout.addWidget(self.progress)
+        # Progress bar (bu sekmeden başlatılan son iş)
+        self.video_progress = self._create_progress_bar()
+        layout.addWidget(self.video_progress)
         
         layout.addStretch()
         widget.setLayout(layout)
@@ -214,6 +235,32 @@ class MainWindow(QMainWindow):
         self.denoise_strength.setSingleStep(0.1)
         strength_layout.addWidget(self.denoise_strength)
         denoise_layout.addLayout(strength_layout)
+        
+        denoiser_layout = QHBoxLayout()
+        denoiser_layout.addWidget(QLabel("Yöntem:"))
+        self.denoiser_combo = QComboBox()
+        for name, denoiser_class in DENOISERS.items():
+            self.denoiser_combo.addItem(denoiser_class.label, name)
+        denoiser_layout.addWidget(self.denoiser_combo)
+        denoise_layout.addLayout(denoiser_layout)
+        
+        noise_method_layout = QHBoxLayout()
+        noise_method_layout.addWidget(QLabel("Gürültü Tahmini:"))
+        self.noise_method_combo = QComboBox()
+        self.noise_method_combo.addItem("Sessiz Bölümler", "quiet_frames")
+        self.noise_method_combo.addItem("Minimum İstatistik", "minimum_statistics")
+        self.noise_method_combo.addItem("İlk 1 Saniye", "leading")
+        noise_method_layout.addWidget(self.noise_method_combo)
+        denoise_layout.addLayout(noise_method_layout)
+        
+        profile_layout = QHBoxLayout()
+        save_profile_btn = QPushButton("💾 Profili Kaydet")
+        save_profile_btn.clicked.connect(self.save_noise_profile)
+        profile_layout.addWidget(save_profile_btn)
+        load_profile_btn = QPushButton("📂 Profil Yükle")
+        load_profile_btn.clicked.connect(self.load_noise_profile)
+        profile_layout.addWidget(load_profile_btn)
+        denoise_layout.addLayout(profile_layout)
 
         auto_strength_btn = QPushButton("🤖 Otomatik Güç")
         auto_strength_btn.clicked.connect(self.auto_set_denoise_strength)
@@ -233,6 +280,27 @@ class MainWindow(QMainWindow):
         mix_group = QGroupBox("Ses Karıştır")
         mix_layout = QVBoxLayout()
         
+        mix_options_layout = QHBoxLayout()
+        mix_options_layout.addWidget(QLabel("Seviye:"))
+        self.mix_volume = QDoubleSpinBox()
+        self.mix_volume.setMinimum(0)
+        self.mix_volume.setMaximum(1)
+        self.mix_volume.setValue(0.3)
+        self.mix_volume.setSingleStep(0.05)
+        mix_options_layout.addWidget(self.mix_volume)
+        
+        mix_options_layout.addWidget(QLabel("Geçiş (s):"))
+        self.mix_fade = QDoubleSpinBox()
+        self.mix_fade.setMaximum(30)
+        self.mix_fade.setValue(2.0)
+        self.mix_fade.setSingleStep(0.5)
+        mix_options_layout.addWidget(self.mix_fade)
+        
+        self.mix_loop_checkbox = QCheckBox("🔁 Tekrarla")
+        self.mix_loop_checkbox.setChecked(True)
+        mix_options_layout.addWidget(self.mix_loop_checkbox)
+        mix_layout.addLayout(mix_options_layout)
+        
         mix_btn = QPushButton("🎵 Arka Plan Sesi Ekle")
         mix_btn.clicked.connect(self.mix_audio)
         mix_layout.addWidget(mix_btn)
@@ -240,8 +308,8 @@ class MainWindow(QMainWindow):
         mix_group.setLayout(mix_layout)
         layout.addWidget(mix_group)
         
-        self.progress = QProgressBar()
-        layout.addWidget(self.progress)
+        self.audio_progress = self._create_progress_bar()
+        layout.addWidget(self.audio_progress)
         
         layout.addStretch()
         widget.setLayout(layout)
@@ -285,13 +353,21 @@ class MainWindow(QMainWindow):
         vc_group.setLayout(vc_layout)
         layout.addWidget(vc_group)
         
-        self.progress = QProgressBar()
-        layout.addWidget(self.progress)
+        self.ai_progress = self._create_progress_bar()
+        layout.addWidget(self.ai_progress)
         
         layout.addStretch()
         widget.setLayout(layout)
         return widget
     
+    @staticmethod
+    def _create_progress_bar() -> QProgressBar:
+        bar = QProgressBar()
+        bar.setRange(0, 1000)  # İş ilerlemesi binde bir çözünürlükle
+        bar.setValue(0)
+        bar.setFormat("")
+        return bar
+    
     def _create_settings_tab(self):
         """Ayarlar sekmesi"""
         widget = QWidget()
@@ -311,6 +387,14 @@ class MainWindow(QMainWindow):
         )
         layout.addWidget(info_label)
         
+        self.proxy_checkbox = QCheckBox("Ağır videolarda önizleme ve analiz için proxy kullan")
+        self.proxy_checkbox.setChecked(PROXY_ENABLED)
+        self.proxy_checkbox.setToolTip(
+            "4K / HEVC gibi kaynaklar arka planda düşük çözünürlüklü kopyaya çevrilir; "
+            "kırpma ve dışa aktarma yine orijinal dosyadan yapılır"
+        )
+        layout.addWidget(self.proxy_checkbox)
+        
         layout.addStretch()
         widget.setLayout(layout)
         return widget
@@ -335,6 +419,7 @@ class MainWindow(QMainWindow):
         """Video'yu iç olarak yükle"""
         try:
             self.current_video_path = file_path
+            self._cancel_stale_proxies()
             handler = VideoHandler(file_path)
             info = handler.get_info()
             
@@ -345,7 +430,7 @@ class MainWindow(QMainWindow):
             if self.timeline_widget:
                 self.timeline_widget.close()
             
-            self.timeline_widget = VideoTimelineWidget(file_path)
+            self.timeline_widget = VideoTimelineWidget(self._preview_path(file_path))
             
             # Eski layout'u temizle
             while self.timeline_container_layout.count():
@@ -354,22 +439,22 @@ class MainWindow(QMainWindow):
             self.timeline_container_layout.addWidget(self.timeline_widget)
             
             # Timeline slider'larını spinbox'lara bağla (senkronizasyon)
-            # Slider değeri frame numarası, FPS ile bölüp saniyeye çevir
-            fps = self.timeline_widget.fps
+            # Slider değeri frame numarası, seek dizininden saniyeye çevir
+            timeline = self.timeline_widget
             self.timeline_widget.start_slider.valueChanged.connect(
-                lambda v: self.trim_start.blockSignals(True) or self.trim_start.setValue(v / fps) or self.trim_start.blockSignals(False)
+                lambda v: self.trim_start.blockSignals(True) or self.trim_start.setValue(timeline.time_of(v)) or self.trim_start.blockSignals(False)
             )
             self.timeline_widget.end_slider.valueChanged.connect(
-                lambda v: self.trim_end.blockSignals(True) or self.trim_end.setValue(v / fps) or self.trim_end.blockSignals(False)
+                lambda v: self.trim_end.blockSignals(True) or self.trim_end.setValue(timeline.time_of(v)) or self.trim_end.blockSignals(False)
             )
             
             # Spinbox'ları timeline slider'larına bağla
-            # Spinbox değeri saniye, FPS ile çarpıp frame numarasına çevir
+            # Spinbox değeri saniye, seek dizininden frame numarasına çevir
             self.trim_start.valueChanged.connect(
-                lambda v: self.timeline_widget.start_slider.blockSignals(True) or self.timeline_widget.start_slider.setValue(int(v * fps)) or self.timeline_widget.start_slider.blockSignals(False)
+                lambda v: self.timeline_widget.start_slider.blockSignals(True) or self.timeline_widget.start_slider.setValue(self.timeline_widget.frame_at(v)) or self.timeline_widget.start_slider.blockSignals(False)
             )
             self.trim_end.valueChanged.connect(
-                lambda v: self.timeline_widget.end_slider.blockSignals(True) or self.timeline_widget.end_slider.setValue(int(v * fps)) or self.timeline_widget.end_slider.blockSignals(False)
+                lambda v: self.timeline_widget.end_slider.blockSignals(True) or self.timeline_widget.end_slider.setValue(self.timeline_widget.frame_at(v)) or self.timeline_widget.end_slider.blockSignals(False)
             )
             
             # Status mesajı
@@ -397,6 +482,7 @@ class MainWindow(QMainWindow):
         """Ses işleme sekmesi için video'yu iç olarak yükle"""
         try:
             self.audio_video_path = file_path
+            self._cancel_stale_proxies()
             handler = VideoHandler(file_path)
             info = handler.get_info()
             
@@ -407,7 +493,7 @@ class MainWindow(QMainWindow):
             if self.audio_timeline_widget:
                 self.audio_timeline_widget.close()
             
-            self.audio_timeline_widget = VideoTimelineWidget(file_path)
+            self.audio_timeline_widget = VideoTimelineWidget(self._preview_path(file_path))
             
             # Eski layout'u temizle
             while self.audio_timeline_container_layout.count():
@@ -416,20 +502,20 @@ class MainWindow(QMainWindow):
             self.audio_timeline_container_layout.addWidget(self.audio_timeline_widget)
             
             # Timeline slider'larını spinbox'lara bağla (senkronizasyon)
-            fps = self.audio_timeline_widget.fps
+            timeline = self.audio_timeline_widget
             self.audio_timeline_widget.start_slider.valueChanged.connect(
-                lambda v: self.audio_extract_start.blockSignals(True) or self.audio_extract_start.setValue(v / fps) or self.audio_extract_start.blockSignals(False)
+                lambda v: self.audio_extract_start.blockSignals(True) or self.audio_extract_start.setValue(timeline.time_of(v)) or self.audio_extract_start.blockSignals(False)
             )
             self.audio_timeline_widget.end_slider.valueChanged.connect(
-                lambda v: self.audio_extract_end.blockSignals(True) or self.audio_extract_end.setValue(v / fps) or self.audio_extract_end.blockSignals(False)
+                lambda v: self.audio_extract_end.blockSignals(True) or self.audio_extract_end.setValue(timeline.time_of(v)) or self.audio_extract_end.blockSignals(False)
             )
             
             # Spinbox'ları timeline slider'larına bağla
             self.audio_extract_start.valueChanged.connect(
-                lambda v: self.audio_timeline_widget.start_slider.blockSignals(True) or self.audio_timeline_widget.start_slider.setValue(int(v * fps)) or self.audio_timeline_widget.start_slider.blockSignals(False)
+                lambda v: self.audio_timeline_widget.start_slider.blockSignals(True) or self.audio_timeline_widget.start_slider.setValue(self.audio_timeline_widget.frame_at(v)) or self.audio_timeline_widget.start_slider.blockSignals(False)
             )
             self.audio_extract_end.valueChanged.connect(
-                lambda v: self.audio_timeline_widget.end_slider.blockSignals(True) or self.audio_timeline_widget.end_slider.setValue(int(v * fps)) or self.audio_timeline_widget.end_slider.blockSignals(False)
+                lambda v: self.audio_timeline_widget.end_slider.blockSignals(True) or self.audio_timeline_widget.end_slider.setValue(self.audio_timeline_widget.frame_at(v)) or self.audio_timeline_widget.end_slider.blockSignals(False)
             )
             
             # Status mesajı
@@ -440,6 +526,57 @@ class MainWindow(QMainWindow):
             logger.error(f"Video yükleme hatası (Ses): {e}")
             self.statusBar().showMessage(f"❌ Hata: {str(e)[:50]}")
     
+    def _analysis_path(self, source: str) -> str:
+        """Önizleme / analiz için kullanılacak dosya (proxy hazırsa proxy)"""
+        if self.proxy_checkbox.isChecked():
+            return get_proxy_manager().get(source) or source
+        return source
+    
+    def _preview_path(self, source: str) -> str:
+        """Önizleme dosyası; proxy gerekiyor ama yoksa arka planda üretimini başlat"""
+        path = self._analysis_path(source)
+        if path != source or not self.proxy_checkbox.isChecked():
+            return path
+        
+        if source not in self.proxy_threads and get_proxy_manager().needs_proxy(source):
+            thread = ProxyThread(source)
+            thread.ready.connect(self.on_proxy_ready)
+            self.proxy_threads[source] = thread
+            thread.start()
+            logger.info(f"Proxy arka planda hazırlanıyor: {source}")
+        return source
+    
+    def on_proxy_ready(self, source: str, proxy: str):
+        """Proxy hazır olduğunda açık timeline'ları proxy'ye geçir (kesim noktaları korunur)"""
+        thread = self.proxy_threads.pop(source, None)
+        if thread:
+            thread.wait()
+        if not proxy:
+            self.statusBar().showMessage(f"⚠️ Proxy oluşturulamadı, orijinal dosya kullanılıyor: {Path(source).name}")
+            return
+        
+        if self.current_video_path == source and self.timeline_widget:
+            start_time, end_time = self.timeline_widget.get_start_end_seconds()
+            self.load_video_internal(source)
+            self._restore_range(self.timeline_widget, start_time, end_time)
+        if getattr(self, 'audio_video_path', None) == source and self.audio_timeline_widget:
+            start_time, end_time = self.audio_timeline_widget.get_start_end_seconds()
+            self.load_video_audio_internal(source)
+            self._restore_range(self.audio_timeline_widget, start_time, end_time)
+        self.statusBar().showMessage(f"✅ Proxy hazır, önizleme proxy üzerinden: {Path(source).name}")
+    
+    @staticmethod
+    def _restore_range(timeline, start_time: float, end_time: float):
+        """Timeline kesim noktalarını saniye cinsinden geri yükle"""
+        timeline.start_slider.setValue(timeline.frame_at(start_time))
+        timeline.end_slider.setValue(timeline.frame_at(end_time))
+    
+    def _cancel_stale_proxies(self):
+        """Artık açık olmayan videolar için süren proxy üretimlerini iptal et"""
+        active = {self.current_video_path, getattr(self, 'audio_video_path', None)}
+        for source in [source for source in self.proxy_threads if source not in active]:
+            self.proxy_threads.pop(source).stop()
+    
     def trim_video(self):
         """Video kırp"""
         if not self.current_video_path:
@@ -462,20 +599,15 @@ class MainWindow(QMainWindow):
         
         if output_path:
             logger.info(f"Video kırpma başlatılıyor: {start_time}s - {end_time}s")
-            self.statusBar().showMessage("Video kırpılıyor... (biraz zaman alabilir)")
+            self.statusBar().showMessage("Video kırpma işi kuyruğa eklendi")
             
-            trimmer = VideoTrimmer()
-            success = trimmer.trim(
-                self.current_video_path,
-                output_path,
-                start_time,
-                end_time
+            name = Path(output_path).name
+            self._submit_job(
+                self.video_progress,
+                f"Video kırpma: {name}",
+                VideoTrimmer.trim, self.current_video_path, output_path, start_time, end_time,
+                on_done=lambda job: self._report_job(job, f"✅ Video başarıyla kırpıldı: {name}", "❌ Video kırpılamadı")
             )
-            
-            if success:
-                self.statusBar().showMessage(f"✅ Video başarıyla kırpıldı: {Path(output_path).name}")
-            else:
-                self.statusBar().showMessage("❌ Video kırpılamadı")
     
     def extract_audio_video(self):
         """Ses ve/veya video'yu indir (checkbox'a göre)"""
@@ -514,16 +646,18 @@ class MainWindow(QMainWindow):
             
             if output_audio_path:
                 logger.info(f"Ses çıkarma başlatılıyor: {video_path} ({start_time:.1f}s - {end_time:.1f}s)")
-                self.statusBar().showMessage("Ses çıkarılıyor... (biraz zaman alabilir)")
+                self.statusBar().showMessage("Ses çıkarma işi kuyruğa eklendi")
                 
-                extractor = AudioExtractor()
-                success = extractor.extract(video_path, output_audio_path, start_time, end_time)
+                def on_audio_done(job, output_audio_path=output_audio_path):
+                    if self._report_job(job, f"✅ Ses başarıyla çıkarıldı: {Path(output_audio_path).name}", "❌ Ses çıkarılamadı"):
+                        self.current_audio_path = output_audio_path
                 
-                if success:
-                    self.current_audio_path = output_audio_path
-                    self.statusBar().showMessage(f"✅ Ses başarıyla çıkarıldı: {Path(output_audio_path).name}")
-                else:
-                    self.statusBar().showMessage("❌ Ses çıkarılamadı")
+                self._submit_job(
+                    self.audio_progress,
+                    f"Ses çıkarma: {Path(output_audio_path).name}",
+                    AudioExtractor.extract, video_path, output_audio_path, start_time, end_time,
+                    on_done=on_audio_done
+                )
         
         # Video indir
         if download_video:
@@ -539,25 +673,60 @@ class MainWindow(QMainWindow):
             
             if output_video_path:
                 logger.info(f"Sessiz video kırpması başlatılıyor: {video_path} ({start_time:.1f}s - {end_time:.1f}s)")
-                self.statusBar().showMessage("Sessiz video kırpılıyor... (biraz zaman alabilir)")
+                self.statusBar().showMessage("Sessiz video kırpma işi kuyruğa eklendi")
                 
-                trimmer = VideoTrimmer()
-                success = trimmer.trim_silent(video_path, output_video_path, start_time, end_time)
-                
-                if success:
-                    self.statusBar().showMessage(f"✅ Sessiz video başarıyla kırpıldı: {Path(output_video_path).name}")
-                else:
-                    self.statusBar().showMessage("❌ Video kırpılamadı")
+                name = Path(output_video_path).name
+                self._submit_job(
+                    self.audio_progress,
+                    f"Sessiz video: {name}",
+                    VideoTrimmer.trim_silent, video_path, output_video_path, start_time, end_time,
+                    on_done=lambda job: self._report_job(job, f"✅ Sessiz video başarıyla kırpıldı: {name}", "❌ Video kırpılamadı")
+                )
 
-    def _ensure_current_audio_path(self) -> bool:
-        """Gerekirse seçili videodan geçici ses çıkarıp current_audio_path set eder."""
-        if self.current_audio_path:
+    def _submit_job(self, bar: QProgressBar, title: str, func, *args, **kwargs) -> Job:
+        """İşi kuyruğa ekle; sekmenin ilerleme çubuğu bu işi göstersin"""
+        job = self.job_manager.submit(title, func, *args, **kwargs)
+        self._job_bars = {job_id: other for job_id, other in self._job_bars.items() if other is not bar}
+        self._job_bars[job.id] = bar
+        JobQueueWidget.show_progress(bar, job)
+        return job
+    
+    def on_job_updated(self, job):
+        """İşi gösteren sekme ilerleme çubuğunu güncelle"""
+        bar = self._job_bars.get(job.id)
+        if bar is None:
+            return
+        JobQueueWidget.show_progress(bar, job)
+        if not job.active:
+            del self._job_bars[job.id]
+    
+    def _report_job(self, job, success_message: str, failure_message: str) -> bool:
+        """Biten işin sonucunu durum çubuğunda göster; başarılıysa True döner"""
+        if job.state == Job.CANCELLED:
+            self.statusBar().showMessage(f"⛔ İş iptal edildi: {job.title}")
+            return False
+        if job.state == Job.FINISHED and job.result:
+            self.statusBar().showMessage(success_message)
             return True
-
+        self.statusBar().showMessage(failure_message + (f": {job.error[:50]}" if job.error else ""))
+        return False
+    
+    def _with_current_audio(self, callback):
+        """
+        current_audio_path hazırsa callback'i hemen çağırır; değilse seçili
+        videodan geçici ses çıkaran bir iş başlatır ve iş bitince çağırır.
+        """
+        if self.current_audio_path:
+            callback()
+            return
+        if self._audio_waiters is not None:
+            self._audio_waiters.append(callback)  # Çıkarma zaten sürüyor
+            return
+        
         video_path = None
         start_time = 0.0
         end_time = None
-
+        
         # Öncelik: Ses sekmesinde yüklü video
         if hasattr(self, 'audio_video_path') and self.audio_video_path:
             video_path = self.audio_video_path
@@ -567,30 +736,36 @@ class MainWindow(QMainWindow):
             video_path = self.current_video_path
             if self.timeline_widget:
                 start_time, end_time = self.timeline_widget.get_start_end_seconds()
-
+        
         if not video_path:
-            return False
-
-        try:
-            TEMP_DIR.mkdir(exist_ok=True)
-            tmp_audio_path = str(TEMP_DIR / f"{Path(video_path).stem}_auto_audio.wav")
-            self.statusBar().showMessage("Ses çıkarılıyor... (gürültü azaltma için)")
-            extractor = AudioExtractor()
-            success = extractor.extract(video_path, tmp_audio_path, float(start_time), end_time)
-            if success:
+            self.statusBar().showMessage("Lütfen önce bir video seçin")
+            return
+        
+        TEMP_DIR.mkdir(exist_ok=True)
+        tmp_audio_path = str(TEMP_DIR / f"{Path(video_path).stem}_auto_audio.wav")
+        self._audio_waiters = [callback]
+        
+        def on_done(job):
+            waiters, self._audio_waiters = self._audio_waiters, None
+            if self._report_job(job, "✅ Ses çıkarıldı", "❌ Ses çıkarılamadı"):
                 self.current_audio_path = tmp_audio_path
-                return True
-            return False
-        except Exception as e:
-            logger.error(f"Otomatik ses çıkarma hatası: {e}")
-            return False
+                for waiter in waiters:
+                    waiter()
+        
+        self.statusBar().showMessage("Ses çıkarılıyor...")
+        # Proxy'deki ses kaynaktan kopyalandığı için aynıdır, ama dosya çok daha küçüktür
+        self._submit_job(
+            self.audio_progress,
+            f"Ses çıkarma: {Path(video_path).name}",
+            AudioExtractor.extract, self._analysis_path(video_path), tmp_audio_path, float(start_time), end_time,
+            on_done=on_done
+        )
     
     def reduce_noise(self):
         """Gürültü azalt"""
-        if not self._ensure_current_audio_path():
-            self.statusBar().showMessage("Lütfen önce bir video seçin")
-            return
-        
+        self._with_current_audio(self._start_noise_reduction)
+    
+    def _start_noise_reduction(self):
         audio_name = Path(self.current_audio_path).stem
         default_path = str(Path.home() / "Desktop" / f"{audio_name}_denoised.wav")
         
@@ -602,46 +777,184 @@ class MainWindow(QMainWindow):
         )
         
         if output_path:
-            self.statusBar().showMessage("Gürültü azaltılıyor... (biraz zaman alabilir)")
+            self.statusBar().showMessage("Gürültü azaltma işi kuyruğa eklendi")
             logger.info(f"Gürültü azaltma başlatılıyor...")
             
-            reducer = NoiseReducer()
-            result = reducer.reduce_noise(
+            # NumPy ağırlıklı iş: GIL'i tutmasın diye ayrı süreçte
+            self._submit_job(
+                self.audio_progress,
+                f"Gürültü azaltma: {Path(output_path).name}",
+                NoiseReducer.reduce_noise,
                 self.current_audio_path,
                 output_path,
+                kind="process",
+                on_done=lambda job: self.on_noise_reduced(job, output_path),
                 reduction_strength=self.denoise_strength.value(),
-                get_metrics=True
+                get_metrics=True,
+                noise_method=self.noise_method_combo.currentData(),
+                noise_profile=self.noise_profile,
+                denoiser=self.denoiser_combo.currentData()
             )
-            
-            if isinstance(result, dict) and result.get("success"):
-                self.current_audio_path = output_path
-                metrics = result.get("metrics") or {}
-                if metrics:
-                    snr_db = metrics.get("snr_db")
-                    quality = metrics.get("quality_score")
-                    self.denoise_metrics_label.setText(f"SNR: {snr_db:.1f} dB | Kalite: {quality:.2f}/5")
-                self.statusBar().showMessage(f"✅ Gürültü azaltıldı: {Path(output_path).name}")
-            else:
-                error_msg = result.get("error") if isinstance(result, dict) else None
-                self.statusBar().showMessage("❌ Gürültü azaltılamadı" + (f": {error_msg}" if error_msg else ""))
-
-    def auto_set_denoise_strength(self):
-        """Gürültü azaltma gücünü otomatik ayarla"""
-        if not self._ensure_current_audio_path():
-            self.statusBar().showMessage("Lütfen önce bir video seçin")
+    
+    def on_noise_reduced(self, job, output_path: str):
+        """Gürültü azaltma işi bitti"""
+        if job.state == Job.CANCELLED:
+            self.statusBar().showMessage(f"⛔ İş iptal edildi: {job.title}")
             return
+        
+        result = job.result
+        if isinstance(result, dict) and result.get("success"):
+            self.current_audio_path = output_path
+            metrics = result.get("metrics") or {}
+            if metrics:
+                snr_db = metrics.get("snr_db")
+                quality = metrics.get("quality_score")
+                text = f"SNR: {snr_db:.1f} dB | Kalite: {quality:.2f}/5"
+                segments = metrics.get("segments") or []
+                if len(segments) > 1:
+                    worst = min(segments, key=lambda segment: segment["quality_score"])
+                    text += f" | En zayıf: {worst['start']:.0f}-{worst['end']:.0f} sn ({worst['quality_score']:.2f})"
+                self.denoise_metrics_label.setText(text)
+            self.statusBar().showMessage(f"✅ Gürültü azaltıldı: {Path(output_path).name}")
+        else:
+            error_msg = result.get("error") if isinstance(result, dict) else job.error
+            self.statusBar().showMessage("❌ Gürültü azaltılamadı" + (f": {error_msg}" if error_msg else ""))
 
+    def save_noise_profile(self):
+        """Mevcut sesin gürültü profilini başka kayıtlarda kullanmak üzere kaydet"""
+        self._with_current_audio(self._save_noise_profile)
+    
+    def _save_noise_profile(self):
+        self.statusBar().showMessage("Gürültü profili çıkarılıyor...")
+        self._submit_job(
+            self.audio_progress,
+            f"Gürültü profili: {Path(self.current_audio_path).name}",
+            NoiseReducer.estimate_noise_profile,
+            self.current_audio_path,
+            self.noise_method_combo.currentData(),
+            on_done=self.on_noise_profile_estimated
+        )
+    
+    def on_noise_profile_estimated(self, job):
+        """Gürültü profili işi bitti: kaydetme yerini sor"""
+        if not self._report_job(job, "✅ Gürültü profili çıkarıldı", "❌ Gürültü profili çıkarılamadı"):
+            return
+        
+        output_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Gürültü Profilini Kaydet",
+            str(Path.home() / "Desktop" / "noise_profile.npz"),
+            "Gürültü Profili (*.npz)"
+        )
+        if output_path:
+            job.result.save(output_path)
+            self.statusBar().showMessage(f"✅ Gürültü profili kaydedildi: {Path(output_path).name}")
+    
+    def load_noise_profile(self):
+        """Kaydedilmiş gürültü profilini yükle"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Gürültü Profili Seç",
+            "",
+            "Gürültü Profili (*.npz)"
+        )
+        if not file_path:
+            return
+        
         try:
-            strength = NoiseReducer.auto_detect_strength(self.current_audio_path)
-            self.denoise_strength.setValue(float(strength))
-            self.statusBar().showMessage(f"🤖 Otomatik güç ayarlandı: {strength:.2f}")
+            self.noise_profile = NoiseProfile.load(file_path)
+            self.statusBar().showMessage(f"✅ Gürültü profili yüklendi: {Path(file_path).name}")
         except Exception as e:
-            logger.error(f"Otomatik güç ayarı UI hata: {e}")
-            self.statusBar().showMessage("❌ Otomatik güç ayarlanamadı")
+            logger.error(f"Gürültü profili yüklenemedi: {e}")
+            self.statusBar().showMessage("❌ Gürültü profili yüklenemedi")
+
+    def auto_set_denoise_strength(self):
+        """Gürültü azaltma gücünü otomatik ayarla"""
+        self._with_current_audio(self._auto_set_denoise_strength)
+    
+    def _auto_set_denoise_strength(self):
+        self.statusBar().showMessage("Gürültü seviyesi ölçülüyor...")
+        self._submit_job(
+            self.audio_progress,
+            f"Otomatik güç: {Path(self.current_audio_path).name}",
+            NoiseReducer.auto_detect_strength,
+            self.current_audio_path,
+            on_done=self.on_denoise_strength_detected
+        )
+    
+    def on_denoise_strength_detected(self, job):
+        """Otomatik güç işi bitti"""
+        if self._report_job(job, "", "❌ Otomatik güç ayarlanamadı"):
+            strength = float(job.result)
+            self.denoise_strength.setValue(strength)
+            self.statusBar().showMessage(f"🤖 Otomatik güç ayarlandı: {strength:.2f}")
     
     def mix_audio(self):
-        """Ses karıştır"""
-        self.statusBar().showMessage("Ses karıştırma özelliği yakında eklenecek")
+        """Mevcut sesin altına arka plan sesi ekle"""
+        if self._mix_job is not None and self._mix_job.active:
+            self.statusBar().showMessage("Karıştırma işi sürüyor, bitmesini bekleyin")
+            return
+        self._with_current_audio(self._start_mix)
+    
+    def _start_mix(self):
+        background_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Arka Plan Sesi Seç",
+            self.mix_tracks.get('background_path', ""),
+            "Ses Dosyaları (*.wav *.mp3 *.flac *.ogg *.m4a *.aac);;Tüm Dosyalar (*)"
+        )
+        if not background_path:
+            return
+        
+        audio_name = Path(self.current_audio_path).stem
+        output_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Karışımı Kaydet",
+            str(Path.home() / "Desktop" / f"{audio_name}_mix.wav"),
+            "WAV Dosyası (*.wav)"
+        )
+        if not output_path:
+            return
+        
+        fade = self.mix_fade.value()
+        background = {
+            'gain': self.mix_volume.value(),
+            'fade_in': fade,
+            'fade_out': fade,
+            'loop': self.mix_loop_checkbox.isChecked(),
+            'duration': None,
+        }
+        
+        try:
+            # Aynı sesler için graf korunur: sadece arka plan izi güncellenir,
+            # önbellekteki bloklar yeniden kullanılır
+            sources = (self.current_audio_path, background_path)
+            if self.audio_graph is None or self.mix_tracks.get('sources') != sources:
+                if self.audio_graph is not None:
+                    self.audio_graph.close()
+                self.audio_graph = AudioGraph()
+                self.mix_tracks = {
+                    'sources': sources,
+                    'background_path': background_path,
+                    'voice': self.audio_graph.add_track(self.current_audio_path),
+                    'background': self.audio_graph.add_track(background_path, **background),
+                }
+            else:
+                self.audio_graph.update_track(self.mix_tracks['background'], **background)
+        except Exception as e:
+            logger.error(f"Karışım hazırlanamadı: {e}")
+            self.statusBar().showMessage("❌ Sesler karıştırılamadı")
+            return
+        
+        self.statusBar().showMessage("Karıştırma işi kuyruğa eklendi")
+        # Graf (ve blok önbelleği) bu süreçte kalsın diye thread işi
+        name = Path(output_path).name
+        self._mix_job = self._submit_job(
+            self.audio_progress,
+            f"Karıştırma: {name}",
+            self.audio_graph.render, output_path,
+            on_done=lambda job: self._report_job(job, f"✅ Karışım kaydedildi: {name}", "❌ Sesler karıştırılamadı")
+        )
     
     def generate_subtitles(self):
         """Otomatik altyazı oluştur"""
@@ -660,19 +973,33 @@ class MainWindow(QMainWindow):
         )
         
         if output_path:
-            self.statusBar().showMessage("Altyazılar oluşturuluyor... (2-3 dakika alabilir)")
+            self.statusBar().showMessage("Altyazı işi kuyruğa eklendi (2-3 dakika alabilir)")
             logger.info(f"Altyazı oluşturma başlatılıyor: {self.current_audio_path}")
             
             try:
-                from ai_module import SpeechRecognizer
-                recognizer = SpeechRecognizer()
-                success = recognizer.save_srt(self.current_audio_path, output_path)
-                
-                if success:
-                    self.statusBar().showMessage(f"✅ Altyazılar oluşturuldu: {Path(output_path).name}")
-                else:
-                    self.statusBar().showMessage("❌ Altyazılar oluşturulamadı")
+                from ai_module.speech_recognition import save_subtitles
             except Exception as e:
                 logger.error(f"Altyazı oluşturulamadı: {e}")
                 self.statusBar().showMessage(f"❌ Hata: {str(e)[:50]}")
+                return
+            
+            name = Path(output_path).name
+            self._submit_job(
+                self.ai_progress,
+                f"Altyazı: {name}",
+                save_subtitles, self.current_audio_path, output_path,
+                kind="process",
+                on_done=lambda job: self._report_job(job, f"✅ Altyazılar oluşturuldu: {name}", "❌ Altyazılar oluşturulamadı")
+            )
 
+    
+    def closeEvent(self, event):
+        """Pencere kapanırken önizleme ve proxy thread'lerini ve işleri durdur"""
+        for widget in (self.timeline_widget, self.audio_timeline_widget):
+            if widget:
+                widget.close()
+        for thread in self.proxy_threads.values():
+            thread.stop()
+        self.proxy_threads.clear()
+        self.job_manager.shutdown()
+        super().closeEvent(event)
@@ -1,11 +1,16 @@
 """
 Custom Widgets - Özel PyQt6 bileşenleri
 """
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSlider, QSpinBox
-from PyQt6.QtCore import Qt, pyqtSignal, QMimeData
-from PyQt6.QtGui import QPixmap, QImage, QDrag
-import cv2
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSlider, QSpinBox,
+    QTableWidget, QTableWidgetItem, QProgressBar, QPushButton, QHeaderView, QAbstractItemView
+)
+from PyQt6.QtCore import Qt, pyqtSignal, QMimeData, QRect
+from PyQt6.QtGui import QPixmap, QImage, QDrag, QPainter
 from pathlib import Path
+from video_processor.seek_index import FrameReader
+from .frame_decoder import FrameDecoderThread, FilmstripThread
+from .job_manager import Job
 
 class VideoDragDropWidget(QWidget):
     """Sürükle-bırak destekli video yükleme widget'ı"""
@@ -64,22 +69,50 @@ class VideoDragDropWidget(QWidget):
 class VideoTimelineWidget(QWidget):
     """Video timeline widget - kesme noktalarını göster"""
     
+    # Önizleme karesinin yüksekliği (piksel)
+    PREVIEW_HEIGHT = 150
+    
+    # Filmstrip şeridinin yüksekliği (piksel)
+    FILMSTRIP_VIEW_HEIGHT = 40
+    
     def __init__(self, video_path: str):
         super().__init__()
         self.video_path = video_path
-        self.cap = cv2.VideoCapture(video_path)
-        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
-        self.total_duration = self.total_frames / self.fps if self.fps > 0 else 0
+        self.reader = FrameReader(video_path)
+        self.cap = self.reader.cap
+        self.total_frames = self.reader.frame_count
+        self.fps = self.reader.fps
+        self.total_duration = self.reader.duration
         
         self.start_frame = 0
         self.end_frame = self.total_frames
         
+        # Kareler arka planda çözülür; cap artık sadece decoder thread'inde kullanılır
+        self.decoder = FrameDecoderThread(self.reader, self.PREVIEW_HEIGHT)
+        self.decoder.frame_ready.connect(self.on_frame_ready)
+        self.decoder.start()
+        self._wanted_frame = None
+        self._shown_frame = None
+        
+        # Filmstrip tek geçişte arka planda çıkarılır (önbellekte varsa yüklenir)
+        self.filmstrip = None
+        self._sprite_image = None
+        self.filmstrip_thread = FilmstripThread(video_path)
+        self.filmstrip_thread.ready.connect(self.on_filmstrip_ready)
+        
         self.init_ui()
+        self.filmstrip_thread.start()
     
     def init_ui(self):
         layout = QVBoxLayout()
         
+        # Filmstrip
+        self.filmstrip_label = QLabel()
+        self.filmstrip_label.setFixedHeight(self.FILMSTRIP_VIEW_HEIGHT)
+        self.filmstrip_label.setMinimumWidth(1)
+        self.filmstrip_label.setStyleSheet("background-color: #000;")
+        layout.addWidget(self.filmstrip_label)
+        
         # Timeline slider
         slider_layout = QHBoxLayout()
         
@@ -88,8 +121,7 @@ class VideoTimelineWidget(QWidget):
         self.start_slider.setMinimum(0)
         self.start_slider.setMaximum(self.total_frames)
         self.start_slider.setValue(0)
-        self.start_slider.sliderMoved.connect(self.on_start_changed)
-        self.start_slider.valueChanged.connect(self.on_start_changed)  # spinbox ile senkron için
+        self.start_slider.valueChanged.connect(self.on_start_changed)  # Sürükleme ve spinbox senkronu
         slider_layout.addWidget(self.start_slider)
         
         self.start_time_label = QLabel("0s")
@@ -106,8 +138,7 @@ class VideoTimelineWidget(QWidget):
         self.end_slider.setMinimum(0)
         self.end_slider.setMaximum(self.total_frames)
         self.end_slider.setValue(self.total_frames)
-        self.end_slider.sliderMoved.connect(self.on_end_changed)
-        self.end_slider.valueChanged.connect(self.on_end_changed)  # spinbox ile senkron için
+        self.end_slider.valueChanged.connect(self.on_end_changed)  # Sürükleme ve spinbox senkronu
         end_slider_layout.addWidget(self.end_slider)
         
         self.end_time_label = QLabel(f"{self.total_duration:.1f}s")
@@ -118,7 +149,7 @@ class VideoTimelineWidget(QWidget):
         
         # Preview frame
         self.preview_label = QLabel("Preview frame burada gösterilecek")
-        self.preview_label.setMinimumHeight(150)
+        self.preview_label.setMinimumHeight(self.PREVIEW_HEIGHT)
         self.preview_label.setStyleSheet("border: 1px solid #ccc; background-color: #000;")
         layout.addWidget(self.preview_label)
         
@@ -130,48 +161,196 @@ class VideoTimelineWidget(QWidget):
     def on_start_changed(self, value):
         """Başlangıç değiştiğinde"""
         self.start_frame = value
-        start_time = value / self.fps
+        start_time = self.time_of(value)
         self.start_time_label.setText(f"{start_time:.1f}s")
         self.show_frame(value)
     
     def on_end_changed(self, value):
         """Bitiş değiştiğinde"""
         self.end_frame = value
-        end_time = value / self.fps
+        end_time = self.time_of(value)
         self.end_time_label.setText(f"{end_time:.1f}s")
         self.show_frame(value)
     
     def show_frame(self, frame_number):
-        """Frame'i göster"""
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-        ret, frame = self.cap.read()
-        
-        if ret:
-            # Frame'i resize et (arayüze uyacak şekilde)
-            h, w = frame.shape[:2]
-            aspect_ratio = w / h
-            new_h = 150
-            new_w = int(new_h * aspect_ratio)
-            frame = cv2.resize(frame, (new_w, new_h))
-            
-            # BGR -> RGB
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # QImage'e dönüştür
-            h, w, ch = frame.shape
-            bytes_per_line = 3 * w
-            qt_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-            
-            # Pixmap oluştur ve göster
-            pixmap = QPixmap.fromImage(qt_image)
-            self.preview_label.setPixmap(pixmap)
+        """Frame'i göster (önbellekte yoksa arka planda çözülmesini iste)"""
+        self._wanted_frame = frame_number
+        image = self.decoder.cached(frame_number)
+        if image is not None:
+            self._set_preview(frame_number, image)
+            return
+        
+        # Kare gelene kadar filmstrip'teki en yakın küçük resim gösterilir
+        if self.filmstrip is not None:
+            self._set_preview(None, self._thumbnail(self.time_of(frame_number), self.PREVIEW_HEIGHT))
+        self.decoder.request(frame_number)
+    
+    def on_frame_ready(self, frame_number, image):
+        """Decoder'dan kare geldiğinde"""
+        # Sürükleme sırasında ara kareler de gösterilir; istenen kare
+        # gösterildikten sonra geç gelen eski kare onu ezmez
+        if self._shown_frame != self._wanted_frame:
+            self._set_preview(frame_number, image)
+    
+    def _set_preview(self, frame_number, image):
+        self.preview_label.setPixmap(QPixmap.fromImage(image))
+        self._shown_frame = frame_number
+    
+    def on_filmstrip_ready(self, strip):
+        """Filmstrip hazır olduğunda şeridi çiz"""
+        self.filmstrip = strip
+        sprite = strip.sprite
+        self._sprite_image = QImage(
+            sprite.data, sprite.shape[1], sprite.shape[0], sprite.strides[0], QImage.Format.Format_RGB888
+        )
+        self._draw_filmstrip()
+        if self._shown_frame is None and self._wanted_frame is not None:
+            self._set_preview(None, self._thumbnail(self.time_of(self._wanted_frame), self.PREVIEW_HEIGHT))
+    
+    def _thumbnail(self, seconds: float, height: int) -> QImage:
+        """Verilen ana en yakın küçük resim (yüksekliğe ölçeklenmiş)"""
+        strip = self.filmstrip
+        row, column = divmod(strip.index_at(seconds), strip.columns)
+        tile = self._sprite_image.copy(
+            column * strip.tile_width, row * strip.tile_height, strip.tile_width, strip.tile_height
+        )
+        return tile.scaledToHeight(height, Qt.TransformationMode.SmoothTransformation)
+    
+    def _draw_filmstrip(self):
+        """Şeridi widget genişliğine eşit aralıklı küçük resimlerle doldur"""
+        if self.filmstrip is None:
+            return
+        width = max(self.filmstrip_label.width(), 1)
+        height = self.FILMSTRIP_VIEW_HEIGHT
+        tile_width = max(round(self.filmstrip.tile_width * height / self.filmstrip.tile_height), 1)
+        count = max(-(-width // tile_width), 1)
+        
+        pixmap = QPixmap(width, height)
+        pixmap.fill(Qt.GlobalColor.black)
+        painter = QPainter(pixmap)
+        for i in range(count):
+            seconds = (i + 0.5) * self.total_duration / count
+            painter.drawImage(QRect(i * tile_width, 0, tile_width, height), self._thumbnail(seconds, height))
+        painter.end()
+        self.filmstrip_label.setPixmap(pixmap)
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._draw_filmstrip()
     
     def get_start_end_seconds(self):
         """Başlangıç ve bitiş zamanlarını saniye cinsinden döndür"""
-        start_seconds = self.start_frame / self.fps
-        end_seconds = self.end_frame / self.fps
+        start_seconds = self.time_of(self.start_frame)
+        end_seconds = self.time_of(self.end_frame)
         return start_seconds, end_seconds
     
+    def time_of(self, frame_number: int) -> float:
+        """Kare numarasını saniyeye çevir (VFR dosyalarda gerçek zaman)"""
+        return self.reader.time_of(frame_number)
+    
+    def frame_at(self, seconds: float) -> int:
+        """Saniyeyi kare numarasına çevir"""
+        return self.reader.frame_at(seconds)
+    
     def close(self):
         """Kaynakları kapat"""
-        self.cap.release()
+        self.filmstrip_thread.stop()
+        self.decoder.stop()
+        self.reader.close()
+
+
+class JobQueueWidget(QWidget):
+    """İş kuyruğu - arka plan işlerinin durumu, ilerlemesi ve iptali"""
+    
+    def __init__(self, job_manager):
+        super().__init__()
+        self.job_manager = job_manager
+        self._rows = {}  # İş numarası -> tablo satırı
+        self.init_ui()
+        
+        job_manager.job_added.connect(self.on_job_added)
+        job_manager.job_updated.connect(self.on_job_updated)
+    
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels(["İş", "Durum", "İlerleme"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setMaximumHeight(140)
+        layout.addWidget(self.table)
+        
+        button_layout = QHBoxLayout()
+        cancel_btn = QPushButton("⛔ Seçili İşi İptal Et")
+        cancel_btn.clicked.connect(self.cancel_selected)
+        button_layout.addWidget(cancel_btn)
+        clear_btn = QPushButton("🧹 Bitenleri Temizle")
+        clear_btn.clicked.connect(self.clear_finished)
+        button_layout.addWidget(clear_btn)
+        button_layout.addStretch()
+        layout.addLayout(button_layout)
+        
+        self.setLayout(layout)
+    
+    def on_job_added(self, job):
+        """Yeni iş için satır ekle"""
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        item = QTableWidgetItem(job.title)
+        item.setData(Qt.ItemDataRole.UserRole, job.id)
+        self.table.setItem(row, 0, item)
+        self.table.setItem(row, 1, QTableWidgetItem(job.state_label))
+        bar = QProgressBar()
+        bar.setRange(0, 1000)
+        self.table.setCellWidget(row, 2, bar)
+        self._rows[job.id] = row
+        self.on_job_updated(job)
+    
+    def on_job_updated(self, job):
+        """Satırdaki durum ve ilerlemeyi güncelle"""
+        row = self._rows.get(job.id)
+        if row is None:
+            return
+        label = job.state_label
+        if job.state == Job.FAILED and job.error:
+            label += f": {job.error[:40]}"
+        elif job.state == Job.RUNNING and job.message:
+            label += f" - {job.message}"
+        self.table.item(row, 1).setText(label)
+        self.show_progress(self.table.cellWidget(row, 2), job)
+    
+    @staticmethod
+    def show_progress(bar: QProgressBar, job):
+        """İşin ilerlemesini ve tahmini kalan süresini çubukta göster (0-1000 aralıklı)"""
+        bar.setValue(round(job.progress * 1000))
+        if job.state != Job.RUNNING:
+            bar.setFormat(job.state_label)
+            return
+        eta = job.eta
+        if eta is None:
+            bar.setFormat("%p%")
+        else:
+            minutes, seconds = divmod(int(eta + 0.5), 60)
+            bar.setFormat(f"%p% · ~{minutes}:{seconds:02d} kaldı")
+    
+    def cancel_selected(self):
+        """Seçili satırlardaki işleri iptal et"""
+        for row in sorted({index.row() for index in self.table.selectedIndexes()}):
+            self.job_manager.cancel(self.table.item(row, 0).data(Qt.ItemDataRole.UserRole))
+    
+    def clear_finished(self):
+        """Biten (tamamlanan, hatalı, iptal) işlerin satırlarını kaldır"""
+        for job_id, row in sorted(self._rows.items(), key=lambda item: -item[1]):
+            job = self.job_manager.jobs.get(job_id)
+            if job is not None and not job.active:
+                self.table.removeRow(row)
+                self.job_manager.remove(job_id)
+        # Kalan satırların numaralarını yeniden çıkar
+        self._rows = {
+            self.table.item(row, 0).data(Qt.ItemDataRole.UserRole): row
+            for row in range(self.table.rowCount())
+        }
@@ -22,11 +22,34 @@ MODELS_DIR.mkdir(exist_ok=True)
 VIDEO_FORMATS = ('.mp4', '.mov', '.avi', '.mkv', '.flv')
 MAX_VIDEO_DURATION_MINUTES = 120  # 2 saat
 SUPPORTED_AUDIO_FORMATS = ('.wav', '.mp3', '.aac', '.m4a')
+SMART_CUT_ENABLED = True  # Kırpmada sadece kısmi GOP'ları yeniden kodla
+EXPORT_PRESETS_FILE = PROJECT_ROOT / "presets.yaml"  # Kullanıcı dışa aktarma preset'leri
+INACCURATE_SEEK_FORMATS = ('.avi', '.flv', '.ts', '.mpg', '.mpeg', '.vob')  # Giriş seek'i güvenilmez
+FILMSTRIP_INTERVAL = 2.0  # Timeline küçük resimleri arası süre (saniye)
+FILMSTRIP_HEIGHT = 72  # Küçük resim yüksekliği (piksel)
+FILMSTRIP_MAX_FRAMES = 1200  # Uzun videolarda aralık bu sayıya göre büyütülür
+FILMSTRIP_COLUMNS = 32  # Sprite sheet sütun sayısı
+PROXY_ENABLED = True  # Ağır kaynaklarda önizleme/analiz proxy üzerinden yapılır
+PROXY_DIR = TEMP_DIR / "proxies"  # Proxy dosyaları (içerik hash'iyle)
+PROXY_HEIGHT = 540  # Proxy yüksekliği (piksel)
+PROXY_GOP = 12  # Proxy keyframe aralığı (kısa GOP = hızlı rastgele erişim)
+PROXY_MIN_SOURCE_HEIGHT = 1080  # Bundan yüksek kaynaklar için proxy üretilir
+PROXY_HEAVY_CODECS = ('hevc', 'av1', 'vp9', 'prores', 'dnxhd')  # Çözmesi ağır codec'ler
+PROXY_DISK_MB = 20480  # Proxy disk sınırı
 
 # Audio Ayarları
-SAMPLE_RATE = 16000  # Whisper için optimize
+SAMPLE_RATE = 16000  # Whisper girişi ve analiz için (işleme kaynağın kendi hızında yapılır)
 NOISE_REDUCTION_THRESHOLD = 0.02
 AUDIO_NORMALIZATION_LEVEL = -20.0  # dB
+ANALYSIS_CACHE_DIR = TEMP_DIR / "analysis_cache"  # Analiz önbelleği
+ANALYSIS_CACHE_MEMORY_MB = 256  # Bellek içi önbellek sınırı
+ANALYSIS_CACHE_DISK_MB = 1024  # Disk önbellek sınırı
+AUDIO_GRAPH_CACHE_MB = 256  # Karışım bloklarının bellek önbelleği
+AUDIO_STORE_DIR = TEMP_DIR / "audio_store"  # Çözülmüş ses deposu (.npy, bellek eşlemeli)
+AUDIO_STORE_DISK_MB = 4096  # Ses deposu disk sınırı
+
+# Arayüz Ayarları
+PREVIEW_CACHE_MB = 64  # Timeline önizleme karelerinin bellek önbelleği
 
 # AI Model Ayarları
 WHISPER_MODEL = "base"  # tiny, base, small, medium, large
@@ -43,4 +66,5 @@ THEME = "dark"  # light, dark
 
 # İşlem Ayarları
 MAX_WORKERS = 4  # Paralel işlem sayısı
+JOB_PROCESS_WORKERS = 2  # CPU'ya bağlı işler (gürültü azaltma, Whisper) için süreç sayısı
 TIMEOUT_SECONDS = 3600  # 1 saat
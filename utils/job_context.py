@@ -0,0 +1,133 @@
+"""
+Job Context - Arka plan işleri için iptal ve ilerleme bağlamı
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+class JobCancelled(Exception):
+    """İş kullanıcı tarafından iptal edildi"""
+
+class JobContext:
+    """
+    Çalışan bir işin iptal bayrağı ve ilerleme bildirimi
+    
+    İşlemciler (VideoTrimmer, NoiseReducer vb.) bağlamı parametre olarak
+    almaz; iş çalışırken current_job() ile erişilir. İş dışında (doğrudan
+    çağrıda) current_job() None döner ve hiçbir şey değişmez.
+    
+    Bağlam süreçler arası da kullanılır: cancel_event bir Manager Event'i,
+    sink bir Manager kuyruğunun put'u olabilir (ikisi de pickle edilebilir).
+    """
+    
+    # İlerleme bildirimleri en fazla bu sıklıkta iletilir (saniye)
+    REPORT_INTERVAL = 0.1
+    
+    def __init__(self, job_id: int = 0, cancel_event=None, sink=None):
+        """
+        Args:
+            job_id: İş numarası
+            cancel_event: set() edildiğinde işin durması istenen Event
+            sink: (job_id, oran, mesaj) alan fonksiyon (None ise bildirim yapılmaz)
+        """
+        self.job_id = job_id
+        self.cancel_event = cancel_event if cancel_event is not None else threading.Event()
+        self.sink = sink
+        self._last_report = 0.0
+        self._span = (0.0, 1.0)
+    
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+    
+    def cancel(self):
+        self.cancel_event.set()
+    
+    def check(self):
+        """
+        İptal istendiyse JobCancelled fırlat
+        
+        Raises:
+            JobCancelled: İş iptal edildiyse
+        """
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+    
+    def progress(self, fraction: float, message: str = None, force: bool = False):
+        """İlerlemeyi bildir (0-1); sık çağrılar REPORT_INTERVAL'a seyreltilir"""
+        if self.sink is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_report < self.REPORT_INTERVAL:
+            return
+        self._last_report = now
+        start, end = self._span
+        fraction = min(max(float(fraction), 0.0), 1.0)
+        self.sink(self.job_id, start + (end - start) * fraction, message)
+    
+    @contextmanager
+    def span(self, start: float, end: float):
+        """
+        Bloktaki 0-1 ilerlemeyi toplam ilerlemenin [start, end] aralığına eşle
+        
+        Birden fazla adımdan (ör. birkaç ffmpeg çağrısı) oluşan işlerde
+        ilerleme çubuğunun her adımda başa dönmemesi içindir; iç içe
+        kullanılabilir.
+        """
+        previous = self._span
+        low, high = previous
+        self._span = (low + (high - low) * start, low + (high - low) * end)
+        try:
+            yield self
+        finally:
+            self._span = previous
+
+
+_local = threading.local()
+
+def current_job() -> JobContext:
+    """Bu thread'de çalışan işin bağlamı (iş dışında None)"""
+    return getattr(_local, 'job', None)
+
+@contextmanager
+def job_scope(context: JobContext):
+    """Bloğu verilen iş bağlamında çalıştır"""
+    previous = current_job()
+    _local.job = context
+    try:
+        yield context
+    finally:
+        _local.job = previous
+
+def check_cancelled():
+    """Çalışan iş iptal edildiyse JobCancelled fırlat (iş dışında bir şey yapmaz)"""
+    job = current_job()
+    if job is not None:
+        job.check()
+
+def report_progress(fraction: float, message: str = None):
+    """Çalışan işin ilerlemesini bildir (iş dışında bir şey yapmaz)"""
+    job = current_job()
+    if job is not None:
+        job.progress(fraction, message)
+
+@contextmanager
+def progress_span(start: float, end: float):
+    """Çalışan işte JobContext.span (iş dışında bir şey yapmaz)"""
+    job = current_job()
+    if job is None:
+        yield None
+        return
+    with job.span(start, end):
+        yield job
+
+def run_job(context: JobContext, func, args: tuple, kwargs: dict):
+    """
+    İşi bağlamıyla çalıştır (thread ve süreç havuzu işçilerinin giriş noktası)
+    
+    Modül seviyesinde olduğu için süreç havuzuna gönderilebilir.
+    """
+    with job_scope(context):
+        context.check()
+        context.progress(0.0, force=True)  # İş başladı
+        return func(*args, **kwargs)
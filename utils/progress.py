@@ -0,0 +1,147 @@
+"""
+Progress - ffmpeg, MoviePy ve Whisper ilerlemesini işlere aktaran yardımcılar
+"""
+import importlib
+import re
+import types
+from contextlib import contextmanager
+import proglog
+from .job_context import JobContext, current_job
+
+
+def output_duration(args: list) -> float:
+    """
+    ffmpeg argümanlarındaki süre sınırı (-t); yoksa None
+    
+    Birden fazla -t varsa (giriş ve çıkış) en kısası çıkışı sınırlar.
+    """
+    durations = []
+    for flag, value in zip(args, args[1:]):
+        if str(flag) == '-t':
+            try:
+                durations.append(float(value))
+            except ValueError:
+                continue
+    return min(durations) if durations else None
+
+
+class FFmpegProgress:
+    """
+    ffmpeg'in -progress çıktısını (anahtar=değer satırları) işin
+    ilerlemesine çeviren ayrıştırıcı
+    
+    ffmpeg her bildirim bloğunu progress=continue / progress=end satırıyla
+    bitirir; blok sonunda out_time_us toplam süreye bölünür. Süre
+    bilinmiyorsa stderr'deki ilk "Duration:" satırından alınır.
+    
+    Örnek:
+        parser = FFmpegProgress(current_job(), duration=12.5)
+        for line in process.stdout:
+            parser.feed(line)
+    """
+    
+    DURATION_PATTERN = re.compile(rb'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)')
+    
+    def __init__(self, job: JobContext, duration: float = None):
+        """
+        Args:
+            job: İlerlemenin bildirileceği iş bağlamı
+            duration: Çıkış süresi (saniye, bilinmiyorsa None)
+        """
+        self.job = job
+        self.duration = duration if duration and duration > 0 else None
+        self._time = 0.0
+        self._speed = None
+    
+    def feed(self, line: bytes):
+        """-progress çıktısından bir satır işle"""
+        key, _, value = line.strip().partition(b'=')
+        if key == b'out_time_us':
+            try:
+                self._time = int(value) / 1e6
+            except ValueError:
+                pass  # N/A (henüz çıkış yok)
+        elif key == b'speed':
+            try:
+                self._speed = float(value.strip().rstrip(b'x'))
+            except ValueError:
+                self._speed = None  # N/A
+        elif key == b'progress' and self.duration:
+            message = f"ffmpeg {self._speed:.1f}x" if self._speed else None
+            self.job.progress(self._time / self.duration, message, force=value == b'end')
+    
+    def feed_log(self, line: bytes):
+        """stderr'den bir satır işle (süre bilinmiyorsa giriş süresini bul)"""
+        if self.duration is not None:
+            return
+        match = self.DURATION_PATTERN.search(line)
+        if match:
+            hours, minutes, seconds = match.groups()
+            self.duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds) or None
+
+
+class JobProgressLogger(proglog.ProgressBarLogger):
+    """
+    MoviePy'nin proglog çubuklarını işin ilerlemesine çeviren logger
+    
+    MoviePy önce sesi ('chunk'), sonra kareleri ('frame_index') yazar;
+    her çubuk toplam ilerlemede kendi aralığına eşlenir.
+    """
+    
+    # Çubuk adı -> toplam ilerlemedeki aralık
+    BAR_SPANS = {
+        'chunk': (0.0, 0.1),
+        'frame_index': (0.1, 1.0)
+    }
+    
+    def __init__(self, job: JobContext):
+        super().__init__()
+        self.job = job
+    
+    def bars_callback(self, bar, attr, value, old_value=None):
+        if attr != 'index':
+            return
+        self.job.check()  # İptal: MoviePy yazma döngüsünden çıkılır
+        total = self.bars[bar].get('total')
+        if total:
+            start, end = self.BAR_SPANS.get(bar, (0.0, 1.0))
+            self.job.progress(start + (end - start) * min(value / total, 1.0))
+
+
+def moviepy_logger():
+    """Çalışan iş için MoviePy logger'ı (iş dışında None: çıktı yok)"""
+    job = current_job()
+    return JobProgressLogger(job) if job is not None else None
+
+
+@contextmanager
+def tqdm_progress(module_name: str, message: str = None):
+    """
+    Bloğun içinde verilen modülün tqdm.tqdm çubuklarını çalışan işe bağla
+    
+    Modül 'import tqdm' ile tqdm.tqdm kullanmalı (ör. whisper.transcribe;
+    Whisper her çözülen pencereden sonra çubuğu günceller). Çubuk her
+    güncellendiğinde ilerleme bildirilir ve iptal kontrol edilir. İş
+    dışında hiçbir şey değişmez.
+    """
+    job = current_job()
+    if job is None:
+        yield
+        return
+    
+    module = importlib.import_module(module_name)
+    original = module.tqdm
+    
+    class JobTqdm(original.tqdm):
+        def update(self, n=1):
+            result = super().update(n)
+            if self.total:
+                job.progress(self.n / self.total, message)
+            job.check()
+            return result
+    
+    module.tqdm = types.SimpleNamespace(tqdm=JobTqdm)
+    try:
+        yield
+    finally:
+        module.tqdm = original
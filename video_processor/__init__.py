@@ -3,7 +3,9 @@ from .video_handler import VideoHandler
 from .trimmer import VideoTrimmer
 from .audio_extractor import AudioExtractor
 from .noise_reducer import NoiseReducer
+from .noise_profile import NoiseProfile
 from .audio_mixer import AudioMixer
+from .audio_graph import AudioGraph
 from .exporter import VideoExporter
 
 __all__ = [
@@ -11,6 +13,8 @@ __all__ = [
     'VideoTrimmer',
     'AudioExtractor',
     'NoiseReducer',
+    'NoiseProfile',
     'AudioMixer',
+    'AudioGraph',
     'VideoExporter'
 ]
@@ -0,0 +1,290 @@
+"""
+Analysis Cache - Analiz sonuçları için önbellek
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+from utils.logger import setup_logger
+from utils.config import (
+    SAMPLE_RATE, ANALYSIS_CACHE_DIR, ANALYSIS_CACHE_MEMORY_MB, ANALYSIS_CACHE_DISK_MB
+)
+from .noise_profile import NoiseProfile
+from .noise_level import noise_level_stats, noise_level_stats_file
+from .audio_store import get_audio_store
+
+logger = setup_logger(__name__)
+
+class AnalysisCache:
+    """
+    Bellek + disk LRU önbelleği
+    
+    Anahtar: dosya içeriğinin hash'i (büyük dosyalarda örneklemeli) + analiz türü +
+    parametreler (zaman aralığı, örnekleme hızı vb.). Değerler isimli
+    numpy dizileri olarak saklanır (.npz); bellek ve disk tarafı ayrı
+    boyut sınırlarıyla en eski kullanılandan başlayarak temizlenir.
+    """
+    
+    # İçerik hash'i için okunan parça boyu ve parça sayısı (baş, orta, son)
+    HASH_CHUNK_SIZE = 1024 * 1024
+    HASH_CHUNKS = 3
+    # Bu boyuta kadar olan dosyalar tamamen hash'lenir
+    FULL_HASH_LIMIT = 64 * 1024 * 1024
+    
+    # Analiz sonuçlarının biçimi değiştiğinde artırılır (eski kayıtlar kullanılmaz)
+    VERSION = 2
+    
+    def __init__(
+        self,
+        cache_dir: str = ANALYSIS_CACHE_DIR,
+        memory_limit_mb: float = ANALYSIS_CACHE_MEMORY_MB,
+        disk_limit_mb: float = ANALYSIS_CACHE_DISK_MB
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.memory_limit = int(memory_limit_mb * 1024 * 1024)
+        self.disk_limit = int(disk_limit_mb * 1024 * 1024)
+        
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._hashes = {}
+        self._lock = threading.RLock()
+    
+    def content_hash(self, path: str) -> str:
+        """
+        Dosya içeriğinin hash'i
+        
+        FULL_HASH_LIMIT'e kadar olan dosyalar tamamen hash'lenir. Daha
+        büyük dosyalarda boyut ve mtime (ns) ile baş, orta ve son
+        HASH_CHUNK_SIZE baytı hash'lenir; büyük videolarda bile birkaç MB
+        okunur, örneklenmeyen bölgedeki değişiklik mtime ile yakalanır.
+        Sonuç (yol, boyut, mtime) için bellekte tutulur.
+        """
+        stat = os.stat(path)
+        stamp = (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if stamp in self._hashes:
+                return self._hashes[stamp]
+        
+        digest = hashlib.blake2b(str(stat.st_size).encode(), digest_size=16)
+        with open(path, 'rb') as f:
+            if stat.st_size <= self.FULL_HASH_LIMIT:
+                for chunk in iter(lambda: f.read(self.HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            else:
+                digest.update(str(stat.st_mtime_ns).encode())
+                span = stat.st_size - self.HASH_CHUNK_SIZE
+                offsets = sorted({span * i // max(self.HASH_CHUNKS - 1, 1) for i in range(self.HASH_CHUNKS)})
+                for offset in offsets:
+                    f.seek(offset)
+                    digest.update(f.read(self.HASH_CHUNK_SIZE))
+        
+        value = digest.hexdigest()
+        with self._lock:
+            self._hashes[stamp] = value
+        return value
+    
+    def make_key(self, kind: str, path: str, **params) -> str:
+        """Analiz türü, içerik ve parametrelerden önbellek anahtarı üret"""
+        parts = [str(self.VERSION), kind, self.content_hash(path)]
+        parts += [f"{name}={params[name]!r}" for name in sorted(params)]
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> dict:
+        """Önbellekteki değeri döndür (yoksa None)"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        
+        path = self.cache_dir / f"{key}.npz"
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                value = {name: data[name] for name in data.files}
+            os.utime(path)  # Disk LRU sırası için erişim zamanı
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Bozuk önbellek kaydı siliniyor: {path.name} ({e})")
+            path.unlink(missing_ok=True)
+            return None
+        
+        self._remember(key, value)
+        return value
+    
+    def put(self, key: str, value: dict):
+        """Değeri belleğe ve diske yaz, sınırları aşan eski kayıtları temizle"""
+        value = {name: np.asarray(array) for name, array in value.items()}
+        self._remember(key, value)
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_dir / f"{key}.tmp.npz"
+            np.savez(tmp_path, **value)
+            os.replace(tmp_path, self.cache_dir / f"{key}.npz")
+            self._evict_disk()
+        except Exception as e:
+            logger.warning(f"Önbellek diske yazılamadı: {e}")
+    
+    def get_or_compute(self, kind: str, path: str, compute, **params) -> dict:
+        """
+        Önbellekte varsa döndür, yoksa compute() ile hesaplayıp sakla
+        
+        Args:
+            kind: Analiz türü ("stats", "noise_profile" vb.)
+            path: Kaynak dosya
+            compute: Parametresiz, isimli dizilerden oluşan dict döndüren fonksiyon
+            **params: Sonucu etkileyen parametreler (anahtara eklenir)
+        """
+        key = self.make_key(kind, path, **params)
+        value = self.get(key)
+        if value is not None:
+            logger.debug(f"Önbellekten okundu: {kind} ({Path(path).name})")
+            return value
+        
+        value = {name: np.asarray(array) for name, array in compute().items()}
+        self.put(key, value)
+        return value
+    
+    def clear(self):
+        """Bellek ve disk önbelleğini boşalt"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        for path in self.cache_dir.glob("*.npz"):
+            path.unlink(missing_ok=True)
+    
+    def _remember(self, key: str, value: dict):
+        """Bellek LRU'suna ekle (paylaşıldığı için diziler salt okunur yapılır)"""
+        for array in value.values():
+            array.flags.writeable = False
+        size = sum(array.nbytes for array in value.values())
+        if size > self.memory_limit:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= sum(a.nbytes for a in self._memory.pop(key).values())
+            self._memory[key] = value
+            self._memory_bytes += size
+            while self._memory_bytes > self.memory_limit:
+                _, old = self._memory.popitem(last=False)
+                self._memory_bytes -= sum(a.nbytes for a in old.values())
+    
+    def _evict_disk(self):
+        """Disk sınırı aşıldıysa en eski kullanılan kayıtları sil"""
+        entries = []
+        for path in self.cache_dir.glob("*.npz"):
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except FileNotFoundError:
+                continue
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_limit:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.debug(f"Önbellekten silindi: {path.name}")
+    
+    # Yüksek seviye analizler
+    
+    def load_audio(self, path: str, sr: int = SAMPLE_RATE, start: float = None, end: float = None) -> np.ndarray:
+        """
+        Mono float32 sesi paylaşılan çözülmüş ses deposundan döndür
+        
+        Args:
+            start: Başlangıç (saniye, None ise dosya başı)
+            end: Bitiş (saniye, None ise dosya sonu)
+        """
+        y, sr = get_audio_store().load(path, sr, mono=True)
+        first = round((start or 0.0) * sr)
+        last = None if end is None else round(end * sr)
+        return y[first:last]
+    
+    def load_native(self, path: str) -> tuple:
+        """
+        Sesi kendi örnekleme hızında ve kanal düzeninde paylaşılan depodan yükle
+        
+        Returns:
+            ((kanal, örnek) float32 dizi, örnekleme hızı)
+        """
+        return get_audio_store().load(path)
+    
+    def spectrum_stats(
+        self,
+        path: str,
+        sr: int = SAMPLE_RATE,
+        start: float = None,
+        end: float = None,
+        method: str = "sampled"
+    ) -> dict:
+        """
+        STFT genlik istatistikleri (gürültü seviyesi tahmini için)
+        
+        Args:
+            method: "sampled" (rastgele frame'ler; tüm dosya için çözme
+                yapılmadan) veya "exact" (tüm STFT)
+        
+        Returns:
+            {'mean', 'percentile_10', 'noise_level', 'frames', 'rank_error'}
+        """
+        def compute():
+            if method == "sampled" and start is None and end is None:
+                try:
+                    return noise_level_stats_file(path, sr)
+                except Exception as e:
+                    logger.debug(f"Örneklemeli okuma yapılamadı, ses çözülüyor: {e}")
+            return noise_level_stats(self.load_audio(path, sr, start, end), method)
+        
+        value = self.get_or_compute('stats', path, compute, sr=sr, start=start, end=end, method=method)
+        return {name: float(array) for name, array in value.items()}
+    
+    def noise_profile(
+        self,
+        path: str,
+        method: str = "quiet_frames",
+        noise_duration: float = 1.0,
+        sr: int = SAMPLE_RATE
+    ) -> NoiseProfile:
+        """
+        Gürültü profilini önbellekli çıkar
+        
+        Args:
+            sr: Profilin örnekleme hızı; None ise dosyanın kendi hızında ve
+                tüm kanallarıyla sabit bellekle (streaming) çıkarılır
+        """
+        def compute():
+            if sr is None:
+                try:
+                    profile = NoiseProfile.from_file(path, method, noise_duration)
+                except RuntimeError:
+                    # soundfile'ın açamadığı formatlar (m4a vb.) çözülerek işlenir
+                    y, native_sr = self.load_native(path)
+                    profile = NoiseProfile.from_audio(y, native_sr, method, noise_duration)
+            else:
+                profile = NoiseProfile.from_audio(self.load_audio(path, sr), sr, method, noise_duration)
+            return {
+                'spectrum': profile.spectrum,
+                'sample_rate': profile.sample_rate,
+                'n_fft': profile.n_fft
+            }
+        
+        # noise_duration sadece "leading" yönteminde sonucu etkiler
+        duration = noise_duration if method == "leading" else None
+        value = self.get_or_compute(
+            'noise_profile', path, compute, method=method, noise_duration=duration, sr=sr
+        )
+        return NoiseProfile(value['spectrum'], int(value['sample_rate']), int(value['n_fft']), method)
+
+
+_default_cache = None
+
+def get_analysis_cache() -> AnalysisCache:
+    """Uygulama genelinde paylaşılan önbellek"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AnalysisCache()
+    return _default_cache
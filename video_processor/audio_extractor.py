@@ -1,62 +1,128 @@
 """
 Audio Extractor - Ses çıkarma
 """
+import subprocess
 from pathlib import Path
-from moviepy import VideoFileClip
-import soundfile as sf
+import numpy as np
 from utils.logger import setup_logger
 from utils.config import SAMPLE_RATE
+from utils.job_context import JobCancelled
+from .ffmpeg_utils import run_ffmpeg
 
 logger = setup_logger(__name__)
 
 class AudioExtractor:
     """Video'dan ses çıkarma"""
     
+    @staticmethod
+    def _input_args(video_path: str, start_time: float = 0, end_time: float = None, asr: bool = False) -> list:
+        """
+        Seek + sınırlı süre için ffmpeg argümanları
+        
+        Args:
+            asr: Konuşma tanıma için mono/SAMPLE_RATE'e dönüştür (aksi halde
+                kaynağın örnekleme hızı ve kanal düzeni korunur)
+        """
+        args = []
+        if start_time:
+            args += ['-ss', start_time]
+        args += ['-i', video_path]
+        if end_time is not None:
+            args += ['-t', max(end_time - (start_time or 0), 0)]
+        args += ['-map', '0:a:0', '-vn']
+        if asr:
+            args += ['-ac', 1, '-ar', SAMPLE_RATE]
+        return args
+    
+    @staticmethod
+    def _has_no_audio(error: subprocess.CalledProcessError) -> bool:
+        """ffmpeg hatası ses akışı olmamasından mı kaynaklanıyor"""
+        stderr = error.stderr.decode(errors='ignore') if error.stderr else ''
+        return 'matches no streams' in stderr
+    
     @staticmethod
     def extract(
         video_path: str,
         audio_output: str,
         start_time: float = 0,
-        end_time: float = None
+        end_time: float = None,
+        asr: bool = False
     ) -> bool:
         """
-        Video'dan ses çıkar
+        Video'dan ses çıkar (kaynağın örnekleme hızı ve kanallarıyla)
         
         Args:
             video_path: Video dosyası
             audio_output: Çıkış ses dosyası (.wav)
             start_time: Başlangıç zamanı
             end_time: Bitiş zamanı
+            asr: Konuşma tanıma için SAMPLE_RATE mono çıkar
         """
         try:
             logger.info(f"Ses çıkarılıyor: {video_path}")
             
-            video = VideoFileClip(video_path)
+            # WAV için PCM, diğer uzantılarda ffmpeg varsayılan encoder'ı
+            codec_args = []
+            if Path(audio_output).suffix.lower() == '.wav':
+                codec_args = ['-c:a', 'pcm_s16le']
             
-            if video.audio is None:
-                logger.warning("Video ses içermiyor!")
-                return False
-            
-            # Ses zaman aralığını ayarla (MoviePy 2.x uyumlu)
-            audio = video.audio
-            if start_time or end_time:
-                end_time = end_time or video.duration
-                duration = end_time - start_time
-                # Audio'yu doğru zaman aralığında kés
-                audio = audio.time_transform(lambda t: t + start_time).with_duration(duration)
-            
-            # Ses dosyasını kaydet
-            audio.write_audiofile(
-                audio_output,
-                logger=None
+            run_ffmpeg(
+                AudioExtractor._input_args(video_path, start_time, end_time, asr)
+                + codec_args
+                + ['-y', audio_output]
             )
             
-            video.close()
-            audio.close()
-            
             logger.info(f"Ses başarıyla çıkarıldı: {audio_output}")
             return True
         
+        except subprocess.CalledProcessError as e:
+            if AudioExtractor._has_no_audio(e):
+                logger.warning("Video ses içermiyor!")
+            else:
+                logger.error(f"Ses çıkarılırken hata: {e}")
+            return False
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"Ses çıkarılırken hata: {e}")
             return False
+    
+    @staticmethod
+    def extract_array(
+        video_path: str,
+        start_time: float = 0,
+        end_time: float = None
+    ) -> np.ndarray:
+        """
+        Video'dan sesi bellekte float32 dizi olarak çıkar (dosya yazılmaz)
+        
+        Konuşma tanıma girişi içindir: ses SAMPLE_RATE mono'ya dönüştürülür.
+        
+        Args:
+            video_path: Video dosyası
+            start_time: Başlangıç zamanı
+            end_time: Bitiş zamanı
+        
+        Returns:
+            SAMPLE_RATE hızında mono float32 dizi (hata/ses yoksa None)
+        """
+        try:
+            logger.info(f"Ses belleğe çıkarılıyor: {video_path}")
+            
+            result = run_ffmpeg(
+                AudioExtractor._input_args(video_path, start_time, end_time, asr=True)
+                + ['-f', 'f32le', '-c:a', 'pcm_f32le', 'pipe:1']
+            )
+            return np.frombuffer(result.stdout, dtype=np.float32)
+        
+        except subprocess.CalledProcessError as e:
+            if AudioExtractor._has_no_audio(e):
+                logger.warning("Video ses içermiyor!")
+            else:
+                logger.error(f"Ses çıkarılırken hata: {e}")
+            return None
+        except JobCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Ses çıkarılırken hata: {e}")
+            return None
@@ -0,0 +1,373 @@
+"""
+Audio Graph - Çok izli ses karıştırma motoru
+"""
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+import soundfile as sf
+from utils.logger import setup_logger
+from utils.config import TEMP_DIR, AUDIO_GRAPH_CACHE_MB
+from utils.job_context import JobCancelled, check_cancelled, report_progress
+from .audio_source import AudioSource
+from .normalizer import AudioNormalizer
+
+logger = setup_logger(__name__)
+
+class Track:
+    """
+    Zaman çizelgesindeki tek ses izi
+    
+    Süreler saniye cinsindendir. Zarf noktaları izin başlangıcına göredir;
+    noktalar arasında doğrusal geçiş yapılır, ilk noktadan önce ve son
+    noktadan sonra uç değerler kullanılır.
+    """
+    
+    FIELDS = (
+        "path", "offset", "gain", "envelope", "fade_in", "fade_out",
+        "mute", "source_start", "duration", "loop"
+    )
+    
+    def __init__(
+        self,
+        path: str,
+        offset: float = 0.0,
+        gain: float = 1.0,
+        envelope: list = None,
+        fade_in: float = 0.0,
+        fade_out: float = 0.0,
+        mute: bool = False,
+        source_start: float = 0.0,
+        duration: float = None,
+        loop: bool = False
+    ):
+        """
+        Args:
+            path: Ses veya video dosyası
+            offset: İzin zaman çizelgesindeki başlangıcı
+            gain: Sabit kazanç (doğrusal)
+            envelope: Kazanç zarfı [(zaman, kazanç), ...]
+            fade_in: Girişte sessizlikten tam seviyeye geçiş süresi
+            fade_out: Çıkışta sessizliğe geçiş süresi
+            mute: İzi karışıma katma
+            source_start: Dosyada okumaya başlanacak nokta
+            duration: İzin çizelgedeki süresi (None ise dosya sonuna kadar;
+                loop ile çizelge sonuna kadar)
+            loop: Dosya bitince başa sararak tekrarla
+        """
+        self.path = str(path)
+        self.offset = float(offset)
+        self.gain = float(gain)
+        self.envelope = sorted(envelope) if envelope else None
+        self.fade_in = float(fade_in)
+        self.fade_out = float(fade_out)
+        self.mute = bool(mute)
+        self.source_start = float(source_start)
+        self.duration = None if duration is None else float(duration)
+        self.loop = bool(loop)
+    
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class AudioGraph:
+    """
+    İzleri blok blok karıştıran graf
+    
+    Her blok (BLOCK_SIZE örnek) sadece ona denk gelen izlerin kaynaklarını
+    okuyarak vektörel olarak hesaplanır; decoder'lar ilk ihtiyaçta açılır
+    ve sıralı okumada arama yapılmaz. Hesaplanan bloklar LRU önbellekte
+    tutulur: bir iz değiştirildiğinde sadece izin eski ve yeni zaman
+    aralığına düşen bloklar yeniden hesaplanır.
+    
+    Örnek:
+        graph = AudioGraph()
+        voice = graph.add_track("ses.wav")
+        music = graph.add_track("muzik.mp3", gain=0.3, loop=True, fade_out=3.0)
+        graph.render("karisim.wav")
+        graph.update_track(music, gain=0.2)  # Sadece müziğin aralığı yeniden hesaplanır
+    """
+    
+    BLOCK_SIZE = 65536
+    
+    def __init__(
+        self,
+        sample_rate: int = None,
+        channels: int = None,
+        block_size: int = BLOCK_SIZE,
+        cache_limit_mb: float = AUDIO_GRAPH_CACHE_MB
+    ):
+        """
+        Args:
+            sample_rate: Çıkış örnekleme hızı (None ise ilk izin dosyasınınki)
+            channels: Çıkış kanal sayısı (None ise ilk izin dosyasınınki)
+            block_size: Blok başına örnek sayısı
+            cache_limit_mb: Blok önbelleğinin bellek sınırı
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block_size = int(block_size)
+        self.cache_limit = int(cache_limit_mb * 1024 * 1024)
+        
+        self._tracks = OrderedDict()
+        self._sources = {}
+        self._next_id = 0
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+    
+    # İz yönetimi
+    
+    @property
+    def tracks(self) -> dict:
+        """İz kimliği → Track (değiştirmek için update_track kullanılır)"""
+        return dict(self._tracks)
+    
+    def add_track(self, path: str, **options) -> int:
+        """
+        Yeni iz ekle
+        
+        Args:
+            path: Ses veya video dosyası
+            **options: Track parametreleri (offset, gain, envelope, ...)
+        
+        Returns:
+            İz kimliği
+        """
+        track = Track(path, **options)
+        if self.sample_rate is None or self.channels is None:
+            with AudioSource(track.path) as source:
+                self.sample_rate = self.sample_rate or source.sample_rate
+                self.channels = self.channels or source.channels
+        
+        track_id = self._next_id
+        self._next_id += 1
+        spans = self._spans()
+        self._tracks[track_id] = track
+        self._invalidate_changed(spans, track_id)
+        return track_id
+    
+    def update_track(self, track_id: int, **changes):
+        """
+        İzin parametrelerini değiştir (etkilenen bloklar yeniden hesaplanır)
+        
+        Raises:
+            KeyError: İz yoksa
+            ValueError: Bilinmeyen parametre verilirse
+        """
+        unknown = set(changes) - set(Track.FIELDS)
+        if unknown:
+            raise ValueError(f"Bilinmeyen iz parametresi: {', '.join(sorted(unknown))}")
+        
+        spans = self._spans()
+        self._tracks[track_id] = Track(**{**self._tracks[track_id].to_dict(), **changes})
+        if 'path' in changes:
+            self._close_source(track_id)
+        self._invalidate_changed(spans, track_id)
+    
+    def remove_track(self, track_id: int):
+        """İzi kaldır"""
+        spans = self._spans()
+        del self._tracks[track_id]
+        self._close_source(track_id)
+        self._invalidate_changed(spans, track_id)
+    
+    @property
+    def frames(self) -> int:
+        """Karışımın uzunluğu (örnek): sabit süreli izlerin en geç bitişi"""
+        ends = [self._span(track_id)[1] for track_id, track in self._tracks.items()
+                if not (track.loop and track.duration is None)]
+        return max(ends, default=0)
+    
+    @property
+    def duration(self) -> float:
+        """Karışımın süresi (saniye)"""
+        return self.frames / self.sample_rate if self.sample_rate else 0.0
+    
+    # Hesaplama
+    
+    def render_block(self, index: int) -> np.ndarray:
+        """
+        index'inci bloğu hesapla (önbellekte varsa oradan)
+        
+        Returns:
+            (kanal, block_size) float32 dizi (karışım sonrası sessizlikle dolu)
+        """
+        if index in self._cache:
+            self._cache.move_to_end(index)
+            return self._cache[index]
+        
+        start = index * self.block_size
+        end = start + self.block_size
+        block = np.zeros((self.channels, self.block_size), dtype=np.float32)
+        for track_id, track in self._tracks.items():
+            if track.mute:
+                continue
+            track_start, track_end = self._span(track_id)
+            first, last = max(start, track_start), min(end, track_end)
+            if first >= last:
+                continue
+            
+            samples = self._read_track(track_id, first - track_start, last - first)
+            gain = self._gain_curve(track, first - track_start, last - first, track_end - track_start)
+            block[:, first - start:last - start] += samples * gain
+        
+        block.flags.writeable = False
+        self._remember(index, block)
+        return block
+    
+    def render(self, output_path: str, subtype: str = None) -> bool:
+        """
+        Karışımı dosyaya yaz
+        
+        Bloklar önce ara dosyaya yazılır; tepe 1.0'ı aşıyorsa ikinci
+        geçişte 0.95'e indirilir.
+        
+        Args:
+            output_path: Çıkış ses dosyası
+            subtype: Çıkış formatı (None ise varsayılan)
+        """
+        tmp_path = None
+        try:
+            logger.info(f"Karışım oluşturuluyor ({len(self._tracks)} iz): {output_path}")
+            total = self.frames
+            if total == 0:
+                raise ValueError("Karıştırılacak iz yok")
+            
+            TEMP_DIR.mkdir(exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='graph_', suffix='.wav', dir=TEMP_DIR)
+            os.close(fd)
+            limiter = AudioNormalizer(target_peak=0.95, only_if_above=1.0)
+            with sf.SoundFile(tmp_path, 'w', samplerate=self.sample_rate,
+                              channels=self.channels, subtype='FLOAT') as tmp:
+                for index in range(-(-total // self.block_size)):
+                    check_cancelled()
+                    report_progress(index * self.block_size / total)
+                    block = self.render_block(index)[:, :total - index * self.block_size]
+                    limiter.update(block)
+                    tmp.write(block.T)
+            
+            with sf.SoundFile(output_path, 'w', samplerate=self.sample_rate,
+                              channels=self.channels, subtype=subtype) as out:
+                for block in sf.blocks(tmp_path, blocksize=self.block_size, dtype='float32', always_2d=True):
+                    out.write(limiter.apply(block))
+            
+            logger.info(f"Karışım başarıyla oluşturuldu: {output_path}")
+            return True
+        
+        except JobCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Karışım oluşturulurken hata: {e}")
+            return False
+        finally:
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+    
+    def close(self):
+        """Açık decoder'ları kapat ve önbelleği boşalt"""
+        for track_id in list(self._sources):
+            self._close_source(track_id)
+        self._cache.clear()
+        self._cache_bytes = 0
+    
+    # Yardımcılar
+    
+    def _span(self, track_id: int) -> tuple:
+        """İzin çizelgedeki [başlangıç, bitiş) aralığı (örnek)"""
+        track = self._tracks[track_id]
+        start = round(track.offset * self.sample_rate)
+        if track.duration is not None:
+            return start, start + round(track.duration * self.sample_rate)
+        if track.loop:
+            # Çizelge sonuna kadar (sabit süreli izlerin en geç bitişi)
+            return start, max(self.frames, start)
+        region = self._source(track_id).frames - round(track.source_start * self.sample_rate)
+        return start, start + max(region, 0)
+    
+    def _source(self, track_id: int) -> AudioSource:
+        """İzin decoder'ı (ilk ihtiyaçta açılır)"""
+        if track_id not in self._sources:
+            track = self._tracks[track_id]
+            self._sources[track_id] = AudioSource(track.path, self.sample_rate, self.channels)
+        return self._sources[track_id]
+    
+    def _close_source(self, track_id: int):
+        source = self._sources.pop(track_id, None)
+        if source is not None:
+            source.close()
+    
+    def _read_track(self, track_id: int, first: int, frames: int) -> np.ndarray:
+        """
+        İzin first'inci örneğinden itibaren frames örnek oku
+        (loop ise başa sararak, dosya bitmişse sessizlikle)
+        """
+        track = self._tracks[track_id]
+        source = self._source(track_id)
+        region_start = round(track.source_start * self.sample_rate)
+        region = max(source.frames - region_start, 0)
+        
+        out = np.zeros((self.channels, frames), dtype=np.float32)
+        filled = 0
+        while filled < frames:
+            position = first + filled
+            wanted = frames - filled
+            if track.loop and region:
+                position %= region
+                wanted = min(wanted, region - position)
+            if source.position != region_start + position:
+                source.seek(region_start + position)
+            data = source.read(wanted)
+            if data.shape[1] == 0:
+                break
+            out[:, filled:filled + data.shape[1]] = data
+            filled += data.shape[1]
+        return out
+    
+    def _gain_curve(self, track: Track, first: int, frames: int, length: int) -> np.ndarray:
+        """İzin first'inci örneğinden itibaren kazanç eğrisi (zarf, fade'ler)"""
+        positions = np.arange(first, first + frames, dtype=np.float64)
+        gain = np.full(frames, track.gain)
+        if track.envelope:
+            times, values = zip(*track.envelope)
+            gain *= np.interp(positions / self.sample_rate, times, values)
+        if track.fade_in > 0:
+            gain *= np.minimum(positions / (track.fade_in * self.sample_rate), 1.0)
+        if track.fade_out > 0:
+            gain *= np.minimum((length - positions) / (track.fade_out * self.sample_rate), 1.0)
+        return gain.astype(np.float32)
+    
+    def _invalidate(self, start: int, end: int):
+        """[start, end) örnek aralığına düşen blokları önbellekten at"""
+        first = start // self.block_size
+        last = -(-end // self.block_size)
+        for index in [index for index in self._cache if first <= index < last]:
+            self._cache_bytes -= self._cache.pop(index).nbytes
+    
+    def _spans(self) -> dict:
+        """Tüm izlerin aralıkları"""
+        return {track_id: self._span(track_id) for track_id in self._tracks}
+    
+    def _invalidate_changed(self, old_spans: dict, changed_id: int):
+        """
+        Değişen izin eski / yeni aralığını ve aralığı değişen diğer izlerin
+        (çizelge sonuna kadar süren loop izleri) aralıklarını geçersiz kıl
+        """
+        new_spans = self._spans()
+        for track_id in set(old_spans) | set(new_spans):
+            old, new = old_spans.get(track_id), new_spans.get(track_id)
+            if track_id != changed_id and old == new:
+                continue
+            for span in (old, new):
+                if span is not None:
+                    self._invalidate(*span)
+    
+    def _remember(self, index: int, block: np.ndarray):
+        """Bloğu LRU önbelleğe ekle"""
+        if block.nbytes > self.cache_limit:
+            return
+        self._cache[index] = block
+        self._cache_bytes += block.nbytes
+        while self._cache_bytes > self.cache_limit:
+            _, old = self._cache.popitem(last=False)
+            self._cache_bytes -= old.nbytes
@@ -1,67 +1,250 @@
 """
 Audio Mixer - Ses karıştırma ve ekleme
 """
+import os
+import subprocess
+import tempfile
 import numpy as np
-import librosa
 import soundfile as sf
 from pathlib import Path
+from scipy.signal import lfilter
 from utils.logger import setup_logger
-from utils.config import SAMPLE_RATE
+from utils.config import TEMP_DIR
+from utils.job_context import JobCancelled, check_cancelled, report_progress
+from .ffmpeg_utils import run_ffmpeg, probe_duration
+from .normalizer import AudioNormalizer
+from .audio_source import AudioSource
 
 logger = setup_logger(__name__)
 
+class SidechainDucker:
+    """
+    Ana sesin zarfına göre diğer girişleri kısma (sidechain ducking)
+    
+    Zarf, sidechain gücünün iki tek kutuplu filtreden geçirilmiş halinin
+    büyüğüdür: hızlı filtre konuşma başlayınca kısmayı attack süresinde
+    devreye alır, yavaş filtre konuşma bitince release süresinde bırakır.
+    Filtre durumu bloklar arasında taşınır. Zarf yavaş değiştiği için
+    kazanç GAIN_STEP örnekte bir hesaplanıp aradaki örneklere doğrusal
+    olarak dağıtılır.
+    """
+    
+    GAIN_STEP = 32
+    
+    def __init__(
+        self,
+        sample_rate: int,
+        amount_db: float = 12.0,
+        threshold_db: float = -35.0,
+        attack: float = 0.01,
+        release: float = 0.4,
+        knee_db: float = 6.0
+    ):
+        """
+        Args:
+            sample_rate: Örnekleme hızı
+            amount_db: Ana ses eşiğin üstündeyken uygulanan kısma (dB)
+            threshold_db: Kısmanın başladığı ana ses seviyesi (dBFS)
+            attack: Kısmanın devreye girme süresi (saniye)
+            release: Kısmanın bırakılma süresi (saniye)
+            knee_db: Eşik çevresindeki yumuşak geçiş genişliği (dB)
+        """
+        self.amount_db = amount_db
+        self.threshold_db = threshold_db
+        self.knee_db = knee_db
+        self._coefficients = [np.exp(-1.0 / (max(t, 1e-4) * sample_rate)) for t in (attack, release)]
+        self._states = [np.zeros(1) for _ in self._coefficients]
+    
+    def gain(self, sidechain: np.ndarray) -> np.ndarray:
+        """
+        Sidechain bloğu için örnek başına kazanç
+        
+        Args:
+            sidechain: (kanal, örnek) ana ses bloğu
+        
+        Returns:
+            (örnek,) kazanç dizisi (0-1)
+        """
+        length = sidechain.shape[-1]
+        if length == 0:
+            return np.ones(0, dtype=np.float32)
+        
+        power = np.mean(np.square(sidechain), axis=0)
+        envelope = np.zeros(length)
+        for i, a in enumerate(self._coefficients):
+            smoothed, self._states[i] = lfilter([1 - a], [1, -a], power, zi=self._states[i])
+            np.maximum(envelope, smoothed, out=envelope)
+        
+        points = np.append(np.arange(0, length - 1, self.GAIN_STEP), length - 1)
+        level_db = 10 * np.log10(envelope[points] + 1e-12)
+        depth = np.clip((level_db - self.threshold_db) / self.knee_db + 0.5, 0, 1)
+        gain = 10 ** (-self.amount_db * depth / 20)
+        return np.interp(np.arange(length), points, gain).astype(np.float32)
+
+
 class AudioMixer:
     """Ses dosyalarını karıştırma"""
     
+    # Karıştırmada bir seferde işlenen örnek sayısı
+    BLOCK_SIZE = 65536
+    
     @staticmethod
     def mix_audios(
         primary_audio: str,
         background_audio: str,
         output_audio: str,
-        background_volume: float = 0.3
+        background_volume: float = 0.3,
+        loop_background: bool = True,
+        duck: bool = False
     ) -> bool:
         """
         Ana ses + arka plan sesi karıştır
         
+        Çıkış ana sesin uzunluğunda, örnekleme hızında ve kanal
+        düzenindedir. Kısa arka plan başa sarılarak tekrarlanır (veya
+        sessizlikle tamamlanır); karıştırma sabit bellekle yapılır.
+        
         Args:
             primary_audio: Ana ses dosyası
             background_audio: Arka plan ses dosyası
             output_audio: Çıkış dosyası
             background_volume: Arka plan sesinin seviyesi (0-1)
+            loop_background: Arka plan kısaysa başa sararak tekrarla
+            duck: Ana ses konuşurken arka planı kıs
         """
+        return AudioMixer.mix_tracks(
+            [
+                {'path': primary_audio},
+                {'path': background_audio, 'volume': background_volume,
+                 'loop': loop_background, 'duck': duck},
+            ],
+            output_audio
+        )
+    
+    @staticmethod
+    def mix_tracks(
+        inputs: list,
+        output_audio: str,
+        duration: float = None,
+        normalize_inputs: bool = True,
+        ducker_options: dict = None,
+        block_size: int = BLOCK_SIZE
+    ) -> bool:
+        """
+        N ses girişini blok blok karıştır (sabit bellek)
+        
+        İlk giriş ana sestir: çıkışın örnekleme hızını, kanal düzenini ve
+        (duration verilmemişse) uzunluğunu belirler, ducking için
+        sidechain olarak kullanılır. Diğer girişler bu hıza ve kanal
+        sayısına akış halinde dönüştürülür. Çıkış önce ara dosyaya yazılır,
+        tepe 1.0'ı aşıyorsa ikinci geçişte 0.95'e indirilir.
+        
+        Args:
+            inputs: Giriş listesi; her biri {'path', 'volume' (1.0),
+                'loop' (False), 'duck' (False)}
+            output_audio: Çıkış dosyası
+            duration: Çıkış süresi (saniye, None ise ana ses süresi)
+            normalize_inputs: Girişlerin tepe değerini önce 1.0'a getir
+            ducker_options: SidechainDucker parametreleri (amount_db,
+                threshold_db, attack, release, knee_db)
+            block_size: Blok başına örnek sayısı
+        """
+        sources = []
+        tmp_path = None
         try:
-            logger.info(f"Sesler karıştırılıyor...")
+            logger.info(f"Sesler karıştırılıyor ({len(inputs)} giriş)...")
+            if not inputs:
+                raise ValueError("Karıştırılacak giriş yok")
             
-            # Sesler yükle
-            y1, sr1 = librosa.load(primary_audio, sr=SAMPLE_RATE)
-            y2, sr2 = librosa.load(background_audio, sr=SAMPLE_RATE)
+            primary = AudioSource(inputs[0]['path'])
+            sources.append(primary)
+            sr, channels = primary.sample_rate, primary.channels
+            for spec in inputs[1:]:
+                sources.append(AudioSource(spec['path'], sr, channels))
             
-            # Uzunluk eşitle
-            min_length = min(len(y1), len(y2))
-            y1 = y1[:min_length]
-            y2 = y2[:min_length]
+            gains = [float(spec.get('volume', 1.0)) for spec in inputs]
+            if normalize_inputs:
+                for i, source in enumerate(sources):
+                    peak = AudioMixer._scan_peak(source, block_size)
+                    if peak > 0:
+                        gains[i] /= peak
             
-            # Ses seviyeleri normalize et
-            y1 = y1 / np.max(np.abs(y1)) if np.max(np.abs(y1)) > 0 else y1
-            y2 = y2 / np.max(np.abs(y2)) if np.max(np.abs(y2)) > 0 else y2
+            total = round(duration * sr) if duration is not None else primary.frames
+            ducker = None
+            if any(spec.get('duck') for spec in inputs[1:]):
+                ducker = SidechainDucker(sr, **(ducker_options or {}))
             
-            # Karıştır
-            mixed = y1 + (background_volume * y2)
+            # 1. geçiş: karıştır, ara dosyaya yaz, tepe değerini kaydet
+            TEMP_DIR.mkdir(exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='mix_', suffix='.wav', dir=TEMP_DIR)
+            os.close(fd)
+            limiter = AudioNormalizer(target_peak=0.95, only_if_above=1.0)
+            with sf.SoundFile(tmp_path, 'w', samplerate=sr, channels=channels, subtype='FLOAT') as tmp:
+                for start in range(0, total, block_size):
+                    check_cancelled()
+                    report_progress(start / total)
+                    frames = min(block_size, total - start)
+                    main = AudioMixer._read_block(primary, frames, inputs[0].get('loop', False)) * gains[0]
+                    duck_gain = ducker.gain(main) if ducker is not None else None
+                    
+                    mixed = main.copy()
+                    for spec, source, gain in zip(inputs[1:], sources[1:], gains[1:]):
+                        block = AudioMixer._read_block(source, frames, spec.get('loop', False)) * gain
+                        if duck_gain is not None and spec.get('duck'):
+                            block *= duck_gain
+                        mixed += block
+                    
+                    limiter.update(mixed)
+                    tmp.write(mixed.T)
             
-            # Normalizetle (clipping'i önle)
-            max_val = np.max(np.abs(mixed))
-            if max_val > 1.0:
-                mixed = mixed / max_val * 0.95
-            
-            # Kaydet
-            sf.write(output_audio, mixed, SAMPLE_RATE)
+            # 2. geçiş: clipping'i önleyen kazancı uygulayarak çıkışa yaz
+            with sf.SoundFile(output_audio, 'w', samplerate=sr, channels=channels) as out:
+                for block in sf.blocks(tmp_path, blocksize=block_size, dtype='float32', always_2d=True):
+                    out.write(limiter.apply(block))
             
             logger.info(f"Sesler başarıyla karıştırıldı: {output_audio}")
             return True
         
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"Sesler karıştırılırken hata: {e}")
             return False
+        finally:
+            for source in sources:
+                source.close()
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+    
+    @staticmethod
+    def _scan_peak(source: AudioSource, block_size: int) -> float:
+        """Kaynağın tepe değerini bul ve başa sar"""
+        peak = 0.0
+        while True:
+            block = source.read(block_size)
+            if block.shape[1] == 0:
+                break
+            peak = max(peak, float(np.max(np.abs(block))))
+        source.seek(0)
+        return peak
+    
+    @staticmethod
+    def _read_block(source: AudioSource, frames: int, loop: bool) -> np.ndarray:
+        """
+        Kaynaktan tam frames örnek oku; bitmişse başa sar (loop) veya
+        sessizlikle tamamla
+        """
+        block = np.zeros((source.channels, frames), dtype=np.float32)
+        filled = 0
+        while filled < frames:
+            data = source.read(frames - filled)
+            block[:, filled:filled + data.shape[1]] = data
+            filled += data.shape[1]
+            if filled < frames:
+                if not loop or source.position == 0:
+                    break  # Boş kaynak sonsuz döngüye girmesin
+                source.seek(0)
+        return block
     
     @staticmethod
     def replace_audio(
@@ -73,30 +256,36 @@ class AudioMixer:
         Videodaki sesi yeni ses dosyası ile değiştir
         """
         try:
-            from moviepy import VideoFileClip, AudioFileClip
-            
-            logger.info(f"Video sesi değiştiriliyors...")
-            
-            video = VideoFileClip(video_path)
-            audio = AudioFileClip(audio_path)
+            logger.info(f"Video sesi değiştiriliyor...")
             
-            # Audio'nun videoya tam sığması için süresi ayarla (MoviePy 2.x uyumlu)
-            if audio.duration > video.duration:
-                audio = audio.with_duration(video.duration)
+            # Video akışı olduğu gibi kopyalanır, sadece yeni ses kodlanır.
+            # Uzun ses video süresine kırpılır, kısa ses sessizlikle tamamlanır.
+            video_duration = probe_duration(video_path)
+            duration_args = ['-t', video_duration] if video_duration > 0 else ['-shortest']
             
-            final_video = video.set_audio(audio)
-            final_video.write_videofile(
-                output_video,
-                logger=None
-            )
+            def remux(video_codec: str):
+                run_ffmpeg([
+                    '-i', video_path,
+                    '-i', audio_path,
+                    '-map', '0:v:0', '-map', '1:a:0',
+                    '-c:v', video_codec,
+                    '-af', 'apad', '-c:a', 'aac',
+                    *duration_args,
+                    '-y', output_video
+                ])
             
-            video.close()
-            audio.close()
-            final_video.close()
+            try:
+                remux('copy')
+            except subprocess.CalledProcessError as e:
+                # Kaynak codec çıkış container'ına kopyalanamıyorsa yeniden kodla
+                logger.warning(f"Video kopyalanamadı, yeniden kodlanıyor: {e}")
+                remux('libx264')
             
             logger.info(f"Video ses değiştirildi: {output_video}")
             return True
         
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"Video sesi değiştirilirken hata: {e}")
             return False
@@ -0,0 +1,178 @@
+"""
+Audio Source - Ses dosyalarını blok blok okuyan decoder
+"""
+import math
+import numpy as np
+import soundfile as sf
+import soxr
+from utils.logger import setup_logger
+from .ffmpeg_utils import popen_ffmpeg, probe_audio_stream, probe_duration
+
+logger = setup_logger(__name__)
+
+class AudioSource:
+    """
+    Ses dosyasını istenen örnekleme hızı ve kanal sayısında blok blok oku
+    
+    soundfile'ın açabildiği dosyalar doğrudan okunur, hız farkı varsa
+    soxr ile akış halinde dönüştürülür. Diğer formatlar (m4a, video
+    dosyaları vb.) ffmpeg borusundan çözülür. Bellek kullanımı dosya
+    uzunluğundan bağımsızdır.
+    
+    Örnek:
+        with AudioSource("muzik.mp3", sample_rate=48000, channels=2) as source:
+            block = source.read(65536)  # (kanal, örnek) float32
+    """
+    
+    # Tek seferde çözülen en az örnek sayısı
+    MIN_DECODE_FRAMES = 4096
+    
+    # Hız dönüştürülürken arama noktasından önce çözülen pay (kaynak örneği);
+    # filtrenin geçmişi dolsun diye, çıkışı atılır
+    RESAMPLE_PREROLL = 512
+    
+    def __init__(self, path: str, sample_rate: int = None, channels: int = None):
+        """
+        Args:
+            path: Ses veya video dosyası
+            sample_rate: Çıkış örnekleme hızı (None ise dosyanınki)
+            channels: Çıkış kanal sayısı (None ise dosyanınki)
+        
+        Raises:
+            ValueError: Dosyada ses akışı yoksa
+        """
+        self.path = str(path)
+        self._file = None
+        self._process = None
+        self._resampler = None
+        
+        try:
+            self._file = sf.SoundFile(self.path)
+            self.native_rate = self._file.samplerate
+            self.native_channels = self._file.channels
+            native_frames = self._file.frames
+        except RuntimeError:
+            stream = probe_audio_stream(self.path)
+            if not stream:
+                raise ValueError(f"Ses akışı bulunamadı: {self.path}")
+            self.native_rate = int(stream['sample_rate'])
+            self.native_channels = int(stream['channels'])
+            native_frames = None
+        
+        self.sample_rate = int(sample_rate or self.native_rate)
+        self.channels = int(channels or self.native_channels)
+        if native_frames is not None:
+            self.frames = math.ceil(native_frames * self.sample_rate / self.native_rate)
+        else:
+            self.frames = round(probe_duration(self.path) * self.sample_rate)
+        
+        self.seek(0)
+    
+    @property
+    def duration(self) -> float:
+        """Süre (saniye)"""
+        return self.frames / self.sample_rate
+    
+    def seek(self, frame: int):
+        """Çıkış hızında verilen örneğe git"""
+        frame = max(int(frame), 0)
+        self.position = frame
+        self._pending = np.zeros((self.channels, 0), dtype=np.float32)
+        self._eof = False
+        
+        if self._file is not None:
+            self._resampler = None
+            if self.native_rate == self.sample_rate:
+                self._file.seek(min(frame, self._file.frames))
+                return
+            
+            # Başlangıç, çıkışta tam örneğe denk gelen bir kaynak örneği olmalı
+            # (hızların ortak böleninin katı); aradaki çıkış atlanır
+            divisor = math.gcd(self.native_rate, self.sample_rate)
+            step = self.native_rate // divisor
+            native = frame * self.native_rate / self.sample_rate - (self.RESAMPLE_PREROLL if frame else 0)
+            native = min(max(math.floor(native / step) * step, 0), self._file.frames)
+            self._file.seek(native)
+            self._resampler = soxr.ResampleStream(
+                self.native_rate, self.sample_rate, self.channels, dtype='float32', quality='HQ'
+            )
+            skip = frame - native // step * (self.sample_rate // divisor)
+            while skip > 0 and not self._eof:
+                skipped = self._decode(max(skip, self.MIN_DECODE_FRAMES))
+                self._pending = skipped[:, skip:]
+                skip -= skipped.shape[1]
+        else:
+            self._stop_process()
+            args = ['-ss', frame / self.sample_rate] if frame else []
+            self._process = popen_ffmpeg(args + [
+                '-i', self.path, '-map', '0:a:0', '-vn',
+                '-ac', self.channels, '-ar', self.sample_rate,
+                '-f', 'f32le', '-c:a', 'pcm_f32le', 'pipe:1'
+            ])
+    
+    def read(self, frames: int) -> np.ndarray:
+        """
+        Sıradaki örnekleri oku
+        
+        Returns:
+            (kanal, örnek) float32 dizi; dosya sonunda daha kısa (veya boş)
+        """
+        chunks = [self._pending]
+        available = self._pending.shape[1]
+        while available < frames and not self._eof:
+            block = self._decode(max(frames - available, self.MIN_DECODE_FRAMES))
+            chunks.append(block)
+            available += block.shape[1]
+        
+        data = np.concatenate(chunks, axis=1) if len(chunks) > 1 else self._pending
+        self._pending = data[:, frames:]
+        out = data[:, :frames]
+        self.position += out.shape[1]
+        return out
+    
+    def _decode(self, frames: int) -> np.ndarray:
+        """Kaynaktan yaklaşık frames örnek çöz ((kanal, örnek), hedef hızda)"""
+        if self._file is None:
+            frame_bytes = 4 * self.channels
+            data = self._process.stdout.read(frames * frame_bytes)
+            if len(data) < frames * frame_bytes:
+                self._eof = True
+                self._stop_process()
+            data = data[:len(data) - len(data) % frame_bytes]
+            return np.frombuffer(data, dtype=np.float32).reshape(-1, self.channels).T
+        
+        native = max(math.ceil(frames * self.native_rate / self.sample_rate), 1)
+        block = self._file.read(native, dtype='float32', always_2d=True)
+        self._eof = len(block) < native
+        block = self._map_channels(block, self.channels)
+        if self._resampler is not None:
+            block = self._resampler.resample_chunk(block, last=self._eof)
+        return np.ascontiguousarray(block.T)
+    
+    @staticmethod
+    def _map_channels(block: np.ndarray, channels: int) -> np.ndarray:
+        """(örnek, kanal) bloğu istenen kanal sayısına çevir"""
+        if block.shape[1] == channels:
+            return block
+        if block.shape[1] > 1:
+            block = block.mean(axis=1, keepdims=True)
+        return np.repeat(block, channels, axis=1) if channels > 1 else block
+    
+    def _stop_process(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.stdout.close()
+            self._process.wait()
+            self._process = None
+    
+    def close(self):
+        """Dosyayı / ffmpeg sürecini kapat"""
+        self._stop_process()
+        if self._file is not None:
+            self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
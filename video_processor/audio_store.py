@@ -0,0 +1,183 @@
+"""
+Audio Store - Süreç genelinde paylaşılan çözülmüş ses deposu
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+import numpy as np
+import librosa
+import soundfile as sf
+from utils.logger import setup_logger
+from utils.config import AUDIO_STORE_DIR, AUDIO_STORE_DISK_MB
+from .audio_source import AudioSource
+from .ffmpeg_utils import probe_audio_stream
+
+logger = setup_logger(__name__)
+
+class DecodedAudioStore:
+    """
+    Çözülmüş sesi float32 .npy dosyaları olarak saklayıp bellek eşlemeli açar
+    
+    Anahtar: dosya yolu + değiştirilme zamanı + boyut + hedef örnekleme hızı
+    + mono/çok kanal. Aynı ses ikinci kez istendiğinde çözme ve hız
+    dönüştürme yapılmaz; dizi diskten bellek eşlemeli (mmap) açılır, sadece
+    okunan kısımlar belleğe gelir. Disk sınırı aşılınca en eski kullanılan
+    dosyalar silinir.
+    
+    Örnek:
+        y, sr = get_audio_store().load("ses.wav", sr=16000, mono=True)
+    """
+    
+    # Aynı süreçte açık tutulan en fazla eşleme sayısı
+    MAX_OPEN = 32
+    
+    def __init__(self, store_dir: str = AUDIO_STORE_DIR, disk_limit_mb: float = AUDIO_STORE_DISK_MB):
+        self.store_dir = Path(store_dir)
+        self.disk_limit = int(disk_limit_mb * 1024 * 1024)
+        self._open = {}
+        self._lock = threading.RLock()
+        # Anahtar başına kilit: aynı ses bir kez çözülür, farklı sesler
+        # birbirini beklemez (genel kilit sadece sözlükler için tutulur)
+        self._key_locks = {}
+    
+    def load(self, path: str, sr: int = None, mono: bool = False) -> tuple:
+        """
+        Sesi depodan (yoksa çözüp depoya yazarak) yükle
+        
+        Args:
+            path: Ses veya video dosyası
+            sr: Hedef örnekleme hızı (None ise dosyanınki)
+            mono: Kanalları ortalayarak tek kanala indir
+        
+        Returns:
+            (dizi, örnekleme hızı); dizi mono ise (örnek,), değilse
+            (kanal, örnek) şeklinde salt okunur float32
+        """
+        sr = int(sr or self.native_rate(path))
+        key = self.make_key(path, sr, mono)
+        with self._lock:
+            if key in self._open:
+                return self._open[key], sr
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            with self._lock:
+                if key in self._open:  # Beklerken başka iş parçacığı yükledi
+                    return self._open[key], sr
+            
+            store_path = self.store_dir / f"{key}.npy"
+            try:
+                y = np.load(store_path, mmap_mode='r')
+                os.utime(store_path)  # LRU sırası için erişim zamanı
+                logger.debug(f"Ses depodan okundu: {Path(path).name} ({sr} Hz)")
+            except FileNotFoundError:
+                y = self._store(store_path, self._decode(path, sr, mono))
+            except Exception as e:
+                logger.warning(f"Bozuk depo kaydı siliniyor: {store_path.name} ({e})")
+                store_path.unlink(missing_ok=True)
+                y = self._store(store_path, self._decode(path, sr, mono))
+            
+            with self._lock:
+                if len(self._open) >= self.MAX_OPEN:
+                    self._open.pop(next(iter(self._open)))
+                self._open[key] = y
+                self._key_locks.pop(key, None)
+            return y, sr
+    
+    @staticmethod
+    def make_key(path: str, sr: int, mono: bool) -> str:
+        """Yol, değiştirilme zamanı, boyut ve hedef biçimden anahtar üret"""
+        stat = os.stat(path)
+        parts = [str(Path(path).resolve()), str(stat.st_mtime_ns), str(stat.st_size), str(sr), str(bool(mono))]
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def native_rate(path: str) -> int:
+        """Dosyanın kendi örnekleme hızı (çözmeden)"""
+        try:
+            return sf.info(path).samplerate
+        except RuntimeError:
+            stream = probe_audio_stream(path)
+            if not stream:
+                raise ValueError(f"Ses akışı bulunamadı: {path}")
+            return int(stream['sample_rate'])
+    
+    @staticmethod
+    def _decode(path: str, sr: int, mono: bool) -> np.ndarray:
+        """Dosyayı tamamen çöz (soundfile açamıyorsa ffmpeg ile)"""
+        logger.info(f"Ses çözülüyor: {Path(path).name} ({sr} Hz{', mono' if mono else ''})")
+        try:
+            sf.info(path)
+        except RuntimeError:
+            with AudioSource(path, sr, 1 if mono else None) as source:
+                blocks = []
+                while True:
+                    block = source.read(1 << 20)
+                    if block.shape[1] == 0:
+                        break
+                    blocks.append(block)
+            y = np.concatenate(blocks, axis=1) if blocks else np.zeros((source.channels, 0), dtype=np.float32)
+            return y[0] if mono else y
+        
+        y, _ = librosa.load(path, sr=sr, mono=mono)
+        return y.astype(np.float32) if mono else np.atleast_2d(y).astype(np.float32)
+    
+    def _store(self, store_path: Path, y: np.ndarray) -> np.ndarray:
+        """Diziyi depoya yaz ve bellek eşlemeli aç (yazılamazsa bellekte döndür)"""
+        try:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.store_dir)
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, y)
+            os.replace(tmp_path, store_path)
+            with self._lock:
+                self._evict()
+            return np.load(store_path, mmap_mode='r')
+        except Exception as e:
+            logger.warning(f"Ses depoya yazılamadı: {e}")
+            y.flags.writeable = False
+            return y
+    
+    def _evict(self):
+        """Disk sınırı aşıldıysa en eski kullanılan kayıtları sil"""
+        entries = []
+        for path in self.store_dir.glob("*.npy"):
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except FileNotFoundError:
+                continue
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_limit:
+                break
+            self._open.pop(path.stem, None)
+            try:
+                path.unlink()
+            except OSError:
+                continue  # Başka süreçte açık (Windows)
+            total -= size
+            logger.debug(f"Depodan silindi: {path.name}")
+    
+    def clear(self):
+        """Depoyu boşalt"""
+        with self._lock:
+            self._open.clear()
+            for path in self.store_dir.glob("*.npy"):
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+
+
+_default_store = None
+
+def get_audio_store() -> DecodedAudioStore:
+    """Uygulama genelinde paylaşılan ses deposu"""
+    global _default_store
+    if _default_store is None:
+        _default_store = DecodedAudioStore()
+    return _default_store
@@ -0,0 +1,167 @@
+"""
+Denoisers - STFT frame'leri üzerinde çalışan gürültü azaltma yöntemleri
+
+Her yöntem (frame, frekans) veya (kanal, frame, frekans) şeklinde kompleks
+STFT frame'lerini alıp aynı şekilde temizlenmiş frame'ler döndürür; kanallar
+vektörel olarak birlikte işlenir. Durum tutan yöntemler (decision-
+directed) frame'leri sırayla işler; bu sayede batch ve streaming modda
+aynı sonucu verir.
+"""
+from abc import ABC, abstractmethod
+import numpy as np
+from scipy.special import i0e, i1e
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class Denoiser(ABC):
+    """
+    Gürültü azaltma yöntemi arayüzü
+    
+    Alt sınıflar process() metodunu uygular (uygulamayan sınıf
+    oluşturulurken TypeError verir). Nesne doğrudan
+    StreamingSTFTProcessor'a frame_fn olarak verilebilir.
+    """
+    
+    name = ""
+    label = ""
+    
+    # Paralel modda parça başında durumun oturması için işlenen ek frame sayısı
+    WARMUP_FRAMES = 0
+    
+    def __init__(self, noise_spectrum: np.ndarray, reduction_strength: float = 0.8):
+        """
+        Args:
+            noise_spectrum: Frekans başına gürültü genliği (NoiseProfile.spectrum)
+            reduction_strength: Gürültü azaltma gücü (0-1)
+        """
+        self.noise_spectrum = np.asarray(noise_spectrum, dtype=np.float32).reshape(-1)
+        self.reduction_strength = float(reduction_strength)
+        self.reset()
+    
+    def reset(self):
+        """Frame'ler arası durumu sıfırla"""
+    
+    @abstractmethod
+    def process(self, frames: np.ndarray) -> np.ndarray:
+        """(..., frame, frekans) kompleks STFT frame'lerini temizle"""
+    
+    def __call__(self, frames: np.ndarray) -> np.ndarray:
+        return self.process(frames)
+
+
+class SpectralSubtraction(Denoiser):
+    """Genlik çıkarma (sabit minimum seviye 0.01; önceki davranış)"""
+    
+    name = "spectral_subtraction"
+    label = "Spectral Subtraction"
+    
+    def process(self, frames: np.ndarray) -> np.ndarray:
+        magnitude = np.abs(frames)
+        reduced = np.maximum(magnitude - (self.reduction_strength * self.noise_spectrum), 0.01)  # Minimum seviye
+        return reduced * np.exp(1j * np.angle(frames))
+
+
+class DecisionDirectedDenoiser(Denoiser):
+    """
+    Decision-directed a priori SNR tahmini (Ephraim-Malah) ile kazanç
+    
+    ξ_t = α · G²_{t-1} γ_{t-1} + (1 - α) · max(γ_t - 1, 0)
+    
+    γ: a posteriori SNR (|Y|² / λ_d), ξ: a priori SNR. Kazanç alt sınırı
+    mutlak değil, giriş genliğine göre görelidir; bu sayede çıkarmadaki
+    "musical noise" oluşmaz. reduction_strength kazanç tabanını belirler
+    (1.0 → MAX_ATTENUATION_DB zayıflatma).
+    """
+    
+    SMOOTHING = 0.98
+    MIN_PRIORI_SNR_DB = -25.0
+    MAX_ATTENUATION_DB = 30.0
+    WARMUP_FRAMES = 64
+    
+    def reset(self):
+        # Medyan genlikten ortalama güce (Rayleigh): E|N|² = medyan² / ln 2
+        self.noise_power = np.maximum(self.noise_spectrum.astype(np.float64) ** 2 / np.log(2), 1e-12)
+        self.gain_floor = 10 ** (-self.MAX_ATTENUATION_DB * self.reduction_strength / 20)
+        self.min_priori = 10 ** (self.MIN_PRIORI_SNR_DB / 10)
+        self._previous = None  # G²γ (önceki frame'in temiz genlik / gürültü oranı)
+    
+    @abstractmethod
+    def gain(self, priori: np.ndarray, posteriori: np.ndarray) -> np.ndarray:
+        """Frame kazancı (alt sınıflar uygular)"""
+    
+    def process(self, frames: np.ndarray) -> np.ndarray:
+        if frames.shape[-2] == 0:
+            return frames
+        
+        posteriori = np.maximum(np.abs(frames) ** 2 / self.noise_power, 1e-10)
+        ml_priori = (1 - self.SMOOTHING) * np.maximum(posteriori - 1, 0)
+        gains = np.empty(posteriori.shape, dtype=np.float64)
+        
+        previous = self._previous
+        for t in range(frames.shape[-2]):
+            current = posteriori[..., t, :]
+            if previous is None:
+                priori = np.maximum(current - 1, self.min_priori)
+            else:
+                priori = np.maximum(self.SMOOTHING * previous + ml_priori[..., t, :], self.min_priori)
+            gain = np.maximum(self.gain(priori, current), self.gain_floor)
+            previous = gain ** 2 * current
+            gains[..., t, :] = gain
+        
+        self._previous = previous
+        return frames * gains
+
+
+class WienerDenoiser(DecisionDirectedDenoiser):
+    """Wiener kazancı: G = ξ / (1 + ξ)"""
+    
+    name = "wiener"
+    label = "Wiener (Decision-Directed)"
+    
+    def gain(self, priori: np.ndarray, posteriori: np.ndarray) -> np.ndarray:
+        return priori / (1 + priori)
+
+
+class MMSESTSADenoiser(DecisionDirectedDenoiser):
+    """
+    MMSE-STSA kazancı (Ephraim-Malah 1984)
+    
+    v = ξγ / (1 + ξ)
+    G = (√π / 2) · (√v / γ) · e^(-v/2) · [(1 + v) I0(v/2) + v I1(v/2)]
+    
+    Taşmayı önlemek için üstel ölçekli Bessel fonksiyonları (i0e, i1e)
+    kullanılır.
+    """
+    
+    name = "mmse_stsa"
+    label = "MMSE-STSA"
+    
+    def gain(self, priori: np.ndarray, posteriori: np.ndarray) -> np.ndarray:
+        v = priori * posteriori / (1 + priori)
+        half = v / 2
+        return (np.sqrt(np.pi) / 2) * (np.sqrt(v) / posteriori) * ((1 + v) * i0e(half) + v * i1e(half))
+
+
+DENOISERS = {
+    denoiser.name: denoiser
+    for denoiser in (SpectralSubtraction, WienerDenoiser, MMSESTSADenoiser)
+}
+
+
+def register_denoiser(denoiser_class):
+    """Yeni yöntemi adıyla kaydet (UI ve reduce_noise'da seçilebilir olur)"""
+    DENOISERS[denoiser_class.name] = denoiser_class
+    return denoiser_class
+
+
+def create_denoiser(name: str, noise_spectrum: np.ndarray, reduction_strength: float = 0.8) -> Denoiser:
+    """
+    Adı verilen yöntemi oluştur
+    
+    Raises:
+        ValueError: Yöntem bilinmiyorsa
+    """
+    if name not in DENOISERS:
+        raise ValueError(f"Bilinmeyen gürültü azaltma yöntemi: {name}")
+    return DENOISERS[name](noise_spectrum, reduction_strength)
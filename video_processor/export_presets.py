@@ -0,0 +1,145 @@
+"""
+Export Presets - Dışa aktarma kalite ayarları
+"""
+from pathlib import Path
+import yaml
+from utils.logger import setup_logger
+from utils.config import EXPORT_PRESETS_FILE
+
+logger = setup_logger(__name__)
+
+# Varsayılan kalite ayarları
+# height: Hedef yükseklik (kaynak daha küçükse büyütülmez)
+# bitrate / crf: Biri kullanılır, crf verilmişse önceliklidir
+# preset / tune: x264/x265 hız-kalite ayarı
+# threads: ffmpeg thread sayısı (0 = otomatik)
+DEFAULT_PRESETS = {
+    'standard': {
+        'height': 480,
+        'fps': 24,
+        'bitrate': '1500k',
+        'crf': None,
+        'preset': 'veryfast',
+        'tune': None,
+        'threads': 0
+    },
+    'hd': {
+        'height': 720,
+        'fps': 30,
+        'bitrate': '3000k',
+        'crf': None,
+        'preset': 'fast',
+        'tune': None,
+        'threads': 0
+    },
+    'fhd': {
+        'height': 1080,
+        'fps': 30,
+        'bitrate': '5000k',
+        'crf': None,
+        'preset': 'medium',
+        'tune': None,
+        'threads': 0
+    }
+}
+
+# x264 tarzı preset/tune/crf destekleyen encoder'lar
+X264_STYLE_ENCODERS = ('libx264', 'libx265')
+
+# Dosya yolu -> ((mtime, boyut), birleştirilmiş preset'ler)
+_presets_cache = {}
+
+
+def load_presets(presets_file: str = EXPORT_PRESETS_FILE) -> dict:
+    """
+    Varsayılan ayarları kullanıcı YAML dosyasıyla birleştir
+
+    YAML'daki her anahtar bir preset adıdır; mevcut bir preset'in
+    sadece bazı alanları verilirse diğerleri varsayılandan gelir. Sonuç
+    dosyanın değiştirilme zamanı ve boyutuna göre önbellekte tutulur;
+    dosya değişince yeniden okunur.
+
+    Args:
+        presets_file: Kullanıcı preset dosyası (.yaml)
+    """
+    path = Path(presets_file)
+    try:
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        stamp = None  # Dosya yok: sadece varsayılanlar
+
+    cached = _presets_cache.get(str(path))
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, _read_presets(path) if stamp else _merge_presets({}))
+        _presets_cache[str(path)] = cached
+
+    # Çağıran değiştirebilir: önbellekteki sözlükler paylaşılmaz
+    return {name: dict(values) for name, values in cached[1].items()}
+
+
+def _merge_presets(user_presets: dict) -> dict:
+    """Kullanıcı preset'lerini varsayılanların üzerine uygula"""
+    presets = {name: dict(values) for name, values in DEFAULT_PRESETS.items()}
+    for name, values in user_presets.items():
+        if not isinstance(values, dict):
+            logger.warning(f"Geçersiz preset atlandı: {name}")
+            continue
+        base = presets.get(name, DEFAULT_PRESETS['hd'])
+        presets[name] = {**base, **values}
+    return presets
+
+
+def _read_presets(path: Path) -> dict:
+    """YAML dosyasını oku ve varsayılanlarla birleştir (okunamazsa varsayılanlar)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            user_presets = yaml.safe_load(f) or {}
+        presets = _merge_presets(user_presets)
+        logger.info(f"Kullanıcı preset'leri yüklendi: {path}")
+        return presets
+    except Exception as e:
+        logger.error(f"Preset dosyası okunamadı: {e}")
+        return _merge_presets({})
+
+
+def get_preset(quality: str) -> dict:
+    """Adı verilen preset'i döndür (bilinmiyorsa 'standard')"""
+    presets = load_presets()
+    if quality not in presets:
+        logger.warning(f"Bilinmeyen kalite '{quality}', 'standard' kullanılıyor")
+    return presets.get(quality, presets['standard'])
+
+
+def scale_filter(preset: dict) -> str:
+    """Kaynaktan büyükse hedef yüksekliğe küçülten scale filtresi"""
+    height = preset.get('height')
+    if not height:
+        return None
+    return f"scale=-2:'min(ih,{int(height)})'"
+
+
+def encoder_args(preset: dict, codec: str) -> list:
+    """
+    Preset'i ffmpeg video encoder argümanlarına çevir
+
+    Args:
+        preset: Kalite ayarları
+        codec: Video encoder (libx264, mpeg4 vb.)
+    """
+    args = []
+    if preset.get('crf') is not None and codec in X264_STYLE_ENCODERS:
+        args += ['-crf', str(preset['crf'])]
+    elif preset.get('bitrate'):
+        args += ['-b:v', preset['bitrate']]
+
+    if codec in X264_STYLE_ENCODERS:
+        if preset.get('preset'):
+            args += ['-preset', preset['preset']]
+        if preset.get('tune'):
+            args += ['-tune', preset['tune']]
+
+    if preset.get('threads'):
+        args += ['-threads', str(preset['threads'])]
+
+    return args
@@ -1,12 +1,34 @@
 """
 Exporter - Video dışa aktarma
 """
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from moviepy import VideoFileClip
 from utils.logger import setup_logger
+from utils.config import TEMP_DIR, MAX_WORKERS
+from utils.job_context import JobContext, JobCancelled, current_job, job_scope, progress_span, report_progress
+from utils.progress import moviepy_logger
+from .ffmpeg_utils import run_ffmpeg, probe_duration, probe_keyframes
+from .proxy import get_proxy_manager
+from .export_presets import get_preset, scale_filter, encoder_args, X264_STYLE_ENCODERS
 
 logger = setup_logger(__name__)
 
+
+def _encode_segment(job: dict) -> str:
+    """Tek bir zaman aralığını kodla (paralel dışa aktarma işçisi)"""
+    with job_scope(job['context']):
+        run_ffmpeg([
+            '-ss', job['start'], '-i', job['input'], '-t', job['duration'],
+            '-map', '0:v:0', '-an',
+            *job['video_args'],
+            '-y', job['output']
+        ])
+    return job['output']
+
 class VideoExporter:
     """Video'yu farklı formatlara dışa aktar"""
     
@@ -17,11 +39,19 @@ class VideoExporter:
         'mkv': 'libx264'
     }
     
+    # Paralel dışa aktarmada bir parçanın minimum süresi (saniye)
+    MIN_SEGMENT_SECONDS = 10.0
+    
+    # Bölme noktası için keyframe arama penceresi (saniye)
+    SPLIT_SEARCH_SECONDS = 10.0
+    
     @staticmethod
     def export(
         input_video: str,
         output_video: str,
-        quality: str = 'hd'
+        quality: str = 'hd',
+        workers: int = MAX_WORKERS,
+        backend: str = 'ffmpeg'
     ) -> bool:
         """
         Videoyu dışa aktar
@@ -29,39 +59,241 @@ class VideoExporter:
         Args:
             input_video: Giriş video
             output_video: Çıkış video
-            quality: 'hd' (720p), 'fhd' (1080p), 'standard' (480p)
+            quality: 'hd' (720p), 'fhd' (1080p), 'standard' (480p) veya kullanıcı preset'i
+            workers: Paralel kodlayıcı sayısı (1 ise tek geçişte kodlanır)
+            backend: 'ffmpeg' (frame'ler Python'a girmez) veya 'moviepy'
+                (sadece frame bazlı Python işlemi gerektiğinde)
         """
+        input_video = get_proxy_manager().source_of(input_video)  # Proxy verildiyse kaynaktan render et
+        if backend == 'moviepy':
+            return VideoExporter._export_moviepy(input_video, output_video, quality)
+        
+        if workers > 1 and VideoExporter.export_parallel(input_video, output_video, quality, workers):
+            return True
+        
         try:
             logger.info(f"Video dışa aktarılıyor ({quality}): {output_video}")
             
+            preset = get_preset(quality)
+            codec = VideoExporter._codec_for(output_video)
+            
+            # Tek ffmpeg çağrısı: decode -> filtre -> encode tamamen ffmpeg içinde
+            run_ffmpeg([
+                '-i', input_video,
+                '-map', '0:v:0', '-map', '0:a:0?',
+                *VideoExporter._video_args(preset, codec),
+                '-c:a', 'aac',
+                '-y', output_video
+            ])
+            
+            logger.info(f"Video başarıyla dışa aktarıldı: {output_video}")
+            return True
+        
+        except JobCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Video dışa aktarılırken hata: {e}")
+            return False
+    
+    @staticmethod
+    def _codec_for(output_video: str) -> str:
+        """Uzantıya göre codec seç"""
+        ext = Path(output_video).suffix.lower().lstrip('.')
+        return VideoExporter.CODEC_MAP.get(ext, 'libx264')
+    
+    @staticmethod
+    def _video_args(preset: dict, codec: str, threads: int = None) -> list:
+        """
+        Preset için ffmpeg video filtre/encoder argümanlarını oluştur
+        
+        Args:
+            preset: Kalite ayarları
+            codec: Video encoder
+            threads: Preset thread belirtmiyorsa kullanılacak thread sayısı
+        """
+        args = []
+        vf = scale_filter(preset)
+        if vf:
+            args += ['-vf', vf]
+        args += ['-c:v', codec, '-r', preset['fps']]
+        args += encoder_args(preset, codec)
+        if threads and not preset.get('threads'):
+            args += ['-threads', threads]
+        return args
+    
+    @staticmethod
+    def _export_moviepy(
+        input_video: str,
+        output_video: str,
+        quality: str = 'hd'
+    ) -> bool:
+        """
+        Videoyu MoviePy ile dışa aktar (frame'ler NumPy üzerinden geçer)
+        """
+        try:
+            logger.info(f"Video dışa aktarılıyor (MoviePy, {quality}): {output_video}")
+            
+            preset = get_preset(quality)
+            codec = VideoExporter._codec_for(output_video)
+            
+            # Küçültme decode sırasında ffmpeg tarafında yapılır
             video = VideoFileClip(input_video)
+            height = preset.get('height')
+            if height and video.h > height:
+                video.close()
+                video = VideoFileClip(input_video, target_resolution=(None, height))
             
-            # Kalite ayarla
-            if quality == 'hd':
-                bitrate = "3000k"
-                fps = 30
-            elif quality == 'fhd':
-                bitrate = "5000k"
-                fps = 30
-            else:  # standard
-                bitrate = "1500k"
-                fps = 24
-            
-            # Uzantıya göre codec seç
-            ext = Path(output_video).suffix.lower().lstrip('.')
-            codec = VideoExporter.CODEC_MAP.get(ext, 'libx264')
+            ffmpeg_params = []
+            if preset.get('crf') is not None and codec in X264_STYLE_ENCODERS:
+                ffmpeg_params += ['-crf', str(preset['crf'])]
+            if preset.get('tune') and codec in X264_STYLE_ENCODERS:
+                ffmpeg_params += ['-tune', preset['tune']]
             
             video.write_videofile(
                 output_video,
                 codec=codec,
-                fps=fps,
-                logger=None
+                fps=preset['fps'],
+                bitrate=None if preset.get('crf') is not None else preset.get('bitrate'),
+                preset=preset.get('preset') or 'medium',
+                threads=preset.get('threads') or None,
+                ffmpeg_params=ffmpeg_params or None,
+                logger=moviepy_logger()
             )
             
             video.close()
             logger.info(f"Video başarıyla dışa aktarıldı: {output_video}")
             return True
         
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"Video dışa aktarılırken hata: {e}")
             return False
+    
+    @staticmethod
+    def _plan_segments(input_video: str, duration: float, workers: int) -> list:
+        """
+        Zaman çizelgesini keyframe'lerden N parçaya böl
+        
+        Returns:
+            [(başlangıç, bitiş), ...] listesi
+        """
+        count = min(workers, int(duration // VideoExporter.MIN_SEGMENT_SECONDS))
+        if count < 2:
+            return [(0.0, duration)]
+        
+        # Her hedef noktadan sonraki ilk keyframe'i bul (sadece küçük pencere taranır)
+        boundaries = [0.0]
+        for i in range(1, count):
+            target = duration * i / count
+            keyframes = [
+                t for t in probe_keyframes(input_video, target, target + VideoExporter.SPLIT_SEARCH_SECONDS)
+                if t >= target
+            ]
+            if keyframes and keyframes[0] - boundaries[-1] >= VideoExporter.MIN_SEGMENT_SECONDS / 2:
+                boundaries.append(keyframes[0])
+        boundaries.append(duration)
+        
+        return [
+            (start, end) for start, end in zip(boundaries[:-1], boundaries[1:])
+            if end > start
+        ]
+    
+    @staticmethod
+    def export_parallel(
+        input_video: str,
+        output_video: str,
+        quality: str = 'hd',
+        workers: int = MAX_WORKERS
+    ) -> bool:
+        """
+        Videoyu keyframe'lerden parçalara bölüp paralel kodla ve birleştir
+        
+        Her parça ayrı bir ffmpeg sürecinde kodlanır; ses tek seferde
+        kodlanıp birleştirme sırasında muxlanır.
+        
+        Args:
+            input_video: Giriş video
+            output_video: Çıkış video
+            quality: 'hd' (720p), 'fhd' (1080p), 'standard' (480p) veya kullanıcı preset'i
+            workers: Aynı anda çalışacak ffmpeg süreci sayısı
+        
+        Returns:
+            Başarılı ise True; paralel kodlama uygulanamıyorsa False
+        """
+        input_video = get_proxy_manager().source_of(input_video)  # Proxy verildiyse kaynaktan render et
+        work_dir = None
+        try:
+            duration = probe_duration(input_video)
+            segments = VideoExporter._plan_segments(input_video, duration, workers)
+            if len(segments) < 2:
+                logger.info("Video paralel dışa aktarma için çok kısa, tek geçişte kodlanacak")
+                return False
+            
+            preset = get_preset(quality)
+            codec = VideoExporter._codec_for(output_video)
+            
+            # Çekirdekleri eşzamanlı ffmpeg süreçleri arasında paylaştır
+            threads = max(1, (os.cpu_count() or 1) // len(segments))
+            video_args = VideoExporter._video_args(preset, codec, threads)
+            
+            logger.info(
+                f"Video paralel dışa aktarılıyor ({quality}, {len(segments)} parça, "
+                f"{workers} işçi): {output_video}"
+            )
+            
+            # Parçalar çalışan işin iptalini paylaşır; ilerleme (aynı anda
+            # biten parçalar karışmasın diye) burada, biten sürelerden toplanır
+            running = current_job()
+            segment_context = JobContext(running.job_id, running.cancel_event) if running else None
+            
+            TEMP_DIR.mkdir(exist_ok=True)
+            work_dir = Path(tempfile.mkdtemp(prefix='export_', dir=TEMP_DIR))
+            jobs = [
+                {
+                    'input': input_video,
+                    'output': str(work_dir / f"part_{i:03d}.mkv"),
+                    'start': start,
+                    'duration': end - start,
+                    'video_args': video_args,
+                    'context': segment_context
+                }
+                for i, (start, end) in enumerate(segments)
+            ]
+            
+            # İş ffmpeg süreçlerinde yapılır; thread'ler sadece süreçleri bekler
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(_encode_segment, job): job for job in jobs}
+                encoded = 0.0
+                for future in as_completed(futures):
+                    future.result()
+                    encoded += futures[future]['duration']
+                    report_progress(0.9 * encoded / duration, f"{len(segments)} parça kodlanıyor")
+                parts = [job['output'] for job in jobs]
+            
+            concat_list = work_dir / 'parts.txt'
+            concat_list.write_text(
+                ''.join(f"file '{Path(part).as_posix()}'\n" for part in parts),
+                encoding='utf-8'
+            )
+            
+            with progress_span(0.9, 1.0):
+                run_ffmpeg([
+                    '-f', 'concat', '-safe', '0', '-i', concat_list,
+                    '-i', input_video,
+                    '-map', '0:v:0', '-map', '1:a:0?',
+                    '-c:v', 'copy', '-c:a', 'aac',
+                    '-y', output_video
+                ])
+            
+            logger.info(f"Video başarıyla dışa aktarıldı: {output_video}")
+            return True
+        
+        except JobCancelled:
+            raise  # İptalde tek geçişe düşülmez
+        except Exception as e:
+            logger.warning(f"Paralel dışa aktarma başarısız, tek geçişe düşülüyor: {e}")
+            return False
+        finally:
+            if work_dir is not None:
+                shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,277 @@
+"""
+FFmpeg Utils - ffmpeg/ffprobe yardımcıları
+"""
+import json
+import subprocess
+import threading
+from utils.logger import setup_logger
+from utils.job_context import current_job, JobCancelled
+from utils.progress import FFmpegProgress, output_duration
+
+logger = setup_logger(__name__)
+
+FFMPEG_BINARY = 'ffmpeg'
+FFPROBE_BINARY = 'ffprobe'
+
+# İş içinde çalışan ffmpeg için iptal kontrolü aralığı (saniye)
+CANCEL_POLL_SECONDS = 0.2
+
+
+def run_ffmpeg(args: list) -> subprocess.CompletedProcess:
+    """
+    ffmpeg komutunu çalıştır
+
+    Args:
+        args: 'ffmpeg' sonrasındaki argümanlar
+
+    Bir iş (job) içinde çağrılırsa ffmpeg'in -progress çıktısı işin
+    ilerlemesine aktarılır ve iptal istenince ffmpeg sonlandırılır.
+
+    Raises:
+        subprocess.CalledProcessError: ffmpeg hata ile çıkarsa
+        JobCancelled: Çalışan iş iptal edilirse
+    """
+    cmd = [FFMPEG_BINARY, '-hide_banner', '-nostdin'] + [str(a) for a in args]
+    job = current_job()
+    if job is None:
+        logger.debug(f"ffmpeg: {' '.join(cmd)}")
+        return subprocess.run(cmd, capture_output=True, check=True)
+
+    job.check()
+    # Çıkış stdout'a yazılıyorsa ilerleme bildirilemez (boru çıkışa ait)
+    parser = None
+    if 'pipe:1' not in cmd:
+        parser = FFmpegProgress(job, output_duration(args))
+        cmd[3:3] = ['-progress', 'pipe:1', '-nostats']
+    logger.debug(f"ffmpeg: {' '.join(cmd)}")
+
+    # Borular ayrı thread'lerde okunur; bu thread sadece süreci ve iptali izler
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout_chunks, stderr_chunks = [], []
+    readers = [
+        threading.Thread(
+            target=_read_pipe,
+            args=(process.stdout, None if parser else stdout_chunks, parser.feed if parser else None),
+            daemon=True
+        ),
+        threading.Thread(
+            target=_read_pipe,
+            args=(process.stderr, stderr_chunks, parser.feed_log if parser else None),
+            daemon=True
+        )
+    ]
+    for reader in readers:
+        reader.start()
+
+    try:
+        while True:
+            try:
+                process.wait(timeout=CANCEL_POLL_SECONDS)
+                break
+            except subprocess.TimeoutExpired:
+                if job.cancelled:
+                    process.kill()
+                    process.wait()
+                    raise JobCancelled()
+    finally:
+        for reader in readers:
+            reader.join()
+        process.stdout.close()
+        process.stderr.close()
+
+    stdout, stderr = b''.join(stdout_chunks), b''.join(stderr_chunks)
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd, stdout, stderr)
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+def _read_pipe(pipe, chunks: list = None, on_line=None):
+    """
+    Boruyu sonuna kadar oku
+
+    Args:
+        chunks: Okunanların ekleneceği liste (None ise saklanmaz)
+        on_line: Her satır için çağrılacak fonksiyon (None ise satırlara bölünmez)
+    """
+    if on_line is None:
+        data = pipe.read()
+        if chunks is not None:
+            chunks.append(data)
+        return
+    for line in pipe:
+        if chunks is not None:
+            chunks.append(line)
+        try:
+            on_line(line)
+        except Exception as e:
+            logger.debug(f"ffmpeg ilerleme satırı işlenemedi: {e}")
+
+
+def popen_ffmpeg(args: list) -> subprocess.Popen:
+    """
+    ffmpeg'i arka planda başlat (çıktı stdout borusundan okunur)
+
+    Args:
+        args: 'ffmpeg' sonrasındaki argümanlar
+    """
+    cmd = [FFMPEG_BINARY, '-hide_banner', '-nostdin', '-loglevel', 'error'] + [str(a) for a in args]
+    logger.debug(f"ffmpeg: {' '.join(cmd)}")
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+
+def run_ffprobe(args: list) -> str:
+    """ffprobe komutunu çalıştır ve stdout'u döndür"""
+    cmd = [FFPROBE_BINARY, '-v', 'error'] + [str(a) for a in args]
+    result = subprocess.run(cmd, capture_output=True, check=True, text=True)
+    return result.stdout
+
+
+def probe_video_stream(path: str) -> dict:
+    """
+    İlk video akışının bilgilerini al
+
+    Returns:
+        codec_name, profile, level, width, height, pix_fmt, time_base,
+        sample_aspect_ratio, döndürme bilgisi (side_data_list / tags) vb.
+        içeren dict (video akışı yoksa boş dict)
+    """
+    output = run_ffprobe([
+        '-select_streams', 'v:0',
+        '-show_entries',
+        'stream=codec_name,profile,level,refs,has_b_frames,width,height,pix_fmt,time_base,r_frame_rate,sample_aspect_ratio'
+        ':stream_side_data=rotation:stream_tags=rotate',
+        '-of', 'json',
+        str(path)
+    ])
+    streams = json.loads(output or '{}').get('streams', [])
+    return streams[0] if streams else {}
+
+
+def display_size(stream: dict) -> tuple:
+    """
+    Akışın ekranda görünen boyutu (en, boy)
+
+    Piksel en-boy oranı (SAR) uygulanır; 90/270 derece döndürülmüş
+    videolarda (ffmpeg çözerken otomatik döndürür) en ve boy yer değiştirir.
+
+    Args:
+        stream: probe_video_stream sonucu
+    """
+    width, height = int(stream['width']), int(stream['height'])
+
+    sar = str(stream.get('sample_aspect_ratio') or '1:1').split(':')
+    try:
+        num, den = int(sar[0]), int(sar[1])
+        if num > 0 and den > 0:
+            width = int(round(width * num / den))
+    except (ValueError, IndexError):
+        pass  # N/A veya 0:1 (bilinmiyor): kare piksel
+
+    rotation = 0.0
+    for side_data in stream.get('side_data_list', []):
+        if 'rotation' in side_data:
+            rotation = float(side_data['rotation'])
+    if not rotation:
+        rotation = float(stream.get('tags', {}).get('rotate', 0) or 0)  # Eski ffmpeg
+    if round(rotation) % 180 == 90:
+        width, height = height, width
+
+    return width, height
+
+
+def probe_audio_stream(path: str) -> dict:
+    """
+    İlk ses akışının bilgilerini al
+
+    Returns:
+        codec_name, sample_rate, channels içeren dict (ses akışı yoksa boş dict)
+    """
+    output = run_ffprobe([
+        '-select_streams', 'a:0',
+        '-show_entries', 'stream=codec_name,sample_rate,channels',
+        '-of', 'json',
+        str(path)
+    ])
+    streams = json.loads(output or '{}').get('streams', [])
+    return streams[0] if streams else {}
+
+
+def probe_duration(path: str) -> float:
+    """Medya süresini saniye cinsinden al"""
+    output = run_ffprobe([
+        '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1',
+        str(path)
+    ])
+    try:
+        return float(output.strip())
+    except ValueError:
+        return 0.0
+
+
+def probe_start_time(path: str) -> float:
+    """Container başlangıç zamanı (saniye; MPEG-TS ve kamera dosyalarında sıfırdan farklı olabilir)"""
+    output = run_ffprobe([
+        '-show_entries', 'format=start_time',
+        '-of', 'default=noprint_wrappers=1:nokey=1',
+        str(path)
+    ])
+    try:
+        return float(output.strip())
+    except ValueError:
+        return 0.0  # N/A
+
+
+def probe_packet_times(path: str, start: float = None, end: float = None) -> list:
+    """
+    Video akışındaki paketlerin zamanları ve keyframe bayrakları
+    (paket taraması, decode yok)
+
+    Zamanlar container başlangıcına göredir (pts_time - start_time), yani
+    doğrudan ffmpeg -ss değeri olarak kullanılabilir.
+
+    Args:
+        path: Video dosyası
+        start: Tarama başlangıcı (saniye, opsiyonel)
+        end: Tarama bitişi (saniye, opsiyonel)
+
+    Returns:
+        [(zaman, keyframe mi), ...] dosyadaki paket sırasıyla; zaman
+        damgası olmayan paketler atlanır
+    """
+    offset = probe_start_time(path)
+    args = ['-select_streams', 'v:0']
+    if start is not None or end is not None:
+        # -read_intervals mutlak zaman damgası bekler
+        interval_start = f"{max(start or 0.0, 0.0) + offset}"
+        interval_end = f"{end + offset}" if end is not None else ""
+        args += ['-read_intervals', f"{interval_start}%{interval_end}"]
+    args += [
+        '-show_entries', 'packet=pts_time,flags',
+        '-of', 'csv=p=0',
+        str(path)
+    ]
+
+    packets = []
+    for line in run_ffprobe(args).splitlines():
+        parts = line.strip().split(',')
+        if len(parts) < 2:
+            continue
+        try:
+            packets.append((round(float(parts[0]) - offset, 6), 'K' in parts[1]))
+        except ValueError:
+            continue  # pts_time=N/A
+
+    return packets
+
+
+def probe_keyframes(path: str, start: float = None, end: float = None) -> list:
+    """
+    Video akışındaki keyframe zamanlarını al (paket taraması, decode yok)
+
+    Zamanlar container başlangıcına göredir (bkz. probe_packet_times).
+
+    Returns:
+        Sıralı keyframe zamanları (saniye)
+    """
+    return sorted({time for time, keyframe in probe_packet_times(path, start, end) if keyframe})
@@ -0,0 +1,136 @@
+"""
+Filmstrip - Timeline için küçük resim şeridi (sprite sheet)
+"""
+import math
+import cv2
+import numpy as np
+from utils.logger import setup_logger
+from utils.config import FILMSTRIP_INTERVAL, FILMSTRIP_HEIGHT, FILMSTRIP_MAX_FRAMES, FILMSTRIP_COLUMNS
+from .ffmpeg_utils import popen_ffmpeg, probe_video_stream, probe_duration, display_size
+from .analysis_cache import get_analysis_cache
+
+logger = setup_logger(__name__)
+
+class Filmstrip:
+    """
+    Videonun sabit aralıklı düşük çözünürlüklü karelerinden oluşan sprite sheet
+    
+    Kareler ffmpeg'in fps/scale filtreleriyle tek bir sıralı geçişte
+    çıkarılır (rastgele arama yok). Sprite JPEG olarak analiz önbelleğinde
+    saklanır; aynı dosya tekrar açıldığında yeniden çıkarılmaz.
+    
+    Örnek:
+        strip = Filmstrip.load("video.mp4")
+        thumb = strip.thumbnail_at(12.5)  # (yükseklik, genişlik, 3) RGB
+    """
+    
+    def __init__(self, sprite: np.ndarray, interval: float, count: int, tile_width: int, tile_height: int):
+        """
+        Args:
+            sprite: (satır * tile_height, sütun * tile_width, 3) RGB uint8
+            interval: Kareler arası süre (saniye)
+            count: Kare sayısı
+        """
+        self.sprite = sprite
+        self.interval = float(interval)
+        self.count = int(count)
+        self.tile_width = int(tile_width)
+        self.tile_height = int(tile_height)
+        self.columns = max(sprite.shape[1] // self.tile_width, 1)
+    
+    @staticmethod
+    def frame_interval(duration: float, interval: float = FILMSTRIP_INTERVAL, max_frames: int = FILMSTRIP_MAX_FRAMES) -> float:
+        """Kare aralığı; uzun videolarda kare sayısı max_frames'i aşmasın diye büyütülür"""
+        return max(float(interval), duration / max_frames) if duration > 0 else float(interval)
+    
+    @classmethod
+    def build(cls, video_path: str, interval: float, height: int = FILMSTRIP_HEIGHT, cancelled=None) -> "Filmstrip":
+        """
+        ffmpeg ile tek geçişte şeridi çıkar
+        
+        Args:
+            interval: Kareler arası süre (saniye)
+            height: Küçük resim yüksekliği (piksel)
+            cancelled: Parametresiz, True dönerse işlemi durduran fonksiyon
+        
+        Raises:
+            ValueError: Video akışı bulunamazsa
+            InterruptedError: İptal edilirse
+        """
+        stream = probe_video_stream(video_path)
+        if not stream:
+            raise ValueError(f"Video akışı bulunamadı: {video_path}")
+        
+        # Boyut baştan sabitlenir (ham kare boyutu bilinsin diye), genişlik çift;
+        # en-boy oranı SAR ve döndürme uygulanmış görüntü boyutundan
+        display_width, display_height = display_size(stream)
+        width = max(int(round(height * display_width / display_height / 2)) * 2, 2)
+        frame_bytes = width * height * 3
+        
+        process = popen_ffmpeg([
+            '-threads', 0,
+            '-i', video_path, '-map', '0:v:0', '-an', '-sn',
+            '-vf', f'fps=fps=1/{interval:.6f}:round=up,scale={width}:{height}:flags=area,setsar=1',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', 'pipe:1'
+        ])
+        tiles = []
+        try:
+            while True:
+                if cancelled is not None and cancelled():
+                    raise InterruptedError("Filmstrip oluşturma iptal edildi")
+                data = process.stdout.read(frame_bytes)
+                if len(data) < frame_bytes:
+                    break
+                tiles.append(np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3))
+        finally:
+            process.kill()
+            process.stdout.close()
+            process.wait()
+        
+        if not tiles:
+            raise ValueError(f"Filmstrip karesi çıkarılamadı: {video_path}")
+        
+        columns = min(FILMSTRIP_COLUMNS, len(tiles))
+        rows = math.ceil(len(tiles) / columns)
+        sprite = np.zeros((rows * height, columns * width, 3), dtype=np.uint8)
+        for i, tile in enumerate(tiles):
+            row, column = divmod(i, columns)
+            sprite[row * height:(row + 1) * height, column * width:(column + 1) * width] = tile
+        
+        logger.info(f"Filmstrip oluşturuldu: {len(tiles)} kare, {interval:.2f}s aralık")
+        return cls(sprite, interval, len(tiles), width, height)
+    
+    @classmethod
+    def load(cls, video_path: str, height: int = FILMSTRIP_HEIGHT, cancelled=None) -> "Filmstrip":
+        """Şeridi önbellekten yükle (yoksa çıkarıp JPEG olarak sakla)"""
+        interval = cls.frame_interval(probe_duration(video_path))
+        
+        def compute():
+            strip = cls.build(video_path, interval, height, cancelled)
+            ok, jpeg = cv2.imencode('.jpg', cv2.cvtColor(strip.sprite, cv2.COLOR_RGB2BGR))
+            if not ok:
+                raise ValueError("Filmstrip JPEG olarak kodlanamadı")
+            return {
+                'jpeg': jpeg.ravel(),
+                'count': strip.count,
+                'tile_width': strip.tile_width,
+                'tile_height': strip.tile_height
+            }
+        
+        value = get_analysis_cache().get_or_compute('filmstrip', video_path, compute, interval=interval, height=height)
+        sprite = cv2.cvtColor(cv2.imdecode(value['jpeg'], cv2.IMREAD_COLOR), cv2.COLOR_BGR2RGB)
+        return cls(sprite, interval, int(value['count']), int(value['tile_width']), int(value['tile_height']))
+    
+    def index_at(self, seconds: float) -> int:
+        """Verilen ana en yakın küçük resmin sırası"""
+        return int(np.clip(round(seconds / self.interval), 0, self.count - 1))
+    
+    def thumbnail(self, index: int) -> np.ndarray:
+        """Küçük resim (sprite üzerinde görünüm, kopya değil)"""
+        row, column = divmod(int(index), self.columns)
+        top, left = row * self.tile_height, column * self.tile_width
+        return self.sprite[top:top + self.tile_height, left:left + self.tile_width]
+    
+    def thumbnail_at(self, seconds: float) -> np.ndarray:
+        """Verilen ana en yakın küçük resim"""
+        return self.thumbnail(self.index_at(seconds))
@@ -0,0 +1,181 @@
+"""
+Noise Level - Örneklemeli gürültü seviyesi tahmini
+
+Gürültü seviyesi, STFT genliklerinin 10. yüzdeliğinin ortalama genliğe
+oranıdır. Kesin yöntem tüm sinyalin STFT'sini alır; örneklemeli yöntem
+rastgele seçilen frame'lerle aynı istatistiği sınırlı hatayla tahmin eder.
+
+Hata sınırı (Hoeffding / DKW): k frame yerine koymadan rastgele
+seçildiğinde, tahmin edilen yüzdelik dilimin gerçek sıra (rank) hatası
+1 - delta olasılıkla en fazla epsilon = sqrt(ln(2 / delta) / (2k)) olur.
+Varsayılan epsilon=0.02, delta=0.01 için k = 6623 frame yeterlidir; bu
+sayı dosya uzunluğundan bağımsızdır.
+"""
+import math
+import numpy as np
+import librosa
+import soundfile as sf
+import soxr
+from scipy.signal import get_window
+from utils.logger import setup_logger
+from utils.config import SAMPLE_RATE
+from .stft_stream import N_FFT, HOP_LENGTH
+
+logger = setup_logger(__name__)
+
+METHODS = ("exact", "sampled")
+PERCENTILE = 10
+
+# Varsayılan hata sınırı: yüzdelik sıra hatası <= EPSILON (olasılık >= 1 - DELTA)
+EPSILON = 0.02
+DELTA = 0.01
+
+# Tekrarlanabilir sonuç için sabit tohum
+SEED = 0
+
+# Örnekleme hızı dönüştürülürken frame'in iki yanına eklenen pay (örnek)
+RESAMPLE_MARGIN = 64
+
+# Tek seferde örnekleme hızı dönüştürülen frame sayısı
+RESAMPLE_BATCH = 512
+
+
+def required_frames(epsilon: float = EPSILON, delta: float = DELTA) -> int:
+    """Verilen hata sınırı için gereken frame sayısı"""
+    return math.ceil(math.log(2 / delta) / (2 * epsilon ** 2))
+
+
+def rank_error_bound(n_frames: int, delta: float = DELTA) -> float:
+    """n_frames örneklemeli frame için yüzdelik sıra hatası sınırı"""
+    if n_frames <= 0:
+        return 1.0
+    return math.sqrt(math.log(2 / delta) / (2 * n_frames))
+
+
+def _stats(magnitude: np.ndarray) -> dict:
+    """Genlik istatistikleri ve gürültü seviyesi"""
+    if magnitude.size == 0:
+        return {'mean': 0.0, 'percentile_10': 0.0, 'noise_level': 0.0}
+    mean = float(np.mean(magnitude))
+    percentile_10 = float(np.percentile(magnitude, PERCENTILE))
+    return {
+        'mean': mean,
+        'percentile_10': percentile_10,
+        'noise_level': float(np.clip(percentile_10 / (mean + 1e-10), 0, 1))
+    }
+
+
+def _pick_frames(n_frames: int, epsilon: float, delta: float, seed: int) -> np.ndarray:
+    """Örneklenecek frame indisleri (sıralı); hepsi gerekiyorsa None"""
+    k = required_frames(epsilon, delta)
+    if k >= n_frames:
+        return None
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(n_frames, size=k, replace=False))
+
+
+def _magnitudes(frames: np.ndarray) -> np.ndarray:
+    """(frame, n_fft) örneklerinden hann pencereli rFFT genliği"""
+    window = get_window('hann', N_FFT, fftbins=True).astype(np.float32)
+    return np.abs(np.fft.rfft(frames * window, axis=-1))
+
+
+def noise_level_stats(
+    y: np.ndarray,
+    method: str = "sampled",
+    epsilon: float = EPSILON,
+    delta: float = DELTA,
+    seed: int = SEED
+) -> dict:
+    """
+    Bellekteki sinyalin gürültü seviyesi istatistikleri
+
+    Args:
+        y: Mono sinyal
+        method: "exact" (tüm STFT) veya "sampled" (rastgele frame'ler)
+        epsilon: Örneklemeli yöntemde izin verilen yüzdelik sıra hatası
+        delta: Sınırın aşılma olasılığı
+
+    Returns:
+        {'mean', 'percentile_10', 'noise_level', 'frames', 'rank_error'}
+    """
+    if method not in METHODS:
+        raise ValueError(f"Bilinmeyen gürültü seviyesi yöntemi: {method}")
+
+    y = np.asarray(y, dtype=np.float32)
+    n_frames = 1 + len(y) // HOP_LENGTH
+    indices = _pick_frames(n_frames, epsilon, delta, seed) if method == "sampled" else None
+
+    if indices is None:
+        result = _stats(np.abs(librosa.stft(y)))
+        result.update(frames=n_frames, rank_error=0.0)
+        return result
+
+    # librosa.stft ile aynı çerçeveleme (center=True, sıfır dolgu)
+    padded = np.pad(y, N_FFT // 2)
+    frames = np.lib.stride_tricks.sliding_window_view(padded, N_FFT)[indices * HOP_LENGTH]
+    result = _stats(_magnitudes(frames))
+    result.update(frames=len(indices), rank_error=rank_error_bound(len(indices), delta))
+    return result
+
+
+def noise_level_stats_file(
+    audio_path: str,
+    sr: int = SAMPLE_RATE,
+    epsilon: float = EPSILON,
+    delta: float = DELTA,
+    seed: int = SEED
+) -> dict:
+    """
+    Dosyayı tamamen çözmeden örneklemeli gürültü seviyesi
+
+    Sadece seçilen frame'lerin bulunduğu kısa aralıklar okunur ve gerekirse
+    sr hızına dönüştürülür; süre dosya uzunluğundan neredeyse bağımsızdır.
+    Sonuç librosa.load(audio_path, sr) üzerindeki örneklemeli tahminle
+    (dönüşüm kenar etkileri dışında) aynıdır.
+
+    Raises:
+        RuntimeError: soundfile dosyayı açamaz / arayamazsa
+    """
+    with sf.SoundFile(audio_path) as f:
+        if not f.seekable():
+            raise RuntimeError(f"Dosyada arama yapılamıyor: {audio_path}")
+
+        ratio = f.samplerate / sr
+        length = int(math.ceil(f.frames / ratio))
+        n_frames = 1 + length // HOP_LENGTH
+        indices = _pick_frames(n_frames, epsilon, delta, seed)
+        if indices is None:
+            indices = np.arange(n_frames)
+
+        # Hedef hızda frame başlangıçları (center=True: n_fft // 2 geri) ve
+        # kenar payıyla birlikte okunacak sabit uzunluklu aralıklar
+        starts = indices * HOP_LENGTH - N_FFT // 2 - RESAMPLE_MARGIN
+        native_starts = np.floor(starts * ratio).astype(np.int64)
+        span = int(math.ceil((N_FFT + 2 * RESAMPLE_MARGIN) * ratio)) + 2
+
+        segments = np.zeros((len(indices), span), dtype=np.float32)
+        for row, native_start in enumerate(native_starts):
+            read_start = min(max(native_start, 0), f.frames)
+            read_end = min(max(native_start + span, 0), f.frames)
+            if read_end > read_start:
+                f.seek(read_start)
+                data = f.read(read_end - read_start, dtype='float32', always_2d=True).mean(axis=1)
+                segments[row, read_start - native_start:read_start - native_start + len(data)] = data
+        native_rate = f.samplerate
+
+    frames = np.zeros((len(indices), N_FFT), dtype=np.float32)
+    offsets = np.round(starts - native_starts / ratio).astype(np.int64) + RESAMPLE_MARGIN
+    for first in range(0, len(indices), RESAMPLE_BATCH):
+        batch = segments[first:first + RESAMPLE_BATCH]
+        if native_rate != sr:
+            # librosa.load varsayılanı (soxr_hq); sütunlar ayrı kanal gibi işlenir
+            batch = soxr.resample(batch.T, native_rate, sr, quality='HQ').T
+        for row, offset in enumerate(offsets[first:first + RESAMPLE_BATCH]):
+            frame = batch[row, offset:offset + N_FFT]
+            frames[first + row, :len(frame)] = frame
+
+    result = _stats(_magnitudes(frames))
+    sampled = len(indices) < n_frames
+    result.update(frames=len(indices), rank_error=rank_error_bound(len(indices), delta) if sampled else 0.0)
+    return result
@@ -0,0 +1,242 @@
+"""
+Noise Profile - Gürültü tabanı tahmini ve kaydedilebilir gürültü profili
+"""
+from pathlib import Path
+import numpy as np
+import soundfile as sf
+from scipy.ndimage import minimum_filter1d
+from scipy.signal import lfilter
+from utils.logger import setup_logger
+from .stft_stream import stft, iter_stft_frames, N_FFT, HOP_LENGTH
+
+logger = setup_logger(__name__)
+
+class NoiseProfile:
+    """
+    Gürültü spektrumu (frekans başına genlik)
+    
+    Aynı mikrofonla kaydedilmiş başka dosyalara uygulanmak üzere
+    save() / load() ile saklanabilir.
+    """
+    
+    METHODS = ("leading", "quiet_frames", "minimum_statistics")
+    
+    # quiet_frames: enerjisi bu yüzdelik dilimin altındaki frame'ler sessiz sayılır
+    QUIET_PERCENTILE = 15
+    
+    # minimum_statistics: güç yumuşatma katsayısı, minimum penceresi (saniye)
+    # ve minimum izinin ortalama gürültüye göre sapma düzeltmesi
+    SMOOTHING = 0.85
+    MIN_WINDOW_SECONDS = 1.5
+    BIAS_COMPENSATION = 1.5
+    
+    # Dosyadan streaming tahmin için saklanan en fazla sessiz frame sayısı
+    MAX_QUIET_FRAMES = 2000
+    
+    def __init__(
+        self,
+        spectrum: np.ndarray,
+        sample_rate: int,
+        n_fft: int = N_FFT,
+        method: str = "quiet_frames"
+    ):
+        self.spectrum = np.asarray(spectrum, dtype=np.float32).reshape(-1)
+        self.sample_rate = int(sample_rate)
+        self.n_fft = int(n_fft)
+        self.method = method
+    
+    @classmethod
+    def from_magnitude(
+        cls,
+        magnitude: np.ndarray,
+        sample_rate: int,
+        method: str = "quiet_frames",
+        n_fft: int = N_FFT
+    ) -> "NoiseProfile":
+        """
+        STFT genliğinden gürültü tabanını tek vektörel geçişte tahmin et
+        
+        Çok kanallı genlikte tüm kanalların frame'leri birlikte kullanılır;
+        sonuç kanal başına gürültü seviyesidir.
+        
+        Args:
+            magnitude: (frekans, frame) veya (kanal, frekans, frame) şeklinde STFT genliği
+            sample_rate: Örnekleme hızı
+            method: "quiet_frames" (en sessiz frame'lerin medyanı) veya
+                "minimum_statistics" (yumuşatılmış gücün kayan minimumu)
+        """
+        bins = magnitude.shape[-2]
+        if magnitude.shape[-1] == 0:
+            return cls(np.zeros(bins), sample_rate, n_fft, method)
+        
+        if method == "minimum_statistics":
+            power = magnitude.astype(np.float64) ** 2
+            # Zaman ekseninde birinci dereceden yumuşatma
+            smoothed = lfilter([1 - cls.SMOOTHING], [1, -cls.SMOOTHING], power, axis=-1)
+            # Geriye dönük (nedensel) kayan minimum
+            window = cls._min_window(sample_rate)
+            minimum = minimum_filter1d(smoothed, size=window, axis=-1, mode='nearest', origin=window // 2)
+            spectrum = np.sqrt(cls.BIAS_COMPENSATION * minimum.mean(axis=-1).reshape(-1, bins).mean(axis=0))
+        elif method == "quiet_frames":
+            pooled = cls._pool_channels(magnitude)
+            energy = np.sum(pooled ** 2, axis=0)
+            threshold = np.percentile(energy, cls.QUIET_PERCENTILE)
+            quiet = pooled[:, energy <= threshold]
+            spectrum = np.median(quiet, axis=1)
+        else:
+            raise ValueError(f"Bilinmeyen gürültü tahmin yöntemi: {method}")
+        
+        return cls(spectrum, sample_rate, n_fft, method)
+    
+    @staticmethod
+    def _pool_channels(magnitude: np.ndarray) -> np.ndarray:
+        """(kanal, frekans, frame) -> (frekans, kanal * frame)"""
+        if magnitude.ndim == 2:
+            return magnitude
+        return np.moveaxis(magnitude, -2, 0).reshape(magnitude.shape[-2], -1)
+    
+    @classmethod
+    def _min_window(cls, sample_rate: int) -> int:
+        """Minimum penceresi (frame, tek sayı)"""
+        return max(int(cls.MIN_WINDOW_SECONDS * sample_rate / HOP_LENGTH), 1) | 1
+    
+    @classmethod
+    def from_leading(cls, y: np.ndarray, sample_rate: int, noise_duration: float = 1.0) -> "NoiseProfile":
+        """İlk noise_duration saniyenin medyan spektrumu (eski davranış)"""
+        noise_sample = y[..., :int(noise_duration * sample_rate)]
+        spectrum = np.median(cls._pool_channels(np.abs(stft(noise_sample))), axis=1)
+        return cls(spectrum, sample_rate, N_FFT, "leading")
+    
+    @classmethod
+    def from_audio(
+        cls,
+        y: np.ndarray,
+        sample_rate: int,
+        method: str = "quiet_frames",
+        noise_duration: float = 1.0
+    ) -> "NoiseProfile":
+        """Bellekteki (örnek,) veya (kanal, örnek) sinyalden gürültü profili çıkar"""
+        if method == "leading":
+            return cls.from_leading(y, sample_rate, noise_duration)
+        return cls.from_magnitude(np.abs(stft(y)), sample_rate, method)
+    
+    @classmethod
+    def from_file(
+        cls,
+        audio_path: str,
+        method: str = "quiet_frames",
+        noise_duration: float = 1.0,
+        block_size: int = 65536
+    ) -> "NoiseProfile":
+        """
+        Dosyadan sabit bellekle gürültü profili çıkar (kendi hızında,
+        tüm kanallar birlikte)
+        
+        quiet_frames: 1. geçişte frame enerjileri toplanıp eşik bulunur,
+        2. geçişte eşik altındaki frame'lerden en fazla MAX_QUIET_FRAMES
+        tanesi (eşit aralıklı örneklenerek) saklanıp medyanı alınır.
+        minimum_statistics: yumuşatma ve kayan minimum bloklar boyunca
+        (kanal başına) taşınır, minimum izinin ortalaması biriktirilir.
+        """
+        info = sf.info(audio_path)
+        sample_rate = info.samplerate
+        bins = N_FFT // 2 + 1
+        
+        def frames():
+            """(kanal, frame, frekans) bloklar"""
+            blocks = sf.blocks(audio_path, blocksize=block_size, dtype='float32', always_2d=True)
+            return iter_stft_frames(block.T for block in blocks)
+        
+        if method == "leading":
+            head, _ = sf.read(audio_path, frames=int(noise_duration * sample_rate),
+                              dtype='float32', always_2d=True)
+            return cls.from_leading(head.T, sample_rate, noise_duration)
+        
+        if method == "quiet_frames":
+            energies = [np.sum(np.abs(f) ** 2, axis=-1).reshape(-1) for f in frames()]
+            if not energies:
+                return cls(np.zeros(bins), sample_rate, N_FFT, method)
+            energies = np.concatenate(energies)
+            threshold = np.percentile(energies, cls.QUIET_PERCENTILE)
+            quiet_count = int(np.sum(energies <= threshold))
+            stride = max(quiet_count // cls.MAX_QUIET_FRAMES, 1)
+            
+            kept = []
+            seen = 0
+            for f in frames():
+                magnitude = np.abs(f).reshape(-1, bins)
+                quiet = magnitude[np.sum(magnitude ** 2, axis=1) <= threshold]
+                # Eşit aralıklı alt örnekleme (global sıra korunur)
+                index = np.arange(seen, seen + len(quiet))
+                kept.append(quiet[index % stride == 0])
+                seen += len(quiet)
+            spectrum = np.median(np.concatenate(kept), axis=0)
+            return cls(spectrum, sample_rate, N_FFT, method)
+        
+        if method == "minimum_statistics":
+            window = cls._min_window(sample_rate)
+            channels = info.channels
+            zi = np.zeros((channels, 1, bins))
+            history = np.zeros((channels, 0, bins))
+            total = np.zeros(bins)
+            count = 0
+            for f in frames():
+                power = np.abs(f).astype(np.float64) ** 2
+                smoothed, zi = lfilter([1 - cls.SMOOTHING], [1, -cls.SMOOTHING], power, axis=1, zi=zi)
+                # Geriye dönük kayan minimum: önceki bloğun son window-1 frame'i taşınır
+                combined = np.concatenate([history, smoothed], axis=1)
+                minimum = minimum_filter1d(combined, size=window, axis=1, mode='nearest',
+                                           origin=window // 2)[:, history.shape[1]:]
+                total += minimum.sum(axis=(0, 1))
+                count += minimum.shape[0] * minimum.shape[1]
+                history = combined[:, max(combined.shape[1] - (window - 1), 0):]
+            if count == 0:
+                return cls(np.zeros(bins), sample_rate, N_FFT, method)
+            spectrum = np.sqrt(cls.BIAS_COMPENSATION * total / count)
+            return cls(spectrum, sample_rate, N_FFT, method)
+        
+        raise ValueError(f"Bilinmeyen gürültü tahmin yöntemi: {method}")
+    
+    def check_compatible(self, sample_rate: int, n_fft: int = N_FFT):
+        """
+        Profilin verilen sinyale uygulanabilir olduğunu doğrula
+        
+        Raises:
+            ValueError: Örnekleme hızı veya FFT boyu farklıysa
+        """
+        if self.sample_rate != sample_rate or self.n_fft != n_fft:
+            raise ValueError(
+                f"Gürültü profili uyumsuz: profil {self.sample_rate} Hz / n_fft={self.n_fft}, "
+                f"ses {sample_rate} Hz / n_fft={n_fft}"
+            )
+    
+    def save(self, path: str):
+        """Profili .npz olarak kaydet"""
+        np.savez(
+            path,
+            spectrum=self.spectrum,
+            sample_rate=self.sample_rate,
+            n_fft=self.n_fft,
+            method=self.method
+        )
+        logger.info(f"Gürültü profili kaydedildi: {path}")
+    
+    @classmethod
+    def load(cls, path: str) -> "NoiseProfile":
+        """Kaydedilmiş profili yükle"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data['spectrum'],
+                int(data['sample_rate']),
+                int(data['n_fft']),
+                str(data['method'])
+            )
+    
+    @classmethod
+    def resolve(cls, profile) -> "NoiseProfile":
+        """NoiseProfile nesnesi veya kayıt yolu kabul et"""
+        if profile is None or isinstance(profile, NoiseProfile):
+            return profile
+        if isinstance(profile, (str, Path)):
+            return cls.load(str(profile))
+        raise TypeError(f"Geçersiz gürültü profili: {type(profile)}")
@@ -1,78 +1,113 @@
 """
 Noise Reducer - Gürültü azaltma (Spectral Subtraction)
 """
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
 import numpy as np
 import librosa
 import soundfile as sf
 from utils.logger import setup_logger
-from utils.config import SAMPLE_RATE
+from utils.config import SAMPLE_RATE, TEMP_DIR, MAX_WORKERS
+from utils.job_context import JobCancelled, check_cancelled, report_progress
+from .stft_stream import StreamingSTFTProcessor, overlap_add_frames, N_FFT, HOP_LENGTH
+from .normalizer import AudioNormalizer
+from .noise_profile import NoiseProfile
+from .analysis_cache import get_analysis_cache
+from .noise_level import noise_level_stats
+from .quality import QualityAccumulator
+from .denoisers import create_denoiser
 
 logger = setup_logger(__name__)
 
+
+def _denoise_segment(task: dict):
+    """
+    Paralel mod işçisi: paylaşılan bellekteki sinyalin bir frame aralığını
+    işleyip sonucu paylaşılan çıkış tamponuna yaz
+    """
+    in_shm = shared_memory.SharedMemory(name=task['input_name'])
+    out_shm = shared_memory.SharedMemory(name=task['output_name'])
+    try:
+        shape = (task['channels'], task['length'])
+        padded = np.ndarray(shape, dtype=np.float32, buffer=in_shm.buf)
+        output = np.ndarray(shape, dtype=np.float32, buffer=out_shm.buf)
+        
+        # Kenarlarda tam overlap-add için her iki yana komşu frame'ler eklenir;
+        # durum tutan yöntemler için başa ayrıca ısınma frame'leri
+        first = max(task['first'] - task['margin'] - task['warmup'], 0)
+        last = min(task['last'] + task['margin'], task['n_frames'])
+        denoiser = create_denoiser(task['denoiser'], task['noise_spectrum'], task['reduction_strength'])
+        samples = overlap_add_frames(padded, first, last, denoiser)
+        
+        # Sadece bu parçaya ait (tüm katkıları almış) örnekler yazılır
+        core_start = task['first'] * HOP_LENGTH
+        core_end = task['last'] * HOP_LENGTH if task['last'] < task['n_frames'] else first * HOP_LENGTH + samples.shape[-1]
+        offset = first * HOP_LENGTH
+        output[:, core_start:core_end] = samples[:, core_start - offset:core_end - offset]
+    finally:
+        in_shm.close()
+        out_shm.close()
+
 class QualityMetrics:
     """Ses kalitesi metrikleri"""
     
     @staticmethod
-    def calculate_snr(original: np.ndarray, processed: np.ndarray) -> float:
-        """Signal-to-Noise Ratio hesapla (dB cinsinden)"""
-        signal_power = np.mean(original ** 2)
-        noise = original - processed
-        noise_power = np.mean(noise ** 2)
-        if noise_power == 0:
-            return 100.0
-        snr_db = 10 * np.log10(signal_power / noise_power)
-        return float(np.clip(snr_db, -20, 100))
+    def calculate_snr(original: np.ndarray, processed: np.ndarray, sample_rate: int = SAMPLE_RATE) -> float:
+        """Signal-to-Noise Ratio hesapla (dB cinsinden, frame bazlı toplamlarla)"""
+        return QualityAccumulator.from_arrays(original, processed, sample_rate).result(False)["snr_db"]
     
     @staticmethod
-    def calculate_pesq_approximation(original: np.ndarray, processed: np.ndarray) -> float:
+    def calculate_pesq_approximation(original: np.ndarray, processed: np.ndarray, sample_rate: int = SAMPLE_RATE) -> float:
         """Algılanan ses kalitesi yaklaşımı (0-5 ölçeği)"""
-        # Basitleştirilmiş PESQ benzeri skor: spektral distorsiyon + enerji farkı
+        # Basitleştirilmiş PESQ benzeri skor: frame bazlı spektral distorsiyon + enerji farkı
         # Not: Gerçek PESQ değildir; kullanıcıya karşılaştırmalı bir fikir verir.
-        min_len = min(len(original), len(processed))
-        if min_len < 16:
+        if min(len(original), len(processed)) < 16:
             return 0.5
-        original = original[:min_len]
-        processed = processed[:min_len]
-
-        fft_orig = np.abs(np.fft.rfft(original))
-        fft_proc = np.abs(np.fft.rfft(processed))
-        
-        # Spektral distorsiyon
-        spec_dist = float(np.mean(np.abs(fft_orig - fft_proc) / (fft_orig + 1e-10)))
-        
-        # Enerji korunması
-        energy_orig = np.sum(original ** 2)
-        energy_proc = np.sum(processed ** 2)
-        energy_diff = abs(energy_orig - energy_proc) / (energy_orig + 1e-10)
+        return QualityAccumulator.from_arrays(original, processed, sample_rate).result(False)["quality_score"]
+    
+    @staticmethod
+    def calculate_framewise(original: np.ndarray, processed: np.ndarray, sample_rate: int = SAMPLE_RATE) -> dict:
+        """
+        SNR ve kalite skorunu tek geçişte, segment bazında hesapla
         
-        # Kalite puanı (0-5)
-        quality = 4.5 - (spec_dist * 2.0) - (energy_diff * 1.5)
-        return float(np.clip(quality, 0.5, 5.0))
+        Returns:
+            {'snr_db', 'quality_score', 'segments': [...]} (bkz. QualityAccumulator.result)
+        """
+        return QualityAccumulator.from_arrays(original, processed, sample_rate).result()
     
     @staticmethod
-    def estimate_noise_level(audio: np.ndarray) -> float:
-        """Gürültü seviyesini tahmin et (0-1 ölçeği)"""
-        # Spectrogram üzerinde sessiz bölgeleri tespit et
-        S = librosa.stft(audio)
-        magnitude = np.abs(S)
-        
-        # Ortalama ve std deviation
-        mean_mag = np.mean(magnitude)
-        percentile_10 = np.percentile(magnitude, 10)
-        
-        # Gürültü oranı
-        noise_level = percentile_10 / (mean_mag + 1e-10)
-        return float(np.clip(noise_level, 0, 1))
+    def estimate_noise_level(audio: np.ndarray, method: str = "sampled") -> float:
+        """
+        Gürültü seviyesini tahmin et (0-1 ölçeği)
+        
+        Args:
+            audio: Mono sinyal
+            method: "sampled" (rastgele frame'ler, sınırlı hata) veya
+                "exact" (tüm spectrogram); bkz. noise_level modülü
+        """
+        # Spectrogram genliklerinin 10. yüzdeliği / ortalaması
+        return noise_level_stats(audio, method)["noise_level"]
 
 class NoiseReducer:
     """Spectral Subtraction yöntemi ile gürültü azaltma"""
     
+    # Streaming modda bir seferde okunan örnek sayısı
+    STREAM_BLOCK_SIZE = 65536
+    
     @staticmethod
-    def auto_detect_strength(audio_path: str) -> float:
-        """Ses dosyasından gürültü seviyesini tespit edip optimal güç ayarını hesapla"""
+    def auto_detect_strength(audio_path: str, method: str = "sampled") -> float:
+        """
+        Ses dosyasından gürültü seviyesini tespit edip optimal güç ayarını hesapla
+        
+        Args:
+            method: Gürültü seviyesi tahmini ("sampled" veya "exact")
+        """
         try:
-            y, sr = librosa.load(audio_path, sr=SAMPLE_RATE)
-            noise_level = QualityMetrics.estimate_noise_level(y)
+            # Sonuç önbellekte tutulur (reduce_noise metrikleri tekrar kullanır)
+            noise_level = get_analysis_cache().spectrum_stats(audio_path, method=method)["noise_level"]
             
             # Gürültü seviyesine göre güç ayarı
             if noise_level > 0.6:
@@ -86,6 +121,8 @@ class NoiseReducer:
                 logger.info(f"Hafif gürültü algılandı (seviye: {noise_level:.2f}) → Güç: 0.50")
             
             return strength
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"Otomatik güç ayarı başarısız: {e}, varsayılan 0.70 kullanılıyor")
             return 0.70
@@ -96,10 +133,17 @@ class NoiseReducer:
         output_path: str,
         noise_duration: float = 1.0,
         reduction_strength: float = 0.8,
-        get_metrics: bool = False
+        get_metrics: bool = False,
+        mode: str = "batch",
+        noise_method: str = "quiet_frames",
+        noise_profile=None,
+        denoiser: str = "spectral_subtraction"
     ) -> dict:
         """
-        Gürültüyü azalt (Spectral Subtraction)
+        Gürültüyü azalt
+        
+        Ses kendi örnekleme hızında ve kanal düzeninde işlenir; kanallar
+        vektörel olarak birlikte temizlenir ve çıkış aynı düzende yazılır.
         
         Args:
             audio_path: Giriş ses dosyası
@@ -107,47 +151,64 @@ class NoiseReducer:
             noise_duration: Gürültü profili için kullanılacak süre (saniye)
             reduction_strength: Gürültü azaltma gücü (0-1)
             get_metrics: Kalite metrikleri hesapla ve döndür
+            mode: "batch" (tüm dosya bellekte), "streaming" (sabit bellek)
+                veya "parallel" (çok çekirdek)
+            noise_method: Gürültü tahmini; "quiet_frames" (en sessiz frame'ler),
+                "minimum_statistics" veya "leading" (ilk noise_duration saniye)
+            noise_profile: Hazır NoiseProfile veya kayıt yolu (verilirse tahmin yapılmaz)
+            denoiser: Yöntem; "spectral_subtraction", "wiener" veya "mmse_stsa"
+                (bkz. denoisers.DENOISERS)
         
         Returns:
             dict: Başarı durumu ve metrikleri (opsiyonel)
         """
+        if mode == "streaming":
+            return NoiseReducer.reduce_noise_streaming(
+                audio_path, output_path, noise_duration, reduction_strength,
+                noise_method=noise_method, noise_profile=noise_profile, get_metrics=get_metrics,
+                denoiser=denoiser
+            )
+        if mode == "parallel":
+            return NoiseReducer.reduce_noise_parallel(
+                audio_path, output_path, noise_duration, reduction_strength, get_metrics,
+                noise_method=noise_method, noise_profile=noise_profile, denoiser=denoiser
+            )
+        
         try:
             logger.info(f"Gürültü azaltılıyor: {audio_path}")
             
-            # Ses yükle
-            y, sr = librosa.load(audio_path, sr=SAMPLE_RATE)
-            y_original = np.array(y, dtype=np.float32)
-            
-            # Gürültü profili çıkar (ilk noise_duration saniye)
-            noise_sample_count = int(noise_duration * sr)
-            noise_profile = y[:noise_sample_count]
+            # Ses yükle (kendi hızı ve kanallarıyla, önbellekli): (kanal, örnek)
+            y, sr = get_analysis_cache().load_native(audio_path)
+            y_original = y
+            check_cancelled()
+            report_progress(0.1)
             
-            # STFT hesapla
+            # STFT hesapla: (kanal, frekans, frame)
             D = librosa.stft(y)
-            magnitude = np.abs(D)
-            phase = np.angle(D)
+            check_cancelled()
+            report_progress(0.3)
             
-            # Gürültü spektrumu hesapla
-            noise_D = librosa.stft(noise_profile)
-            noise_magnitude = np.abs(noise_D)
-            noise_spectrum = np.median(noise_magnitude, axis=1, keepdims=True)
+            # Gürültü spektrumu (önbellekli)
+            profile = NoiseReducer._resolve_profile(
+                audio_path, noise_profile, noise_method, sr, noise_duration
+            )
             
-            # Spectral Subtraction uygula
-            reduced_magnitude = magnitude - (reduction_strength * noise_spectrum)
-            reduced_magnitude = np.maximum(reduced_magnitude, 0.01)  # Minimum seviye
+            # Seçilen yöntemi uygula (frame'ler zaman sırasıyla işlenir)
+            frame_fn = create_denoiser(denoiser, profile.spectrum, reduction_strength)
+            D_reduced = np.swapaxes(frame_fn(np.swapaxes(D, -1, -2)), -1, -2)
+            check_cancelled()
+            report_progress(0.7)
             
             # İfadeyi yeniden oluştur
-            D_reduced = reduced_magnitude * np.exp(1j * phase)
             y_reduced = librosa.istft(D_reduced)
+            check_cancelled()
+            report_progress(0.9)
             
             # Seslendir (normalize)
-            y_reduced = np.array(y_reduced, dtype=np.float32)
-            peak = float(np.max(np.abs(y_reduced))) if len(y_reduced) else 0.0
-            if peak > 0:
-                y_reduced = (y_reduced / peak) * 0.95
+            y_reduced = AudioNormalizer(target_peak=0.95).normalize_array(y_reduced)
             
             # Dosyaya kaydet
-            sf.write(output_path, y_reduced, sr)
+            sf.write(output_path, y_reduced.T, sr)
             
             logger.info(f"Gürültü azaltma başarılı: {output_path}")
 
@@ -155,27 +216,308 @@ class NoiseReducer:
                 "success": True,
                 "output_path": output_path,
                 "used_strength": float(reduction_strength),
+                "noise_profile": profile,
             }
 
             if get_metrics:
-                min_len = min(len(y_original), len(y_reduced))
-                if min_len > 0:
-                    orig = y_original[:min_len]
-                    proc = y_reduced[:min_len]
-                    result["metrics"] = {
-                        "snr_db": QualityMetrics.calculate_snr(orig, proc),
-                        "quality_score": QualityMetrics.calculate_pesq_approximation(orig, proc),
-                        "noise_level": QualityMetrics.estimate_noise_level(orig),
-                    }
-                else:
-                    result["metrics"] = {
-                        "snr_db": 0.0,
-                        "quality_score": 0.5,
-                        "noise_level": 0.0,
-                    }
+                result["metrics"] = NoiseReducer._compute_metrics(y_original, y_reduced, audio_path, sr)
 
             return result
         
+        except JobCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Gürültü azaltılırken hata: {e}")
+            return {"success": False, "error": str(e)}
+    
+    @staticmethod
+    def _resolve_profile(
+        audio_path: str,
+        noise_profile,
+        noise_method: str,
+        sr: int,
+        noise_duration: float
+    ) -> NoiseProfile:
+        """
+        Verilen profili doğrula veya önbellekten / yeniden tahmin et
+        (dosyanın kendi hızında, tüm kanallarıyla)
+        """
+        profile = NoiseProfile.resolve(noise_profile)
+        if profile is None:
+            profile = get_analysis_cache().noise_profile(
+                audio_path, noise_method, noise_duration, sr=None
+            )
+        profile.check_compatible(sr)
+        return profile
+    
+    @staticmethod
+    def estimate_noise_profile(
+        audio_path: str,
+        noise_method: str = "quiet_frames",
+        noise_duration: float = 1.0
+    ) -> NoiseProfile:
+        """
+        Ses dosyasından kaydedilebilir gürültü profili çıkar (sabit bellek)
+        
+        Returns:
+            NoiseProfile (hata durumunda None)
+        """
+        try:
+            logger.info(f"Gürültü profili çıkarılıyor ({noise_method}): {audio_path}")
+            return get_analysis_cache().noise_profile(audio_path, noise_method, noise_duration, sr=None)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Gürültü profili çıkarılamadı: {e}")
+            return None
+    
+    @staticmethod
+    def _compute_metrics(
+        y_original: np.ndarray,
+        y_reduced: np.ndarray,
+        audio_path: str = None,
+        sample_rate: int = SAMPLE_RATE
+    ) -> dict:
+        """
+        Orijinal ve işlenmiş sinyal için kalite metriklerini hesapla
+        
+        SNR ve kalite skoru frame bazlı, segment kırılımıyla hesaplanır.
+        audio_path verilirse gürültü seviyesi önbellekteki STFT
+        istatistiklerinden okunur. Çok kanallı sinyallerde kanal ortalaması
+        kullanılır.
+        """
+        if y_original.ndim > 1:
+            y_original = y_original.mean(axis=0)
+            y_reduced = y_reduced.mean(axis=0)
+        metrics = QualityMetrics.calculate_framewise(y_original, y_reduced, sample_rate)
+        return NoiseReducer._finish_metrics(metrics, y_original, audio_path)
+    
+    @staticmethod
+    def _finish_metrics(metrics: dict, y_original: np.ndarray = None, audio_path: str = None) -> dict:
+        """Kalite metriklerine gürültü seviyesini ekle"""
+        if audio_path:
+            metrics["noise_level"] = get_analysis_cache().spectrum_stats(audio_path)["noise_level"]
+        elif y_original is not None and len(y_original):
+            metrics["noise_level"] = QualityMetrics.estimate_noise_level(y_original)
+        else:
+            metrics["noise_level"] = 0.0
+        return metrics
+    
+    @staticmethod
+    def reduce_noise_streaming(
+        audio_path: str,
+        output_path: str,
+        noise_duration: float = 1.0,
+        reduction_strength: float = 0.8,
+        noise_method: str = "quiet_frames",
+        noise_profile=None,
+        get_metrics: bool = False,
+        denoiser: str = "spectral_subtraction"
+    ) -> dict:
+        """
+        Gürültüyü blok blok azalt (sabit bellek)
+        
+        Ses STREAM_BLOCK_SIZE'lık bloklarla okunur, sabit gürültü spektrumu
+        ile aynı çıkarma uygulanır ve blok sınırlarında overlap-add ile
+        birleştirilerek dosyaya yazılır. Sonuç batch mod ile aynıdır (kendi
+        örnekleme hızı ve kanal düzeni korunur). Gürültü profili
+        verilmemişse ayrı bir analiz geçişiyle tahmin edilir.
+        
+        Args:
+            audio_path: Giriş ses dosyası
+            output_path: Çıkış ses dosyası
+            noise_duration: Gürültü profili için kullanılacak süre (saniye)
+            reduction_strength: Gürültü azaltma gücü (0-1)
+            noise_method: Gürültü tahmin yöntemi (bkz. reduce_noise)
+            noise_profile: Hazır NoiseProfile veya kayıt yolu
+            get_metrics: Kalite metriklerini çıkış yazılırken blok blok hesapla
+            denoiser: Gürültü azaltma yöntemi (bkz. reduce_noise)
+        
+        Returns:
+            dict: Başarı durumu ve metrikleri (opsiyonel)
+        """
+        tmp_path = None
+        try:
+            logger.info(f"Gürültü azaltılıyor (streaming): {audio_path}")
+            
+            info = sf.info(audio_path)
+            sr = info.samplerate
+            
+            profile = NoiseReducer._resolve_profile(
+                audio_path, noise_profile, noise_method, sr, noise_duration
+            )
+            
+            # Durum tutan yöntemler bloklar boyunca aynı nesneyle devam eder
+            processor = StreamingSTFTProcessor(
+                create_denoiser(denoiser, profile.spectrum, reduction_strength)
+            )
+            
+            # 1. geçiş: işle, normalize edilmemiş ara dosyaya yaz, seviyeyi kaydet
+            TEMP_DIR.mkdir(exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='denoise_', suffix='.wav', dir=TEMP_DIR)
+            os.close(fd)
+            normalizer = AudioNormalizer(target_peak=0.95)
+            with sf.SoundFile(tmp_path, 'w', samplerate=sr, channels=info.channels, subtype='FLOAT') as tmp:
+                blocks = sf.blocks(audio_path, blocksize=NoiseReducer.STREAM_BLOCK_SIZE,
+                                   dtype='float32', always_2d=True)
+                for i, block in enumerate(blocks):
+                    check_cancelled()
+                    report_progress(i * NoiseReducer.STREAM_BLOCK_SIZE / max(info.frames, 1))
+                    # Kanallar birlikte işlenir: (kanal, örnek)
+                    out = processor.process(block.T)
+                    normalizer.update(out)
+                    tmp.write(out.T)
+                out = processor.flush()
+                normalizer.update(out)
+                tmp.write(out.T)
+            
+            # 2. geçiş: kazancı uygulayarak çıkışa yaz (metrikler aynı geçişte)
+            quality = QualityAccumulator(sr) if get_metrics else None
+            originals = sf.blocks(audio_path, blocksize=NoiseReducer.STREAM_BLOCK_SIZE,
+                                  dtype='float32', always_2d=True)
+            with sf.SoundFile(output_path, 'w', samplerate=sr, channels=info.channels) as out_file:
+                for block in sf.blocks(tmp_path, blocksize=NoiseReducer.STREAM_BLOCK_SIZE,
+                                       dtype='float32', always_2d=True):
+                    out = normalizer.apply(block)
+                    out_file.write(out)
+                    if quality is not None:
+                        # Metrikler kanal ortalaması üzerinden
+                        quality.update(next(originals).mean(axis=1), out.mean(axis=1))
+            
+            logger.info(f"Gürültü azaltma başarılı: {output_path}")
+            result: dict = {
+                "success": True,
+                "output_path": output_path,
+                "used_strength": float(reduction_strength),
+                "noise_profile": profile,
+            }
+            if quality is not None:
+                result["metrics"] = NoiseReducer._finish_metrics(quality.result(), audio_path=audio_path)
+            return result
+        
+        except JobCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Gürültü azaltılırken hata: {e}")
+            return {"success": False, "error": str(e)}
+        finally:
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+    
+    @staticmethod
+    def reduce_noise_parallel(
+        audio_path: str,
+        output_path: str,
+        noise_duration: float = 1.0,
+        reduction_strength: float = 0.8,
+        get_metrics: bool = False,
+        workers: int = MAX_WORKERS,
+        noise_method: str = "quiet_frames",
+        noise_profile=None,
+        denoiser: str = "spectral_subtraction"
+    ) -> dict:
+        """
+        Gürültüyü çok çekirdekte azalt
+        
+        Gürültü spektrumu sabitlendikten sonra frame'ler birbirinden
+        bağımsızdır: sinyal örtüşen frame aralıklarına bölünür, süreç
+        havuzunda paylaşılan bellek üzerinden işlenir ve overlap-add ile
+        birleştirilir. Sonuç batch mod ile aynıdır. Durum tutan yöntemlerde
+        (wiener, mmse_stsa) her parça WARMUP_FRAMES önceden başlatılır;
+        parça sınırlarında batch moddan çok küçük farklar olabilir.
+        
+        Args:
+            audio_path: Giriş ses dosyası
+            output_path: Çıkış ses dosyası
+            noise_duration: Gürültü profili için kullanılacak süre (saniye)
+            reduction_strength: Gürültü azaltma gücü (0-1)
+            get_metrics: Kalite metrikleri hesapla ve döndür
+            workers: Süreç sayısı
+            noise_method: Gürültü tahmin yöntemi (bkz. reduce_noise)
+            noise_profile: Hazır NoiseProfile veya kayıt yolu
+            denoiser: Gürültü azaltma yöntemi (bkz. reduce_noise)
+        
+        Returns:
+            dict: Başarı durumu ve metrikleri (opsiyonel)
+        """
+        in_shm = out_shm = None
+        try:
+            logger.info(f"Gürültü azaltılıyor (paralel, {workers} süreç): {audio_path}")
+            
+            # (kanal, örnek), dosyanın kendi hızında
+            y, sr = get_analysis_cache().load_native(audio_path)
+            channels = y.shape[0]
+            
+            profile = NoiseReducer._resolve_profile(
+                audio_path, noise_profile, noise_method, sr, noise_duration
+            )
+            noise_spectrum = profile.spectrum
+            warmup = create_denoiser(denoiser, noise_spectrum, reduction_strength).WARMUP_FRAMES
+            
+            # center=True ile aynı dolgu; giriş ve çıkış paylaşılan bellekte
+            pad = N_FFT // 2
+            length = y.shape[-1] + 2 * pad
+            n_frames = 1 + y.shape[-1] // HOP_LENGTH
+            in_shm = shared_memory.SharedMemory(create=True, size=max(channels * length * 4, 1))
+            out_shm = shared_memory.SharedMemory(create=True, size=max(channels * length * 4, 1))
+            padded = np.ndarray((channels, length), dtype=np.float32, buffer=in_shm.buf)
+            padded[:] = 0
+            padded[:, pad:pad + y.shape[-1]] = y
+            output = np.ndarray((channels, length), dtype=np.float32, buffer=out_shm.buf)
+            output[:] = 0
+            
+            chunk = max(-(-n_frames // workers), 64)
+            tasks = [
+                {
+                    'input_name': in_shm.name,
+                    'output_name': out_shm.name,
+                    'channels': channels,
+                    'length': length,
+                    'n_frames': n_frames,
+                    'first': first,
+                    'last': min(first + chunk, n_frames),
+                    'margin': N_FFT // HOP_LENGTH,
+                    'warmup': warmup,
+                    'denoiser': denoiser,
+                    'noise_spectrum': noise_spectrum,
+                    'reduction_strength': reduction_strength
+                }
+                for first in range(0, n_frames, chunk)
+            ]
+            
+            check_cancelled()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for done, _ in enumerate(pool.map(_denoise_segment, tasks), 1):
+                    report_progress(done / len(tasks))
+                    check_cancelled()
+            
+            # librosa.istft ile aynı uzunluk: dolguyu at
+            y_reduced = np.array(output[:, pad:pad + HOP_LENGTH * (n_frames - 1)], dtype=np.float32)
+            
+            # Seslendir (normalize)
+            y_reduced = AudioNormalizer(target_peak=0.95).normalize_array(y_reduced)
+            
+            sf.write(output_path, y_reduced.T, sr)
+            
+            logger.info(f"Gürültü azaltma başarılı: {output_path}")
+            
+            result: dict = {
+                "success": True,
+                "output_path": output_path,
+                "used_strength": float(reduction_strength),
+                "noise_profile": profile,
+            }
+            if get_metrics:
+                result["metrics"] = NoiseReducer._compute_metrics(y, y_reduced, audio_path, sr)
+            return result
+        
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"Gürültü azaltılırken hata: {e}")
             return {"success": False, "error": str(e)}
+        finally:
+            for shm in (in_shm, out_shm):
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
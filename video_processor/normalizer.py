@@ -0,0 +1,59 @@
+"""
+Normalizer - İki geçişli ses seviyesi normalizasyonu
+"""
+import numpy as np
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class AudioNormalizer:
+    """
+    İki geçişli tepe normalizasyonu (tüm sinyali bellekte tutmadan)
+    
+    1. geçiş: update() ile bloklar gezilip tepe değeri kaydedilir.
+    2. geçiş: apply() ile her bloğa aynı kazanç uygulanır.
+    
+    Tepe değeri dizinin şeklinden bağımsızdır; bloklar (örnek,) veya
+    (kanal, örnek) şeklinde olabilir.
+    
+    Örnek:
+        normalizer = AudioNormalizer(target_peak=0.95)
+        for block in blocks: normalizer.update(block)
+        for block in blocks: write(normalizer.apply(block))
+    """
+    
+    def __init__(self, target_peak: float = 0.95, only_if_above: float = None):
+        """
+        Args:
+            target_peak: Hedef tepe değeri
+            only_if_above: Verilirse kazanç sadece tepe bu değeri aşarsa
+                uygulanır (limiter gibi)
+        """
+        self.target_peak = target_peak
+        self.only_if_above = only_if_above
+        self.peak = 0.0
+    
+    def update(self, block: np.ndarray):
+        """1. geçiş: bloğun tepe değerini biriktir"""
+        block = np.asarray(block)
+        if block.size == 0:
+            return
+        self.peak = max(self.peak, float(np.max(np.abs(block))))
+    
+    @property
+    def gain(self) -> float:
+        """Uygulanacak kazanç (1. geçiş bittikten sonra)"""
+        if self.peak <= 0:
+            return 1.0
+        if self.only_if_above is not None and self.peak <= self.only_if_above:
+            return 1.0
+        return self.target_peak / self.peak
+    
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        """2. geçiş: kazancı bloğa uygula"""
+        return (np.asarray(block) * self.gain).astype(np.float32)
+    
+    def normalize_array(self, y: np.ndarray) -> np.ndarray:
+        """Bellekteki sinyali tek çağrıda normalize et"""
+        self.update(y)
+        return self.apply(y)
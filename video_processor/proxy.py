@@ -0,0 +1,186 @@
+"""
+Proxy - Önizleme ve analiz için düşük çözünürlüklü vekil medya
+"""
+import json
+import os
+import subprocess
+import threading
+from pathlib import Path
+from utils.logger import setup_logger
+from utils.config import PROXY_DIR, PROXY_HEIGHT, PROXY_GOP, PROXY_MIN_SOURCE_HEIGHT, PROXY_HEAVY_CODECS, PROXY_DISK_MB
+from .ffmpeg_utils import popen_ffmpeg, probe_video_stream
+from .analysis_cache import get_analysis_cache
+
+logger = setup_logger(__name__)
+
+class ProxyManager:
+    """
+    Kaynak videolar için proxy (vekil) dosyaları üretir ve yönetir
+    
+    Proxy, kısa GOP'lu (B-frame yok) düşük çözünürlüklü H.264 video ve
+    kaynaktan kopyalanmış sesten oluşur (mkv). Zaman damgaları olduğu gibi
+    korunur; proxy üzerindeki saniye cinsinden her kesim noktası kaynakta
+    da aynı ana denk gelir, bu yüzden render sırasında sadece dosya
+    kaynağa çevrilir (source_of). Proxy'ler içerik hash'iyle saklanır;
+    aynı dosya tekrar açıldığında yeniden üretilmez.
+    
+    Örnek:
+        proxies = get_proxy_manager()
+        preview = proxies.get(video) or video
+        ...
+        VideoTrimmer.trim(preview, "cikis.mp4", 10, 20)  # Kaynaktan kesilir
+    """
+    
+    # İptal kontrolü aralığı (saniye)
+    POLL_INTERVAL = 0.2
+    
+    def __init__(self, proxy_dir: str = PROXY_DIR, height: int = PROXY_HEIGHT, disk_limit_mb: float = PROXY_DISK_MB):
+        self.proxy_dir = Path(proxy_dir)
+        self.height = int(height)
+        self.disk_limit = int(disk_limit_mb * 1024 * 1024)
+        self._sources = {}
+        self._lock = threading.Lock()
+    
+    def proxy_path(self, source: str) -> Path:
+        """Kaynağın proxy dosyasının yolu (içerik hash'i + yükseklik)"""
+        key = get_analysis_cache().content_hash(source)
+        return self.proxy_dir / f"{key}_{self.height}p.mkv"
+    
+    def needs_proxy(self, source: str) -> bool:
+        """Kaynak önizleme için ağır mı (yüksek çözünürlük veya ağır codec)"""
+        try:
+            stream = probe_video_stream(source)
+        except Exception as e:
+            logger.debug(f"Video akışı okunamadı, proxy gerekmiyor sayılıyor: {e}")
+            return False
+        if not stream:
+            return False
+        height = int(stream.get('height') or 0)
+        heavy_codec = stream.get('codec_name') in PROXY_HEAVY_CODECS
+        return height > PROXY_MIN_SOURCE_HEIGHT or (heavy_codec and height > self.height)
+    
+    def get(self, source: str) -> str:
+        """Hazır proxy'nin yolu (yoksa None)"""
+        path = self.proxy_path(source)
+        if not path.exists():
+            return None
+        os.utime(path)  # LRU sırası için erişim zamanı
+        self._register(path, source)
+        return str(path)
+    
+    def create(self, source: str, cancelled=None) -> str:
+        """
+        Proxy'yi üret (varsa mevcut olanı döndür)
+        
+        Args:
+            source: Kaynak video
+            cancelled: Parametresiz, True dönerse ffmpeg'i durduran fonksiyon
+        
+        Returns:
+            Proxy dosyasının yolu; iptal edilirse veya hata olursa None
+        """
+        existing = self.get(source)
+        if existing:
+            return existing
+        
+        path = self.proxy_path(source)
+        tmp_path = path.with_suffix('.tmp.mkv')
+        try:
+            self.proxy_dir.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Proxy oluşturuluyor ({self.height}p): {Path(source).name}")
+            
+            process = popen_ffmpeg([
+                '-i', source,
+                '-map', '0:v:0', '-map', '0:a:0?',
+                '-vf', f'scale=-2:min({self.height}\\,ih)',
+                '-c:v', 'libx264', '-preset', 'veryfast', '-tune', 'fastdecode', '-crf', 26,
+                '-g', PROXY_GOP, '-bf', 0, '-pix_fmt', 'yuv420p',
+                '-fps_mode', 'passthrough',  # Kare zamanları kaynakla aynı kalsın (VFR)
+                '-c:a', 'copy',
+                '-y', tmp_path
+            ])
+            while True:
+                try:
+                    returncode = process.wait(timeout=self.POLL_INTERVAL)
+                    break
+                except subprocess.TimeoutExpired:
+                    if cancelled is not None and cancelled():
+                        process.kill()
+                        process.wait()
+                        process.stdout.close()
+                        logger.info(f"Proxy oluşturma iptal edildi: {Path(source).name}")
+                        return None
+            process.stdout.close()
+            
+            if returncode != 0:
+                raise RuntimeError(f"ffmpeg hata kodu {returncode}")
+            
+            os.replace(tmp_path, path)
+            path.with_suffix('.json').write_text(json.dumps({'source': str(Path(source).resolve())}), encoding='utf-8')
+            self._register(path, source)
+            self._evict()
+            logger.info(f"Proxy hazır: {path.name}")
+            return str(path)
+        
+        except Exception as e:
+            logger.error(f"Proxy oluşturulamadı: {e}")
+            return None
+        
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    
+    def source_of(self, path: str) -> str:
+        """Proxy ise kaynak dosyayı, değilse yolu olduğu gibi döndür"""
+        resolved = str(Path(path).resolve())
+        with self._lock:
+            if resolved in self._sources:
+                return self._sources[resolved]
+        
+        sidecar = Path(resolved).with_suffix('.json')
+        if Path(resolved).parent == self.proxy_dir.resolve() and sidecar.exists():
+            try:
+                source = json.loads(sidecar.read_text(encoding='utf-8'))['source']
+            except Exception as e:
+                logger.warning(f"Proxy kaynak bilgisi okunamadı: {e}")
+                return path
+            self._register(resolved, source)
+            return source
+        return path
+    
+    def _register(self, path, source: str):
+        with self._lock:
+            self._sources[str(Path(path).resolve())] = str(source)
+    
+    def _evict(self):
+        """Disk sınırı aşıldıysa en eski kullanılan proxy'leri sil"""
+        entries = []
+        for path in self.proxy_dir.glob("*p.mkv"):
+            if path.name.endswith('.tmp.mkv'):
+                continue  # Üretilmekte olan proxy
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except FileNotFoundError:
+                continue
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries)[:-1]:  # En yenisi (yeni üretilen) silinmez
+            if total <= self.disk_limit:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue  # Başka süreçte açık (Windows)
+            path.with_suffix('.json').unlink(missing_ok=True)
+            total -= size
+            logger.debug(f"Proxy silindi: {path.name}")
+
+
+_default_manager = None
+
+def get_proxy_manager() -> ProxyManager:
+    """Uygulama genelinde paylaşılan proxy yöneticisi"""
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = ProxyManager()
+    return _default_manager
@@ -0,0 +1,181 @@
+"""
+Quality - Frame bazlı, sabit bellekli ses kalitesi metrikleri
+"""
+import numpy as np
+from scipy.signal import get_window
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class QualityAccumulator:
+    """
+    Orijinal / işlenmiş sinyal çiftinden blok blok SNR ve kalite skoru
+    
+    Sinyaller FRAME_SIZE'lık (örtüşmeyen, hann pencereli) frame'lere
+    bölünür; enerji, çapraz enerji ve spektrum toplamları segment başına
+    biriktirilir. Bellek kullanımı sinyal uzunluğundan bağımsızdır
+    (segment başına birkaç sayı).
+    
+    İşlenmiş sinyal karşılaştırmadan önce orijinalin seviyesine çekilir:
+    en küçük kareler kazancı g = Σ o·p / Σ p² segment skorlarında o
+    segmentin, genel skorda tüm dosyanın toplamlarından hesaplanır.
+    Böylece çıkıştaki tepe normalizasyonu metrikleri etkilemez.
+    
+    Örnek:
+        quality = QualityAccumulator(sample_rate=16000)
+        for orig, proc in zip(orig_blocks, proc_blocks): quality.update(orig, proc)
+        result = quality.result()
+    """
+    
+    FRAME_SIZE = 2048
+    SEGMENT_SECONDS = 5.0
+    
+    # Bu enerjinin altındaki frame'ler spektral distorsiyona katılmaz (sessizlik)
+    SILENCE_ENERGY = 1e-8
+    
+    def __init__(self, sample_rate: int, segment_seconds: float = SEGMENT_SECONDS):
+        self.sample_rate = sample_rate
+        # Segment sınırları frame sınırlarına denk gelir
+        self.segment_size = max(round(segment_seconds * sample_rate / self.FRAME_SIZE), 1) * self.FRAME_SIZE
+        self.window = get_window('hann', self.FRAME_SIZE, fftbins=True)
+        
+        self._carry_orig = np.zeros(0, dtype=np.float64)
+        self._carry_proc = np.zeros(0, dtype=np.float64)
+        self._position = 0  # İşlenen frame'lerin toplam örnek sayısı
+        self._segments = {}
+    
+    def update(self, original: np.ndarray, processed: np.ndarray):
+        """Yeni blok çiftini işle (uzunluklar farklıysa kısa olana göre kesilir)"""
+        length = min(len(original), len(processed))
+        orig = np.concatenate([self._carry_orig, np.asarray(original[:length], dtype=np.float64)])
+        proc = np.concatenate([self._carry_proc, np.asarray(processed[:length], dtype=np.float64)])
+        
+        usable = len(orig) - len(orig) % self.FRAME_SIZE
+        if usable:
+            self._accumulate(
+                orig[:usable].reshape(-1, self.FRAME_SIZE),
+                proc[:usable].reshape(-1, self.FRAME_SIZE)
+            )
+        self._carry_orig = orig[usable:]
+        self._carry_proc = proc[usable:]
+    
+    def _accumulate(self, orig_frames: np.ndarray, proc_frames: np.ndarray):
+        """Frame istatistiklerini ait oldukları segmente ekle"""
+        signal = np.sum(orig_frames ** 2, axis=1)
+        processed = np.sum(proc_frames ** 2, axis=1)
+        cross = np.sum(orig_frames * proc_frames, axis=1)
+        
+        # Genlik spektrumu toplamları (kazanç sonradan uygulanır:
+        # Σ(|Xo| - g|Xp|)² = Σ|Xo|² - 2g Σ|Xo||Xp| + g² Σ|Xp|²)
+        spec_orig = np.abs(np.fft.rfft(orig_frames * self.window, axis=1))
+        spec_proc = np.abs(np.fft.rfft(proc_frames * self.window, axis=1))
+        voiced = signal > self.SILENCE_ENERGY
+        spec_signal = np.sum(spec_orig ** 2, axis=1)
+        spec_processed = np.sum(spec_proc ** 2, axis=1)
+        spec_cross = np.sum(spec_orig * spec_proc, axis=1)
+        
+        # Segment başına toplamlar: sinyal, işlenmiş ve çapraz enerji,
+        # sesli frame'lerin spektrum toplamları (aynı sırayla), örnek sayısı
+        starts = self._position + np.arange(len(orig_frames)) * self.FRAME_SIZE
+        indices = starts // self.segment_size
+        for index in np.unique(indices):
+            mask = indices == index
+            segment = self._segments.setdefault(int(index), np.zeros(7))
+            segment += (
+                signal[mask].sum(),
+                processed[mask].sum(),
+                cross[mask].sum(),
+                spec_signal[mask & voiced].sum(),
+                spec_processed[mask & voiced].sum(),
+                spec_cross[mask & voiced].sum(),
+                np.sum(mask) * self.FRAME_SIZE
+            )
+        self._position += len(orig_frames) * self.FRAME_SIZE
+    
+    def _flush(self):
+        """Yarım kalan son frame'i sıfır dolguyla işle"""
+        if len(self._carry_orig) == 0:
+            return
+        
+        length = len(self._carry_orig)
+        orig = np.zeros(self.FRAME_SIZE)
+        proc = np.zeros(self.FRAME_SIZE)
+        orig[:length] = self._carry_orig
+        proc[:length] = self._carry_proc
+        self._carry_orig = self._carry_orig[:0]
+        self._carry_proc = self._carry_proc[:0]
+        
+        position = self._position
+        self._accumulate(orig[np.newaxis], proc[np.newaxis])
+        # Örnek sayısı gerçek uzunluğa göre düzeltilir
+        self._segments[position // self.segment_size][6] -= self.FRAME_SIZE - length
+        self._position = position + length
+    
+    @staticmethod
+    def _scores(totals: np.ndarray) -> dict:
+        """Toplamlardan SNR (dB) ve kalite skoru (0-5), seviye eşlemesiyle"""
+        signal, processed, cross, spec_signal, spec_processed, spec_cross, _ = totals
+        
+        # En küçük kareler kazancı: Σ(o - g·p)² en küçük
+        gain = max(cross / processed, 0.0) if processed > 0 else 0.0
+        noise = max(signal - 2 * gain * cross + gain ** 2 * processed, 0.0)
+        if noise == 0:
+            snr_db = 100.0
+        elif signal == 0:
+            snr_db = -20.0
+        else:
+            snr_db = float(np.clip(10 * np.log10(signal / noise), -20, 100))
+        
+        # Basitleştirilmiş PESQ benzeri skor: göreli spektral distorsiyon
+        # (sesli frame'ler) + enerji farkı, ikisi de seviye eşlemesinden sonra
+        spec_error = max(spec_signal - 2 * gain * spec_cross + gain ** 2 * spec_processed, 0.0)
+        spec_dist = np.sqrt(spec_error / spec_signal) if spec_signal > 0 else 0.0
+        energy_diff = abs(signal - gain ** 2 * processed) / (signal + 1e-10)
+        quality = 4.5 - (spec_dist * 2.0) - (energy_diff * 1.5)
+        return {
+            "snr_db": snr_db,
+            "quality_score": float(np.clip(quality, 0.5, 5.0)),
+        }
+    
+    def result(self, include_segments: bool = True) -> dict:
+        """
+        Biriken metrikleri döndür
+        
+        Returns:
+            {'snr_db', 'quality_score', 'segments': [{'start', 'end',
+             'snr_db', 'quality_score'}, ...]} (süreler saniye)
+        """
+        self._flush()
+        if not self._segments:
+            return {"snr_db": 0.0, "quality_score": 0.5, "segments": []}
+        
+        result = self._scores(sum(self._segments.values()))
+        if include_segments:
+            segments = []
+            for index in sorted(self._segments):
+                totals = self._segments[index]
+                start = index * self.segment_size
+                segments.append({
+                    "start": start / self.sample_rate,
+                    "end": float(start + totals[6]) / self.sample_rate,
+                    **self._scores(totals)
+                })
+            result["segments"] = segments
+        return result
+    
+    @classmethod
+    def from_arrays(
+        cls,
+        original: np.ndarray,
+        processed: np.ndarray,
+        sample_rate: int,
+        block_size: int = 65536,
+        segment_seconds: float = SEGMENT_SECONDS
+    ) -> "QualityAccumulator":
+        """Bellekteki sinyalleri blok blok işle (tam uzunlukta ara dizi oluşturmadan)"""
+        quality = cls(sample_rate, segment_seconds)
+        length = min(len(original), len(processed))
+        for start in range(0, length, block_size):
+            end = min(start + block_size, length)
+            quality.update(original[start:end], processed[start:end])
+        return quality
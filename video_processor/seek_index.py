@@ -0,0 +1,216 @@
+"""
+Seek Index - Kare doğruluğunda hızlı video erişimi için keyframe dizini
+"""
+import cv2
+import numpy as np
+from utils.logger import setup_logger
+from .ffmpeg_utils import probe_packet_times
+from .analysis_cache import get_analysis_cache
+
+logger = setup_logger(__name__)
+
+class SeekIndex:
+    """
+    Video karelerinin sunum zamanları ve keyframe konumları
+    
+    ffprobe paket taramasıyla (decode yapılmadan) bir kez çıkarılır ve
+    analiz önbelleğinde saklanır. Kare numaraları sunum sırasındadır;
+    değişken kare hızlı (VFR) dosyalarda da her karenin gerçek zamanı
+    bilinir.
+    """
+    
+    def __init__(self, times: np.ndarray, keyframes: np.ndarray):
+        """
+        Args:
+            times: Kare başına sunum zamanı (saniye, ilk kareye göre, sıralı)
+            keyframes: Keyframe'lerin kare numaraları (sıralı, 0 dahil)
+        """
+        self.times = np.asarray(times, dtype=np.float64)
+        self.keyframes = np.asarray(keyframes, dtype=np.int64)
+    
+    @classmethod
+    def build(cls, video_path: str) -> "SeekIndex":
+        """
+        Paket taramasıyla dizini çıkar
+        
+        Raises:
+            ValueError: Video akışı / zaman damgası bulunamazsa
+        """
+        packets = probe_packet_times(video_path)
+        if not packets:
+            raise ValueError(f"Video paketi bulunamadı: {video_path}")
+        pts, flags = zip(*packets)
+        
+        # Paketler çözme sırasında gelir (B-frame); sunum sırasına diz.
+        # Zamanlar ilk kareye göredir (OpenCV konumları da ilk kareden sayılır)
+        pts = np.asarray(pts, dtype=np.float64)
+        order = np.argsort(pts, kind='stable')
+        times = pts[order] - pts[order[0]]
+        keyframes = np.union1d([0], np.flatnonzero(np.asarray(flags, dtype=bool)[order]))
+        logger.debug(f"Seek dizini: {len(times)} kare, {len(keyframes)} keyframe ({video_path})")
+        return cls(times, keyframes)
+    
+    @classmethod
+    def load(cls, video_path: str) -> "SeekIndex":
+        """Dizini önbellekten yükle (yoksa çıkarıp sakla)"""
+        def compute():
+            index = cls.build(video_path)
+            return {'times': index.times, 'keyframes': index.keyframes}
+        
+        value = get_analysis_cache().get_or_compute('seek_index', video_path, compute)
+        return cls(value['times'], value['keyframes'])
+    
+    @property
+    def frame_count(self) -> int:
+        return len(self.times)
+    
+    @property
+    def duration(self) -> float:
+        """Son karenin bitişi (saniye); son kare süresi ortanca kare aralığı sayılır"""
+        if len(self.times) < 2:
+            return float(self.times[-1]) if len(self.times) else 0.0
+        return float(self.times[-1] + np.median(np.diff(self.times)))
+    
+    def time_of(self, frame_number: int) -> float:
+        """Karenin sunum zamanı (saniye)"""
+        return float(self.times[int(np.clip(frame_number, 0, len(self.times) - 1))])
+    
+    def frame_at(self, seconds: float, tolerance: float = 1e-3) -> int:
+        """Verilen anda ekranda olan kare"""
+        return max(int(np.searchsorted(self.times, seconds + tolerance, side='right')) - 1, 0)
+    
+    def keyframe_before(self, frame_number: int) -> int:
+        """Kareden önceki (veya kendisi) en yakın keyframe"""
+        position = np.searchsorted(self.keyframes, frame_number, side='right') - 1
+        return int(self.keyframes[max(position, 0)])
+
+
+class FrameReader:
+    """
+    Dizin üzerinden kare doğruluğunda rastgele kare okuma (OpenCV)
+    
+    Hedef kare, çözücünün bulunduğu konumdan ileride ve aynı GOP
+    içindeyse arama yapılmadan sırayla çözülür; değilse en yakın önceki
+    keyframe'e gidilir. OpenCV'nin araması yaklaşık kabul edilir: gidilen
+    yer ilk karenin zaman damgasıyla dizinden bulunur, böylece VFR
+    dosyalarda da doğru kare döner. Gecikme dosyadaki konuma değil GOP
+    uzunluğuna bağlıdır.
+    
+    Dizin çıkarılamazsa (ffprobe yok vb.) OpenCV'nin kare araması kullanılır.
+    """
+    
+    # Hedefin gerisine düşülürse geriye doğru denenecek keyframe sayısı
+    MAX_SEEK_ATTEMPTS = 4
+    
+    def __init__(self, video_path: str, cap: cv2.VideoCapture = None):
+        self.video_path = str(video_path)
+        self.cap = cap if cap is not None else cv2.VideoCapture(self.video_path)
+        self._index = None
+        self._index_failed = False
+        self._current = None  # Son çözülen (grab) karenin numarası
+    
+    @property
+    def index(self) -> SeekIndex:
+        """Seek dizini (ilk ihtiyaçta yüklenir; çıkarılamazsa None)"""
+        if self._index is None and not self._index_failed:
+            try:
+                self._index = SeekIndex.load(self.video_path)
+            except Exception as e:
+                logger.warning(f"Seek dizini çıkarılamadı, OpenCV araması kullanılacak: {e}")
+                self._index_failed = True
+        return self._index
+    
+    @property
+    def fps(self) -> float:
+        return self.cap.get(cv2.CAP_PROP_FPS)
+    
+    @property
+    def frame_count(self) -> int:
+        if self.index is not None:
+            return self.index.frame_count
+        return int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    
+    @property
+    def duration(self) -> float:
+        """Video süresi (saniye)"""
+        if self.index is not None:
+            return self.index.duration
+        fps = self.fps
+        return self.frame_count / fps if fps > 0 else 0.0
+    
+    def time_of(self, frame_number: int) -> float:
+        """
+        Karenin zamanı (saniye); frame_count (son karenin sonrası) için
+        video süresi döner
+        """
+        index = self.index
+        if index is not None:
+            return index.duration if frame_number >= index.frame_count else index.time_of(frame_number)
+        fps = self.fps
+        return frame_number / fps if fps > 0 else 0.0
+    
+    def frame_at(self, seconds: float) -> int:
+        """Verilen andaki kare numarası (süre ve sonrası için frame_count)"""
+        index = self.index
+        if index is not None:
+            return index.frame_count if seconds >= index.duration - 1e-3 else index.frame_at(seconds)
+        return int(seconds * self.fps)
+    
+    def read(self, frame_number: int):
+        """Kareyi BGR dizi olarak oku (okunamazsa None)"""
+        index = self.index
+        if index is None:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+            ret, frame = self.cap.read()
+            return frame if ret else None
+        
+        target = int(np.clip(frame_number, 0, index.frame_count - 1))
+        keyframe = index.keyframe_before(target)
+        current = self._current
+        if current is None or current > target or current < keyframe - 1:
+            if not self._seek(keyframe, target):
+                return None
+        
+        while self._current < target:
+            if not self.cap.grab():
+                self._current = None
+                return None
+            self._current += 1
+        
+        ret, frame = self.cap.retrieve()
+        return frame if ret else None
+    
+    def _seek(self, keyframe: int, target: int) -> bool:
+        """
+        Çözücüyü hedefe (veya öncesine) götür ve gerçek konumu zaman
+        damgasından bul
+        
+        Önce doğrudan hedef zamanına aranır (OpenCV en yakın önceki
+        keyframe'den çözer); hedef aşılırsa (VFR) önceki keyframe'ler denenir.
+        """
+        keyframes = self.index.keyframes
+        position = int(np.searchsorted(keyframes, keyframe))
+        # Hedef için bir önceki karenin zamanı verilir (yuvarlamayla aşmasın)
+        starts = [target - 1] + [int(keyframes[max(position - i, 0)]) for i in range(self.MAX_SEEK_ATTEMPTS)]
+        for start in starts:
+            if start <= 0:
+                break
+            self.cap.set(cv2.CAP_PROP_POS_MSEC, self.index.time_of(start) * 1000)
+            if not self.cap.grab():
+                continue
+            current = self.index.frame_at(self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000)
+            if current <= target:
+                self._current = current
+                return True
+        
+        # Baştan sıralı çözme her zaman doğrudur
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        if not self.cap.grab():
+            self._current = None
+            return False
+        self._current = 0
+        return True
+    
+    def close(self):
+        if self.cap:
+            self.cap.release()
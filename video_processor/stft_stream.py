@@ -0,0 +1,240 @@
+"""
+STFT Stream - Blok blok STFT / overlap-add (sabit bellek)
+
+librosa.stft / librosa.istft varsayılanlarıyla (n_fft=2048, hop=512,
+hann pencere, center=True, sıfır dolgu) aynı sonucu üretir. Çok kanallı
+sinyaller (kanal, örnek) şeklinde verilir; tüm kanallar birlikte
+(vektörel) işlenir.
+"""
+import numpy as np
+from scipy.signal import get_window
+
+N_FFT = 2048
+HOP_LENGTH = 512
+
+
+def stft(y: np.ndarray, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH) -> np.ndarray:
+    """
+    Tek seferlik STFT (librosa.stft ile aynı çerçeveleme)
+
+    Args:
+        y: (örnek,) veya (kanal, örnek) şeklinde sinyal
+
+    Returns:
+        (frekans, frame) veya (kanal, frekans, frame) şeklinde kompleks matris
+    """
+    window = get_window('hann', n_fft, fftbins=True).astype(np.float32)
+    y = np.asarray(y, dtype=np.float32)
+    padding = [(0, 0)] * (y.ndim - 1)
+    padded = np.pad(y, padding + [(n_fft // 2, n_fft // 2)])
+    if padded.shape[-1] < n_fft:
+        padded = np.pad(padded, padding + [(0, n_fft - padded.shape[-1])])
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft, axis=-1)[..., ::hop_length, :]
+    return np.swapaxes(np.fft.rfft(frames * window, axis=-1), -1, -2)
+
+
+def iter_stft_frames(blocks, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH):
+    """
+    Blok akışından STFT frame'leri üret (analiz için, sabit bellek)
+
+    Frame'ler stft() ile aynıdır (center=True); bloklar arasındaki
+    örtüşme taşınır.
+
+    Args:
+        blocks: (örnek,) veya (kanal, örnek) şeklinde float blok iterable'ı
+
+    Yields:
+        (frame, frekans) veya (kanal, frame, frekans) şeklinde kompleks
+        STFT frame'leri
+    """
+    window = get_window('hann', n_fft, fftbins=True).astype(np.float32)
+    buffer = None
+    total = 0
+    for block in blocks:
+        block = np.asarray(block, dtype=np.float32)
+        if buffer is None:
+            buffer = np.zeros(block.shape[:-1] + (n_fft // 2,), dtype=np.float32)
+        total += block.shape[-1]
+        buffer = np.concatenate([buffer, block], axis=-1)
+        if buffer.shape[-1] < n_fft:
+            continue
+        count = 1 + (buffer.shape[-1] - n_fft) // hop_length
+        frames = np.lib.stride_tricks.sliding_window_view(buffer, n_fft, axis=-1)[..., ::hop_length, :][..., :count, :]
+        yield np.fft.rfft(frames * window, axis=-1)
+        buffer = buffer[..., count * hop_length:]
+
+    # Son dolgu; toplam frame sayısı 1 + len(y) // hop_length olur
+    if not total:
+        return
+    buffer = np.concatenate([buffer, np.zeros(buffer.shape[:-1] + (n_fft // 2,), dtype=np.float32)], axis=-1)
+    if buffer.shape[-1] >= n_fft:
+        count = 1 + (buffer.shape[-1] - n_fft) // hop_length
+        frames = np.lib.stride_tricks.sliding_window_view(buffer, n_fft, axis=-1)[..., ::hop_length, :][..., :count, :]
+        yield np.fft.rfft(frames * window, axis=-1)
+
+
+def overlap_add_frames(
+    padded: np.ndarray,
+    first: int,
+    last: int,
+    frame_fn,
+    n_fft: int = N_FFT,
+    hop_length: int = HOP_LENGTH
+) -> np.ndarray:
+    """
+    Dolgulu sinyalin [first, last) frame aralığını işle ve geri birleştir
+
+    Args:
+        padded: Başına/sonuna n_fft // 2 sıfır eklenmiş sinyal
+            ((örnek,) veya (kanal, örnek))
+        first: İlk frame indisi
+        last: Son frame indisi (hariç)
+        frame_fn: (..., frame, frekans) kompleks frame'leri işleyen fonksiyon
+
+    Returns:
+        padded[..., first * hop_length : (last - 1) * hop_length + n_fft]
+        aralığına karşılık gelen, pencere karesi toplamıyla normalize
+        edilmiş örnekler (kenarlarda eksik katkı olabilir)
+    """
+    window = get_window('hann', n_fft, fftbins=True).astype(np.float32)
+    start = first * hop_length
+    span = (last - first - 1) * hop_length + n_fft
+    frames = np.lib.stride_tricks.sliding_window_view(
+        padded[..., start:start + span], n_fft, axis=-1
+    )[..., ::hop_length, :]
+    y_frames = np.fft.irfft(frame_fn(np.fft.rfft(frames * window, axis=-1)), n=n_fft, axis=-1) * window
+
+    ola = np.zeros(padded.shape[:-1] + (span,), dtype=np.float64)
+    wss = np.zeros(span, dtype=np.float64)
+    window_sq = window ** 2
+    for i in range(y_frames.shape[-2]):
+        offset = i * hop_length
+        ola[..., offset:offset + n_fft] += y_frames[..., i, :]
+        wss[offset:offset + n_fft] += window_sq
+    return StreamingSTFTProcessor._normalize(ola, wss).astype(np.float32)
+
+
+class StreamingSTFTProcessor:
+    """
+    Blok blok STFT -> frame işlemi -> ISTFT (overlap-add)
+
+    frame_fn, (..., frame, frekans) şeklinde kompleks STFT frame'lerini alır
+    ve aynı şekilde işlenmiş frame'ler döndürür. Bloklar (örnek,) veya
+    (kanal, örnek) şeklindedir; kanal sayısı ilk bloktan belirlenir.
+    Bellek kullanımı giriş uzunluğundan bağımsızdır (birkaç n_fft + blok boyu).
+    """
+
+    def __init__(self, frame_fn, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH):
+        self.frame_fn = frame_fn
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.window = get_window('hann', n_fft, fftbins=True).astype(np.float32)
+        self._window_sq = self.window ** 2
+
+        # Tamponlar ilk blokta kanal düzenine göre oluşturulur
+        self._input = None
+        self._ola = None
+        self._wss = np.zeros(n_fft, dtype=np.float64)
+        self._trim = n_fft // 2  # çıkışın başından atılacak dolgu
+        self._frames = 0
+        self._samples_in = 0
+        self._samples_out = 0
+
+    def _init_buffers(self, leading_shape: tuple):
+        """center=True: başa n_fft // 2 sıfır dolgu"""
+        self._input = np.zeros(leading_shape + (self.n_fft // 2,), dtype=np.float32)
+        self._ola = np.zeros(leading_shape + (self.n_fft,), dtype=np.float64)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        Yeni giriş bloğunu işle
+
+        Returns:
+            Kesinleşen çıkış örnekleri (boş olabilir)
+        """
+        block = np.asarray(block, dtype=np.float32)
+        if self._input is None:
+            self._init_buffers(block.shape[:-1])
+        self._samples_in += block.shape[-1]
+        self._input = np.concatenate([self._input, block], axis=-1)
+        return self._emit(self._run_frames())
+
+    def flush(self) -> np.ndarray:
+        """
+        Girişin bittiğini bildir, kalan örnekleri döndür
+
+        Toplam çıkış uzunluğu librosa.istft ile aynıdır:
+        hop_length * (len(y) // hop_length)
+        """
+        if self._input is None:
+            self._init_buffers(())
+
+        # center=True: sona n_fft // 2 sıfır dolgu
+        padding = np.zeros(self._input.shape[:-1] + (self.n_fft // 2,), dtype=np.float32)
+        self._input = np.concatenate([self._input, padding], axis=-1)
+        out = [self._emit(self._run_frames())]
+
+        total = self.hop_length * (self._samples_in // self.hop_length)
+        remaining = max(total - self._samples_out, 0)
+        tail = self._normalize(
+            self._ola[..., :self._trim + remaining],
+            self._wss[:self._trim + remaining]
+        )
+        out.append(tail[..., self._trim:])
+        self._samples_out += out[-1].shape[-1]
+        self._trim = 0
+        return np.concatenate(out, axis=-1).astype(np.float32)
+
+    def _run_frames(self) -> int:
+        """Tampondaki tüm tam frame'leri işle, kesinleşen örnek sayısını döndür"""
+        available = self._input.shape[-1]
+        if available < self.n_fft:
+            return 0
+
+        count = 1 + (available - self.n_fft) // self.hop_length
+        frames = np.lib.stride_tricks.sliding_window_view(
+            self._input, self.n_fft, axis=-1
+        )[..., ::self.hop_length, :][..., :count, :]
+        spectrum = self.frame_fn(np.fft.rfft(frames * self.window, axis=-1))
+        y_frames = np.fft.irfft(spectrum, n=self.n_fft, axis=-1) * self.window
+
+        # Overlap-add (çıkış tamponu yeni frame'leri kapsayacak kadar büyütülür)
+        span = (count - 1) * self.hop_length + self.n_fft
+        if self._ola.shape[-1] < span:
+            grow = span - self._ola.shape[-1]
+            self._ola = np.concatenate([self._ola, np.zeros(self._ola.shape[:-1] + (grow,))], axis=-1)
+            self._wss = np.concatenate([self._wss, np.zeros(grow)])
+        for i in range(count):
+            offset = i * self.hop_length
+            self._ola[..., offset:offset + self.n_fft] += y_frames[..., i, :]
+            self._wss[offset:offset + self.n_fft] += self._window_sq
+
+        consumed = count * self.hop_length
+        self._input = self._input[..., consumed:]
+        self._frames += count
+        return consumed
+
+    def _emit(self, ready: int) -> np.ndarray:
+        """Kesinleşen ilk `ready` örneği normalize edip çıkar"""
+        if ready == 0:
+            return np.zeros(self._ola.shape[:-1] + (0,), dtype=np.float32)
+
+        out = self._normalize(self._ola[..., :ready], self._wss[:ready])
+        self._ola = np.concatenate([self._ola[..., ready:], np.zeros(self._ola.shape[:-1] + (ready,))], axis=-1)
+        self._wss = np.concatenate([self._wss[ready:], np.zeros(ready)])
+
+        if self._trim:
+            dropped = min(self._trim, out.shape[-1])
+            out = out[..., dropped:]
+            self._trim -= dropped
+
+        self._samples_out += out.shape[-1]
+        return out.astype(np.float32)
+
+    @staticmethod
+    def _normalize(ola: np.ndarray, wss: np.ndarray) -> np.ndarray:
+        """Pencere karesi toplamına böl (librosa.istft ile aynı)"""
+        out = ola.copy()
+        nonzero = wss > np.finfo(np.float32).tiny
+        out[..., nonzero] /= wss[nonzero]
+        return out
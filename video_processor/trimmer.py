@@ -2,20 +2,65 @@
 Video Trimmer - Video kırpma
 """
 from pathlib import Path
+import shutil
 import subprocess
+import tempfile
 from utils.logger import setup_logger
+from utils.config import TEMP_DIR, SMART_CUT_ENABLED, INACCURATE_SEEK_FORMATS
+from utils.job_context import JobCancelled, progress_span
+from .ffmpeg_utils import run_ffmpeg, probe_video_stream, probe_packet_times, probe_start_time
+from .proxy import get_proxy_manager
 
 logger = setup_logger(__name__)
 
 class VideoTrimmer:
     """Video kırpma işlemleri"""
     
+    # Smart-cut'ta kısmi GOP'ları yeniden kodlamak için kaynak codec -> encoder
+    SMART_CUT_ENCODERS = {
+        'h264': 'libx264',
+        'hevc': 'libx265'
+    }
+    
+    # Stream copy ile birleştirme için Annex-B bitstream filtreleri
+    ANNEXB_FILTERS = {
+        'h264': 'h264_mp4toannexb',
+        'hevc': 'hevc_mp4toannexb'
+    }
+    
+    # ffprobe profil adı -> encoder -profile:v değeri (listede yoksa smart-cut yapılmaz)
+    SMART_CUT_PROFILES = {
+        'h264': {
+            'Constrained Baseline': 'baseline',
+            'Baseline': 'baseline',
+            'Main': 'main',
+            'High': 'high',
+            'High 10': 'high10',
+            'High 4:2:2': 'high422',
+            'High 4:4:4 Predictive': 'high444'
+        },
+        'hevc': {
+            'Main': 'main',
+            'Main 10': 'main10'
+        }
+    }
+    
+    # Yeniden kodlanan uçların kaynakla aynı olması gereken akış özellikleri;
+    # farklıysa birleşim noktaları birçok oynatıcıda bozuk çözülür
+    SMART_CUT_MATCH_FIELDS = ('profile', 'level', 'refs', 'pix_fmt', 'width', 'height')
+    
+    # Paket taramasında aralık sonundan sonra okunan ek süre (saniye):
+    # ffprobe taramayı çözme sırasında keser, B-frame'li akışta aralığın
+    # son karelerinin paketleri sondan sonraki paketlerden sonra gelir
+    PACKET_SCAN_MARGIN = 1.0
+    
     @staticmethod
     def trim(
         input_video: str,
         output_video: str,
         start_time: float,
-        end_time: float
+        end_time: float,
+        smart_cut: bool = SMART_CUT_ENABLED
     ) -> bool:
         """
         Videoyu kırpla
@@ -25,30 +70,30 @@ class VideoTrimmer:
             output_video: Çıkış video dosyası
             start_time: Başlangıç zamanı (saniye)
             end_time: Bitiş zamanı (saniye)
+            smart_cut: Keyframe'ler arası GOP'ları kopyala, sadece uçları yeniden kodla
         """
+        input_video = get_proxy_manager().source_of(input_video)  # Proxy verildiyse kaynaktan render et
+        if smart_cut and VideoTrimmer.smart_trim(input_video, output_video, start_time, end_time):
+            return True
+        
         try:
             logger.info(f"Video kırpılıyor: {start_time}s - {end_time}s")
             
-            # FFmpeg ile video ve ses'i senkronlu kırp
-            # Alternatif: trim filter'ı kullan (daha güvenilir)
+            # Giriş tarafında seek + sınırlı süre: sadece aralık decode edilir
             duration = end_time - start_time
-            
-            cmd = [
-                'ffmpeg',
-                '-i', str(input_video),
-                '-vf', f'trim=start={start_time}:end={end_time},setpts=PTS-STARTPTS',  # Video trim
-                '-af', f'atrim=start={start_time}:end={end_time},asetpts=PTS-STARTPTS',  # Audio trim
-                '-c:v', 'libx264',  # Video re-encode (kara ekran sorunu olmazsa copy kullan)
+            output_args = [
+                '-c:v', 'libx264',  # Video re-encode
                 '-c:a', 'aac',      # Audio codec
                 '-y',               # Varsa overwrite et
-                str(output_video)
+                output_video
             ]
-            
-            subprocess.run(cmd, capture_output=True, check=True)
+            VideoTrimmer._run_seeked(input_video, start_time, duration, output_args)
             
             logger.info(f"Video başarıyla kırpıldı: {output_video}")
             return True
         
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"Video kırpılırken hata: {e}")
             return False
@@ -58,7 +103,8 @@ class VideoTrimmer:
         input_video: str,
         output_video: str,
         start_time: float,
-        end_time: float
+        end_time: float,
+        smart_cut: bool = SMART_CUT_ENABLED
     ) -> bool:
         """
         Videoyu sesi olmadan kırpla (sessiz video)
@@ -68,27 +114,310 @@ class VideoTrimmer:
             output_video: Çıkış video dosyası
             start_time: Başlangıç zamanı (saniye)
             end_time: Bitiş zamanı (saniye)
+            smart_cut: Keyframe'ler arası GOP'ları kopyala, sadece uçları yeniden kodla
         """
+        input_video = get_proxy_manager().source_of(input_video)  # Proxy verildiyse kaynaktan render et
+        if smart_cut and VideoTrimmer.smart_trim(
+            input_video, output_video, start_time, end_time, keep_audio=False
+        ):
+            return True
+        
         try:
             logger.info(f"Sessiz video kırpılıyor: {start_time}s - {end_time}s")
             
             duration = end_time - start_time
-            
-            cmd = [
-                'ffmpeg',
-                '-i', str(input_video),
-                '-vf', f'trim=start={start_time}:end={end_time},setpts=PTS-STARTPTS',  # Video trim
+            output_args = [
                 '-an',              # Audio kaldır (sessiz video)
                 '-c:v', 'libx264',  # Video codec
                 '-y',               # Varsa overwrite et
-                str(output_video)
+                output_video
             ]
-            
-            subprocess.run(cmd, capture_output=True, check=True)
+            VideoTrimmer._run_seeked(input_video, start_time, duration, output_args, keep_audio=False)
             
             logger.info(f"Sessiz video başarıyla kırpıldı: {output_video}")
             return True
         
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"Sessiz video kırpılırken hata: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    @staticmethod
+    def _seek_args(input_video: str, start_time: float, duration: float) -> list:
+        """
+        Kırpma aralığı için ffmpeg giriş argümanlarını oluştur
+        
+        Giriş seek'i (-ss, -i'den önce) demuxer seviyesinde en yakın önceki
+        keyframe'e atlar ve oradan itibaren doğru (accurate_seek) konuma
+        kadar decode eder; -t ile decode aralığın sonunda durur.
+        """
+        return ['-ss', start_time, '-i', input_video, '-t', duration]
+    
+    @staticmethod
+    def _timestamp_reset_args(start_time: float, duration: float, input_seek: bool, keep_audio: bool) -> list:
+        """
+        Kırpılan aralığın zamanlarını sıfırdan başlatan filtre argümanları
+        
+        Seek'ten sonra ilk kare aralık başından biraz sonra (~0.02 s) kalır;
+        CFR çıkışta ffmpeg bu boşluğu ilk kareyi tekrarlayarak doldurur ve
+        tüm kareler bir kayar. Giriş seek'i kullanılamıyorsa baştan decode
+        edilip aralık trim/atrim filtresiyle (kare doğruluğunda) kesilir.
+        """
+        if input_seek:
+            video_filter, audio_filter = 'setpts=PTS-STARTPTS', 'asetpts=PTS-STARTPTS'
+        else:
+            bounds = f"start={start_time}:duration={duration}"
+            video_filter = f"trim={bounds},setpts=PTS-STARTPTS"
+            audio_filter = f"atrim={bounds},asetpts=PTS-STARTPTS"
+        args = ['-vf', video_filter] + (['-af', audio_filter] if keep_audio else [])
+        # Kare zamanları kaynaktaki gibi kalsın (setpts kare hızı bilgisini düşürür)
+        return args + ['-fps_mode', 'passthrough']
+    
+    @staticmethod
+    def _run_seeked(input_video: str, start_time: float, duration: float, output_args: list,
+                    keep_audio: bool = True):
+        """
+        Aralığı giriş seek'i ile işle; güvenilmez container'larda veya
+        giriş seek'i başarısız olursa çıkış seek'ine düş
+        """
+        input_seek = Path(input_video).suffix.lower() not in INACCURATE_SEEK_FORMATS
+        if input_seek:
+            try:
+                run_ffmpeg(
+                    VideoTrimmer._seek_args(input_video, start_time, duration)
+                    + VideoTrimmer._timestamp_reset_args(start_time, duration, True, keep_audio)
+                    + output_args
+                )
+                return
+            except subprocess.CalledProcessError as e:
+                logger.warning(f"Giriş seek'i başarısız, çıkış seek'i deneniyor: {e}")
+        
+        run_ffmpeg(
+            ['-i', input_video]
+            + VideoTrimmer._timestamp_reset_args(start_time, duration, False, keep_audio)
+            + output_args
+        )
+    
+    @staticmethod
+    def _smart_cut_encode_args(stream: dict, encoder: str) -> list:
+        """
+        Kısmi GOP'ları kaynak akışla uyumlu kodlamak için encoder argümanları
+        
+        Profil, seviye, referans kare sayısı, piksel formatı ve (kaynakta
+        yoksa) B-frame kullanımı kaynaktan alınır.
+        
+        Returns:
+            Argüman listesi; kaynak profili desteklenmiyorsa None
+        """
+        profile = VideoTrimmer.SMART_CUT_PROFILES[stream['codec_name']].get(stream.get('profile'))
+        level = int(stream.get('level') or 0)
+        if profile is None or level <= 0:
+            return None
+        
+        refs = int(stream.get('refs') or 1)
+        no_b_frames = int(stream.get('has_b_frames') or 0) == 0
+        args = ['-c:v', encoder, '-crf', '18', '-preset', 'fast', '-profile:v', profile]
+        if stream['codec_name'] == 'h264':
+            # ffprobe H.264 seviyesini 10 ile çarpılmış verir (31 -> 3.1)
+            params = [f"ref={refs}"] + (["bframes=0"] if no_b_frames else [])
+            args += ['-level:v', f"{level / 10:.1f}", '-x264-params', ':'.join(params)]
+        else:
+            # HEVC seviyesi 30 ile çarpılmış verilir (93 -> 3.1)
+            params = [f"level-idc={level / 30:.1f}", f"ref={refs}"] + (["bframes=0"] if no_b_frames else [])
+            args += ['-x265-params', ':'.join(params)]
+        if stream.get('pix_fmt'):
+            args += ['-pix_fmt', stream['pix_fmt']]
+        # Kare zamanları kaynaktaki gibi kalsın (VFR)
+        args += ['-fps_mode', 'passthrough']
+        return args
+    
+    @staticmethod
+    def _concat_entry(path) -> str:
+        """concat demuxer listesi için file satırı (tek tırnaklar kaçışlanır)"""
+        escaped = Path(path).as_posix().replace("'", "'\\''")
+        return f"file '{escaped}'\n"
+    
+    @staticmethod
+    def _matches_source(segment: Path, stream: dict) -> bool:
+        """Yeniden kodlanan parça kaynakla aynı akış parametrelerine sahip mi"""
+        encoded = probe_video_stream(segment)
+        mismatched = [
+            field for field in VideoTrimmer.SMART_CUT_MATCH_FIELDS
+            if str(encoded.get(field)) != str(stream.get(field))
+        ]
+        if mismatched:
+            details = ', '.join(f"{field}: {stream.get(field)} -> {encoded.get(field)}" for field in mismatched)
+            logger.info(f"Yeniden kodlanan parça kaynakla uyuşmuyor ({details}), yeniden kodlanacak")
+            return False
+        return True
+    
+    @staticmethod
+    def smart_trim(
+        input_video: str,
+        output_video: str,
+        start_time: float,
+        end_time: float,
+        keep_audio: bool = True
+    ) -> bool:
+        """
+        Keyframe farkında kırpma (smart-cut)
+        
+        Aralığın tamamen içinde kalan GOP'lar stream copy ile kopyalanır,
+        sadece baştaki ve sondaki kısmi GOP'lar yeniden kodlanır. Ses
+        (ucuz olduğu için) aralık boyunca ayrıca kodlanıp en sonda muxlanır.
+        
+        Args:
+            input_video: Giriş video dosyası
+            output_video: Çıkış video dosyası
+            start_time: Başlangıç zamanı (saniye)
+            end_time: Bitiş zamanı (saniye)
+            keep_audio: False ise çıkış sessiz olur
+        
+        Returns:
+            Başarılı ise True; smart-cut uygulanamıyorsa False
+            (çağıran taraf tam yeniden kodlamaya düşer)
+        
+        input_video kaynak dosya olmalıdır (proxy çözümü trim /
+        trim_silent'ta yapılır).
+        """
+        work_dir = None
+        try:
+            stream = probe_video_stream(input_video)
+            codec_name = stream.get('codec_name')
+            encoder = VideoTrimmer.SMART_CUT_ENCODERS.get(codec_name)
+            if encoder is None:
+                logger.info(f"Smart-cut desteklenmiyor (codec: {codec_name}), yeniden kodlanacak")
+                return False
+            encode_args = VideoTrimmer._smart_cut_encode_args(stream, encoder)
+            if encode_args is None:
+                logger.info(f"Smart-cut desteklenmiyor (profil: {stream.get('profile')}), yeniden kodlanacak")
+                return False
+            
+            packets = probe_packet_times(input_video, start_time, end_time + VideoTrimmer.PACKET_SCAN_MARGIN)
+            keyframes = sorted({t for t, keyframe in packets if keyframe and start_time <= t <= end_time})
+            if len(keyframes) < 2:
+                logger.info("Aralıkta yeterli keyframe yok, yeniden kodlanacak")
+                return False
+            
+            copy_start, copy_end = keyframes[0], keyframes[-1]
+            # Parçaların kare sayıları kaynaktaki paket zamanlarından: stream
+            # copy'de -t dts'e göre keser (B-frame'li akışta sonraki GOP'un
+            # ilk paketleri de girer), yeniden kodlamada zaman damgaları
+            # sıfırlandığı için -t bir sonraki keyframe'i de alabilir
+            def frame_count(begin, end):
+                return sum(1 for t, _ in packets if begin - 1e-4 <= t < end - 1e-4)
+            
+            # Aralıktaki ilk karenin zamanı (baştaki parçanın süresi buradan)
+            first_frame = min((t for t, _ in packets if t >= start_time - 1e-4), default=start_time)
+            logger.info(
+                f"Smart-cut: {start_time}s - {end_time}s "
+                f"(kopyalanan: {copy_start:.3f}s - {copy_end:.3f}s)"
+            )
+            
+            TEMP_DIR.mkdir(exist_ok=True)
+            work_dir = Path(tempfile.mkdtemp(prefix='smartcut_', dir=TEMP_DIR))
+            annexb = VideoTrimmer.ANNEXB_FILTERS[codec_name]
+            
+            # İlerleme aralıkları: sürenin çoğu uçların yeniden kodlanmasında,
+            # kopyalama ve birleştirme hızlı
+            # (parça, süre): concat demuxer sonraki parçayı önceki parçanın
+            # süresi kadar kaydırır; Matroska süresi parçanın başlangıç
+            # zamanını da içerdiği için süreler kaynaktaki kare
+            # zamanlarından verilir (son parçanınki gerekmez)
+            segments = []
+            
+            # Baştaki kısmi GOP (yeniden kodla)
+            if copy_start - start_time > 1e-3:
+                head = work_dir / 'head.mkv'
+                with progress_span(0.0, 0.4):
+                    run_ffmpeg([
+                        *VideoTrimmer._seek_args(input_video, start_time, copy_start - start_time),
+                        '-map', '0:v:0', '-an', *encode_args,
+                        '-vf', 'setpts=PTS-STARTPTS',  # Giriş seek'inden kalan ofset sıfırlanır
+                        '-frames:v', frame_count(start_time, copy_start),
+                        '-bsf:v', annexb, '-y', head
+                    ])
+                if not VideoTrimmer._matches_source(head, stream):
+                    return False
+                segments.append((head, copy_start - first_frame))
+            
+            # Tam GOP'lar (stream copy). Giriş seek'i (-ss) kullanılmaz: ffmpeg
+            # pts ile aranamayan container'larda (Matroska vb.) B-frame'li
+            # akışta hedefin biraz gerisini arar ve önceki GOP'tan başlar.
+            # concat demuxer'ın inpoint'i tam keyframe'e gider ve zamanları
+            # sıfırdan başlatır (inpoint mutlak zaman damgasıdır)
+            middle_list = work_dir / 'middle.txt'
+            middle_list.write_text(
+                VideoTrimmer._concat_entry(input_video)
+                + f"inpoint {copy_start + probe_start_time(input_video):.6f}\n",
+                encoding='utf-8'
+            )
+            middle = work_dir / 'middle.mkv'
+            with progress_span(0.4, 0.5):
+                run_ffmpeg([
+                    '-f', 'concat', '-safe', '0', '-i', middle_list,
+                    '-map', '0:v:0', '-an', '-c:v', 'copy', '-frames:v', frame_count(copy_start, copy_end),
+                    '-bsf:v', annexb, '-y', middle
+                ])
+            segments.append((middle, copy_end - copy_start))
+            
+            # Sondaki kısmi GOP (yeniden kodla)
+            if end_time - copy_end > 1e-3:
+                tail = work_dir / 'tail.mkv'
+                with progress_span(0.5, 0.9):
+                    run_ffmpeg([
+                        *VideoTrimmer._seek_args(input_video, copy_end, end_time - copy_end),
+                        '-map', '0:v:0', '-an', *encode_args,
+                        '-vf', 'setpts=PTS-STARTPTS',
+                        '-frames:v', frame_count(copy_end, end_time),
+                        '-bsf:v', annexb, '-y', tail
+                    ])
+                if not VideoTrimmer._matches_source(tail, stream):
+                    return False
+                segments.append((tail, None))
+            
+            # Parçaları kayıpsız birleştir (concat demuxer)
+            concat_list = work_dir / 'segments.txt'
+            concat_list.write_text(
+                ''.join(
+                    VideoTrimmer._concat_entry(seg) + (f"duration {duration:.6f}\n" if duration is not None else "")
+                    for seg, duration in segments
+                ),
+                encoding='utf-8'
+            )
+            
+            cmd = ['-f', 'concat', '-safe', '0', '-i', concat_list]
+            if keep_audio:
+                cmd += [
+                    *VideoTrimmer._seek_args(input_video, start_time, end_time - start_time),
+                    '-map', '0:v:0', '-map', '1:a:0?',
+                    '-c:v', 'copy', '-c:a', 'aac'
+                ]
+            else:
+                cmd += ['-map', '0:v:0', '-an', '-c:v', 'copy']
+            if Path(output_video).suffix.lower() in ('.mp4', '.mov') and '/' in str(stream.get('time_base')):
+                # Zaman tabanı kaynaktaki gibi kalsın
+                cmd += ['-video_track_timescale', stream['time_base'].split('/')[1]]
+            cmd += ['-y', output_video]
+            with progress_span(0.9, 1.0):
+                run_ffmpeg(cmd)
+            
+            logger.info(f"Smart-cut başarılı: {output_video}")
+            return True
+        
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr or ''
+            if isinstance(stderr, bytes):  # ffprobe hataları metin olarak gelir
+                stderr = stderr.decode(errors='ignore')
+            stderr = stderr[-500:]
+            logger.warning(f"Smart-cut başarısız, yeniden kodlanacak: {stderr}")
+            return False
+        except JobCancelled:
+            raise  # İptalde yeniden kodlamaya düşülmez
+        except Exception as e:
+            logger.warning(f"Smart-cut başarısız, yeniden kodlanacak: {e}")
+            return False
+        finally:
+            if work_dir is not None:
+                shutil.rmtree(work_dir, ignore_errors=True)
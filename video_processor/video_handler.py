@@ -4,6 +4,7 @@ Video Handler - Video bilgisi ve yönetimi
 import cv2
 from pathlib import Path
 from utils.logger import setup_logger
+from .seek_index import FrameReader
 
 logger = setup_logger(__name__)
 
@@ -17,6 +18,7 @@ class VideoHandler:
         if not self.cap.isOpened():
             raise ValueError(f"Video açılamadı: {video_path}")
         
+        self.reader = FrameReader(self.video_path, self.cap)
         self._get_properties()
     
     def _get_properties(self):
@@ -52,10 +54,8 @@ class VideoHandler:
         return "Unknown"
     
     def get_frame(self, frame_number: int):
-        """Belirli frame'i al"""
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-        ret, frame = self.cap.read()
-        return frame if ret else None
+        """Belirli frame'i al (seek dizini ile kare doğruluğunda)"""
+        return self.reader.read(frame_number)
     
     def close(self):
         """Video kaynağını kapat"""